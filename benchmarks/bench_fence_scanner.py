@@ -0,0 +1,106 @@
+"""
+Compare the line-oriented `iter_code_blocks` scanner with the regex it
+replaced, on multi-megabyte synthetic model responses.
+
+    python -m benchmarks.bench_fence_scanner [--size-mb N] [--repeat N]
+
+Three shapes are measured: a well-formed response; one cut off after a run
+of unterminated `~~~"path"` fences; and one whose last, unterminated opening
+line carries many quotes. In the last shape the regex backtracks into the
+path for every quote and rescans the whole tail each time (quadratic); the
+scanner reads each line once.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from typing import Callable, Iterable
+
+from crowler.util.string_util import DEFAULT_FENCE, QUOTES, iter_code_blocks
+
+_FENCE_RE = re.escape(DEFAULT_FENCE)
+
+# the pattern parse_code_response used before the scanner
+CODE_BLOCK_RE = re.compile(
+    rf"""
+    {_FENCE_RE}
+    (?P<quote>[{QUOTES}])
+    (?P<path>[^\r\n]+?)
+    (?P=quote)
+    (?P<body>.*?)
+    {_FENCE_RE}
+    """,
+    re.MULTILINE | re.DOTALL | re.VERBOSE,
+)
+
+
+def regex_blocks(response: str) -> Iterable[tuple[str, str]]:
+    return [
+        (m.group("path"), m.group("body")) for m in CODE_BLOCK_RE.finditer(response)
+    ]
+
+
+def scanner_blocks(response: str) -> Iterable[tuple[str, str]]:
+    return list(iter_code_blocks(response))
+
+
+def well_formed(size: int) -> str:
+    body = "".join(f"    value_{i} = compute({i})\n" for i in range(40))
+    block = '~~~"pkg/module_{}.py"\ndef f():\n' + body + "~~~\n"
+    parts = []
+    total = 0
+    i = 0
+    while total < size:
+        part = block.format(i)
+        parts.append(part)
+        total += len(part)
+        i += 1
+    return "".join(parts)
+
+
+def truncated(size: int, open_fences: int = 2000) -> str:
+    """A response whose tail is a run of opened but never closed fences."""
+    head = well_formed(size // 2)
+    line = "x = 1\n" * ((size - len(head)) // (6 * open_fences) or 1)
+    tail = "".join(f'~~~"pkg/cut_{i}.py"\n{line}' for i in range(open_fences))
+    return head + tail
+
+
+def quoted_tail(size: int, quotes: int = 50) -> str:
+    """Truncated inside a block whose opening line holds `quotes` quote marks."""
+    opener = '~~~"pkg/notes.md" ' + '"x" ' * quotes + "\n"
+    return well_formed(size // 2) + opener + "text\n" * (size // 2 // 5)
+
+
+def bench(name: str, fn: Callable[[str], object], text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<28} {best * 1000:10.1f} ms")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    size = int(args.size_mb * 1024 * 1024)
+
+    for label, text in (
+        ("well-formed", well_formed(size)),
+        ("truncated", truncated(size)),
+        ("quoted tail", quoted_tail(size)),
+    ):
+        print(f"{label}: {len(text) / 1024 / 1024:.1f} MiB")
+        baseline = bench("regex", regex_blocks, text, args.repeat)
+        fast = bench("line scanner", scanner_blocks, text, args.repeat)
+        print(f"speedup: {baseline / fast:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
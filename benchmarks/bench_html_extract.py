@@ -0,0 +1,101 @@
+"""
+Compare the single-pass `parse_html` with the previous extractor, which parsed
+each page, serialized it and parsed it again to strip non-content elements.
+
+    python -m benchmarks.bench_html_extract [PAGES_DIR] [--repeat N]
+
+PAGES_DIR is a folder of saved `*.html` pages; without it a synthetic corpus
+of documentation-like pages is generated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable
+
+from bs4 import BeautifulSoup
+
+from crowler.util.html_util import (
+    NON_CONTENT_ELEMENTS,
+    html_parser_backend,
+    parse_html,
+)
+
+
+def two_pass_text(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    content_soup = BeautifulSoup(str(soup), "html.parser")
+    for element in content_soup(NON_CONTENT_ELEMENTS):
+        element.decompose()
+    return content_soup.get_text(separator="\n", strip=True)
+
+
+def synthetic_page(i: int, sections: int = 200) -> str:
+    nav = "".join(f'<li><a href="/p{j}">Page {j}</a></li>' for j in range(50))
+    body = "".join(
+        f"<section><h2>Section {i}.{s}</h2><p>{'lorem ipsum ' * 40}</p>"
+        f"<pre><code>def f{s}(): return {s}</code></pre></section>"
+        for s in range(sections)
+    )
+    return (
+        f"<html><head><title>Doc {i}</title>"
+        '<meta name="description" content="synthetic">'
+        "<script>var tracking = 1;</script></head>"
+        f"<body><nav><ul>{nav}</ul></nav><main>{body}</main>"
+        "<footer>footer</footer></body></html>"
+    )
+
+
+def load_corpus(pages_dir: Path | None) -> list[str]:
+    if pages_dir is None:
+        return [synthetic_page(i) for i in range(20)]
+    return [
+        p.read_text(encoding="utf-8", errors="replace")
+        for p in sorted(pages_dir.glob("*.html"))
+    ]
+
+
+def bench(name: str, fn: Callable[[str], object], pages: list[str], repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            fn(page)
+        best = min(best, time.perf_counter() - start)
+    per_page = best / max(1, len(pages)) * 1000
+    print(f"{name:<28} {best * 1000:9.1f} ms total {per_page:8.2f} ms/page")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pages_dir", nargs="?", type=Path)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.pages_dir)
+    size = sum(len(p) for p in pages) / 1024
+    print(f"{len(pages)} page(s), {size:.0f} KiB")
+
+    baseline = bench("two-pass (html.parser)", two_pass_text, pages, args.repeat)
+    single = bench(
+        "single-pass (html.parser)",
+        lambda html: parse_html("bench", html, parser="html.parser"),
+        pages,
+        args.repeat,
+    )
+    print(f"speedup: {baseline / single:.2f}x")
+    if html_parser_backend() != "html.parser":
+        fast = bench(
+            f"single-pass ({html_parser_backend()})",
+            lambda html: parse_html("bench", html),
+            pages,
+            args.repeat,
+        )
+        print(f"speedup: {baseline / fast:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Time CLI startup with `--profile-startup`, per phase and per imported
+package, for a few common commands.
+
+    python -m benchmarks.bench_startup [--repeat N] [--json PATH]
+
+Each command runs in a fresh interpreter with an empty HOME. The median of
+every phase and of the slowest packages is printed; `--json` also writes the
+medians as one report per command, for tracking across commits.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+COMMANDS = [["show"], ["prompt", "list"], ["code", "--help"]]
+TOP_PACKAGES = 5
+
+
+def profile_once(args: list[str], home: Path) -> dict[str, Any]:
+    report_path = home / "report.json"
+    subprocess.run(
+        [sys.executable, "-m", "crowler.main", f"--profile-startup={report_path}"]
+        + args,
+        env={**os.environ, "HOME": str(home), "HISTORY_SESSION_ID": "bench"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+    return json.loads(report_path.read_text("utf-8"))
+
+
+def medians(reports: list[dict[str, Any]]) -> dict[str, Any]:
+    phases: dict[str, list[float]] = {}
+    packages: dict[str, list[float]] = {}
+    for report in reports:
+        for phase in report["phases"]:
+            phases.setdefault(phase["name"], []).append(phase["ms"])
+        for name, ms in report["packages"].items():
+            packages.setdefault(name, []).append(ms)
+    ranked = sorted(packages.items(), key=lambda kv: -statistics.median(kv[1]))
+    return {
+        "total_ms": statistics.median(r["total_ms"] for r in reports),
+        "import_ms": statistics.median(r["import_ms"] for r in reports),
+        "phases": {name: statistics.median(v) for name, v in phases.items()},
+        "packages": {name: statistics.median(v) for name, v in ranked},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, default=None)
+    args = parser.parse_args()
+
+    results = {}
+    for command in COMMANDS:
+        label = " ".join(command)
+        with tempfile.TemporaryDirectory() as home:
+            reports = [profile_once(command, Path(home)) for _ in range(args.repeat)]
+        result = medians(reports)
+        results[label] = result
+        print(f"crowler {label}")
+        print(f"{'total':<28} {result['total_ms']:10.1f} ms")
+        print(f"{'imports':<28} {result['import_ms']:10.1f} ms")
+        for name, ms in result["phases"].items():
+            print(f"{'phase ' + name:<28} {ms:10.1f} ms")
+        for name, ms in list(result["packages"].items())[:TOP_PACKAGES]:
+            print(f"{'import ' + name:<28} {ms:10.1f} ms")
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=2), "utf-8")
+
+
+if __name__ == "__main__":
+    main()
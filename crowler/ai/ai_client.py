@@ -5,6 +5,7 @@ from typing import Any, Optional, Union
 
 import typer
 from crowler.util.ai_util import format_messages
+from crowler.util.budget_util import input_budget
 
 from crowler.instruction.instruction_model import Instruction
 
@@ -32,6 +33,7 @@ class AIClient(ABC):
                 instructions=instructions,
                 prompt_files=prompt_files,
                 final_prompt=final_prompt,
+                budget=input_budget(self.config),
             )
             typer.secho("Sending message to AI client...")
             response = self.get_response(
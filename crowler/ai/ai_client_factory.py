@@ -1,37 +1,80 @@
+from __future__ import annotations
+
 import os
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Optional
 
 import typer
 
 from crowler.ai.ai_client_config import AIConfig
+from crowler.util.import_util import import_object
 
-from crowler.ai.ai_client import AIClient
-from crowler.ai.aws.anthropic.claude_client import ClaudeClient
-from crowler.ai.openai.openai_client import OpenAIClient
+if TYPE_CHECKING:
+    from crowler.ai.ai_client import AIClient
 
+# "module:Class" strings, so a provider SDK is imported only when selected
+AI_CLIENTS: dict[str, str] = {
+    "openai": "crowler.ai.openai.openai_client:OpenAIClient",
+    "claude": "crowler.ai.aws.anthropic.claude_client:ClaudeClient",
+}
 
-AI_CLIENTS: dict[str, Callable[[Optional[AIConfig]], AIClient]] = {
-    "openai": OpenAIClient,
-    "claude": ClaudeClient,
+# default config of each client, available without creating the client
+AI_CONFIGS: dict[str, str] = {
+    "openai": "crowler.ai.openai.openai_config:OpenAIConfig",
+    "claude": "crowler.ai.aws.anthropic.claude_client_config:Claude37ClientConfig",
 }
 
+# variables that change between shells without affecting any client
+_VOLATILE_ENV = {"PWD", "OLDPWD", "SHLVL", "_"}
 
-def get_ai_client(config: Optional[AIConfig] = None) -> AIClient:
+# default-config clients kept warm across commands once enabled (daemon mode),
+# keyed by client name and environment
+_client_cache: Optional[dict[tuple[str, int], AIClient]] = None
+
+
+def enable_client_cache() -> None:
+    global _client_cache
+    if _client_cache is None:
+        _client_cache = {}
+
+
+def _client_name() -> str:
     client_name = (os.getenv("AI_CLIENT") or "").strip().lower()
     if not client_name:
         typer.secho("❌ AI_CLIENT environment variable not set.", fg="red", err=True)
         raise RuntimeError("⛔️ AI_CLIENT environment variable not set.")
-    try:
-        client = AI_CLIENTS[client_name](config)
-        return client
-    except KeyError as exc:
-        typer.secho(
-            f'❌ Unsupported AI_CLIENT "{client_name}". '
-            f"Supported: {list(AI_CLIENTS.keys())}",
-            fg="red",
-            err=True,
-        )
-        raise ValueError(
-            f"❌ Unsupported AI_CLIENT '{client_name}'. "
-            f"Supported: {list(AI_CLIENTS.keys())}"
-        ) from exc
+    return client_name
+
+
+def _unsupported(client_name: str) -> ValueError:
+    typer.secho(
+        f'❌ Unsupported AI_CLIENT "{client_name}". '
+        f"Supported: {list(AI_CLIENTS.keys())}",
+        fg="red",
+        err=True,
+    )
+    return ValueError(
+        f"❌ Unsupported AI_CLIENT '{client_name}'. "
+        f"Supported: {list(AI_CLIENTS.keys())}"
+    )
+
+
+def get_ai_config() -> AIConfig:
+    """Default config of the AI_CLIENT, without credentials or a connection."""
+    client_name = _client_name()
+    if client_name not in AI_CONFIGS:
+        raise _unsupported(client_name)
+    return import_object(AI_CONFIGS[client_name])()
+
+
+def get_ai_client(config: Optional[AIConfig] = None) -> AIClient:
+    client_name = _client_name()
+    if client_name not in AI_CLIENTS:
+        raise _unsupported(client_name)
+    if _client_cache is None or config is not None:
+        return import_object(AI_CLIENTS[client_name])(config)
+    env = frozenset((k, v) for k, v in os.environ.items() if k not in _VOLATILE_ENV)
+    key = (client_name, hash(env))
+    client = _client_cache.get(key)
+    if client is None:
+        client = _client_cache[key] = import_object(AI_CLIENTS[client_name])(None)
+    return client
@@ -10,3 +10,4 @@ class OpenAIConfig(AIConfig):
     temperature: float = 0.24
     max_tokens: int = 4096 * 2
     top_p: Optional[float] = 0.96
+    context_window: int = 1_047_576
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from crowler.ai.ai_client_factory import get_ai_client
+import sys
+import traceback
+from typing import Any, List, Optional
 
 from crowler.db.url_db import clear_urls, summary_urls
 from crowler.db.process_file_db import (
@@ -10,28 +12,58 @@ from crowler.db.process_file_db import (
 from crowler.db.shared_file_db import clear_shared_files, summary_shared_files
 from crowler.db.prompt_db import append_prompt, clear_prompts, summary_prompts
 
+from crowler.util.budget_util import DROPPED, TRUNCATED, context_window, input_budget
+
 import typer
-import pyperclip
-from pyperclip import PyperclipException
 
-from crowler.cli.code_app import code_app
-from crowler.cli.process_app import process_app
-from crowler.cli.prompt_app import prompt_app
-from crowler.cli.file_app import file_app
-from crowler.cli.url_app import url_app
+from crowler.cli.lazy_group import LazyGroup
+
+
+class CrowlerGroup(LazyGroup):
+    # imported on first use: `code` and `url` pull in the AI and HTTP stacks
+    lazy_subcommands = {
+        "code": "crowler.cli.code_app:code_app",
+        "daemon": "crowler.cli.daemon_app:daemon_app",
+        "file": "crowler.cli.file_app:file_app",
+        "process": "crowler.cli.process_app:process_app",
+        "prompt": "crowler.cli.prompt_app:prompt_app",
+        "url": "crowler.cli.url_app:url_app",
+    }
+
 
-app = typer.Typer()
-app.add_typer(code_app)
-app.add_typer(file_app)
-app.add_typer(process_app)
-app.add_typer(prompt_app)
-app.add_typer(url_app)
+app = typer.Typer(cls=CrowlerGroup)
 
 
 # ───────────────────────── helpers ────────────────────────── #
 
 
+def build_command() -> Any:
+    """The click command behind `app`; long-lived callers build it once."""
+    return typer.main.get_command(app)
+
+
+def invoke(argv: List[str], command: Optional[Any] = None) -> int:
+    """
+    Run `argv` through the CLI in this process and return its exit code;
+    `command` is a `build_command()` result to reuse.
+    """
+    command = command or build_command()
+    try:
+        command.main(args=argv, prog_name="crowler")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
 def _clipboard_get() -> str:
+    import pyperclip
+
     try:
         typer.secho("ℹ️  Attempting to read from clipboard…", fg="green")
         result = pyperclip.paste()
@@ -43,11 +75,13 @@ def _clipboard_get() -> str:
 
 
 def _clipboard_set(text: str) -> None:
+    import pyperclip
+
     try:
         typer.secho("ℹ️  Attempting to write to clipboard…", fg="green")
         pyperclip.copy(text)
         typer.secho("✅ Clipboard updated successfully.", fg="green")
-    except PyperclipException:
+    except pyperclip.PyperclipException:
         typer.echo(text)
         typer.secho(
             "⚠️  Clipboard not available; printed instead.", fg="yellow", err=True
@@ -68,6 +102,11 @@ def summary_all() -> str:
     return "\n".join(not_empty_summary_list)
 
 
+def _format_plan_line(status: str, tokens: int, original: int, name: str) -> str:
+    count = f"{tokens}/{original}" if status == TRUNCATED else str(original)
+    return f"  {status:<10} {count:>14}  {name}"
+
+
 # ───────────────────────── commands ───────────────────────── #
 
 
@@ -100,6 +139,67 @@ def clear_all():
 
 @app.command("ask")
 def ask():
+    from crowler.ai.ai_client_factory import get_ai_client
+
     ai_client = get_ai_client()
     response = ai_client.send_message()
     typer.echo(response)
+
+
+@app.command("plan")
+def plan(
+    instruction: Optional[List[str]] = typer.Option(
+        None, "--instruction", "-i", help="Instruction name(s) to include."
+    ),
+    file: Optional[List[str]] = typer.Option(
+        None, "--file", "-f", help="Prompt file(s) to include."
+    ),
+    prompt: Optional[str] = typer.Option(None, "--prompt", help="Final prompt."),
+):
+    """Show the token budget of a request without sending it."""
+    from crowler.ai.ai_client_factory import get_ai_config
+    from crowler.instruction.instruction_registry import get_instruction
+    from crowler.util.ai_util import plan_messages
+
+    try:
+        config = get_ai_config()
+        instructions = [get_instruction(name).instruction for name in instruction or []]
+    except KeyError as e:
+        typer.secho(f"❌ Unknown instruction {e}", fg="red", err=True)
+        raise typer.Exit(1)
+    except Exception as e:
+        typer.secho(f"❌ Failed to plan request: {e}", fg="red", err=True)
+        raise typer.Exit(1)
+    budget = input_budget(config)
+    result = plan_messages(instructions, file or None, prompt, budget)
+    typer.secho(
+        f"🧮 {config.model}: context {context_window(config)}, "
+        f"output {config.max_tokens}, input budget {budget}",
+        fg="cyan",
+    )
+    for section in result.sections:
+        typer.echo(
+            _format_plan_line(
+                section.status, section.tokens, section.original_tokens, section.name
+            )
+        )
+    dropped = sum(s.original_tokens for s in result.sections if s.status == DROPPED)
+    summary = f"Total: {result.tokens} tokens ({dropped} dropped)"
+    if result.fits:
+        typer.secho(f"✅ {summary}; fits the budget.", fg="green")
+    else:
+        typer.secho(
+            f"⚠️  {summary}; over budget by {result.tokens - budget}.",
+            fg="yellow",
+        )
+
+
+@app.command("shell")
+def shell():
+    """Run commands in one warm process, with history and tab completion."""
+    from crowler.ai.ai_client_factory import enable_client_cache
+    from crowler.cli.shell import CrowlerShell
+
+    enable_client_cache()
+    command = build_command()
+    CrowlerShell(command, lambda argv: invoke(argv, command)).loop()
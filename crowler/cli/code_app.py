@@ -1,13 +1,39 @@
-from typing import OrderedDict
-from crowler.instruction.instructions.typer_log import TYPER_LOG_INSTRUCTION
-from crowler.instruction.instructions.mypy import MYPY_INSTRUCTION
-from crowler.instruction.instructions.readme import README_INSTRUCTION
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, OrderedDict, Tuple
+from crowler.ai.ai_client import AIClient
+from crowler.instruction.instruction_model import Instruction
+from crowler.instruction.instruction_registry import (
+    InstructionSpec,
+    available_instructions,
+    get_instruction,
+)
 from crowler.db.process_file_db import get_processing_files
-from crowler.util.file_util import rewrite_files
+from crowler.util.chunk_util import (
+    FileChunk,
+    iter_file_chunks,
+    merge_chunks,
+    stringify_chunk,
+)
+from crowler.util.file_util import (
+    find_repo_root,
+    is_oversized,
+    map_sources_to_tests,
+    rewrite_files,
+)
+from crowler.instruction.instructions.edit_format import EDIT_FORMAT_INSTRUCTION
 from crowler.instruction.instructions.response_format import RESPONSE_FORMAT_INSTRUCTION
-from crowler.instruction.instructions.unit_test import UNIT_TEST_INSTRUCTION
 from crowler.ai.ai_client_factory import get_ai_client
-from crowler.util.string_util import TaskType, parse_code_response
+from crowler.util.pattern_util import instruction_matcher
+from crowler.util.string_util import (
+    EditError,
+    SearchReplace,
+    TaskType,
+    apply_edits,
+    parse_code_response,
+    parse_edit_response,
+)
 import typer
 
 code_app = typer.Typer(
@@ -16,14 +42,181 @@ code_app = typer.Typer(
 )
 
 
+def _send_file_messages(
+    ai_client: AIClient,
+    filepath: str,
+    instructions: list[Instruction],
+    final_prompt: str,
+) -> Iterator[Tuple[Optional[FileChunk], str]]:
+    """
+    Yield (chunk, response) for `filepath`: a single response with no chunk
+    for regular files, one per chunk for files over the size cap.
+    """
+    if not is_oversized(filepath):
+        yield None, ai_client.send_message(
+            instructions=instructions,
+            prompt_files=[filepath],
+            final_prompt=final_prompt,
+        )
+        return
+    typer.secho(f"ℹ️  {filepath} exceeds the size cap; sending it in chunks.")
+    for chunk in iter_file_chunks(filepath):
+        yield chunk, ai_client.send_message(
+            instructions=instructions,
+            final_prompt=f"{stringify_chunk(chunk)}\n\n{final_prompt}",
+        )
+
+
+def _collect_file_map(
+    filepath: str,
+    responses: Iterable[Tuple[Optional[FileChunk], str]],
+    parse: Callable[[str], OrderedDict[str, str]],
+) -> OrderedDict[str, str]:
+    """
+    Parse the response(s) for `filepath`. A chunked file is rebuilt from the
+    content each part's reply gives for it; parts the model left out keep
+    their original text, and other paths in chunk replies are ignored.
+    """
+    chunks: list[FileChunk] = []
+    replies: dict[int, str] = {}
+    for chunk, response in responses:
+        file_map = parse(response)
+        if chunk is None:
+            return file_map
+        chunks.append(chunk)
+        for path, content in file_map.items():
+            if filepath.endswith(path):
+                replies[chunk.index] = content
+    if not replies:
+        return OrderedDict()
+    return OrderedDict({filepath: merge_chunks(chunks, replies)})
+
+
+def _filter_processing_files(
+    files: Iterable[str], instructions: list[Instruction]
+) -> list[str]:
+    """
+    Drop files the instructions' allow/deny patterns exclude, before any
+    request is built. Paths are matched relative to the repository root.
+    """
+    matcher = instruction_matcher(instructions)
+    root = find_repo_root()
+    kept: list[str] = []
+    skipped = 0
+    for filepath in files:
+        try:
+            rel = Path(filepath).resolve().relative_to(root).as_posix()
+        except ValueError:
+            rel = Path(filepath).as_posix()
+        if not matcher.is_allowed(rel):
+            reason = "not matched by the allowed patterns"
+        elif matcher.is_denied(rel):
+            reason = "matched by a denied pattern"
+        else:
+            kept.append(filepath)
+            continue
+        typer.secho(f"⚠️  Skipping {filepath}: {reason}", fg="yellow")
+        skipped += 1
+    if skipped:
+        typer.secho(
+            f"⏭️  Filtered out {skipped} file(s); {skipped} model call(s) avoided.",
+            fg="cyan",
+        )
+    return kept
+
+
+def _apply_edit_responses(
+    responses: Iterable[Tuple[Optional[FileChunk], str]],
+    instructions: list[Instruction],
+) -> OrderedDict[str, str]:
+    """
+    Collect the search/replace edits of `responses` per file and apply them
+    to the files on disk, returning the new contents.
+    """
+    edits: OrderedDict[str, list[SearchReplace]] = OrderedDict()
+    for _, response in responses:
+        parsed = parse_edit_response(response, instructions=instructions)
+        for path, file_edits in parsed.items():
+            edits.setdefault(path, []).extend(file_edits)
+    files: OrderedDict[str, str] = OrderedDict()
+    for path, file_edits in edits.items():
+        try:
+            target = Path(path)
+            original = target.read_text(encoding="utf-8") if target.exists() else ""
+            files[path] = apply_edits(original, file_edits)
+        except (OSError, EditError) as e:
+            typer.secho(f"❌ Could not apply edits to {path}: {e}", fg="red", err=True)
+    return files
+
+
+def _unit_test_instructions() -> list[Instruction]:
+    return [RESPONSE_FORMAT_INSTRUCTION, get_instruction("unit-test").instruction]
+
+
+def _rewrite_each_file(
+    spec: InstructionSpec,
+    force: bool,
+    diff: bool,
+    action: str,
+) -> None:
+    """
+    Send every (filtered) processing file with the `spec` instruction and
+    prompt and write back the answer; `action` names the work in failure
+    messages. Replies are filtered by the same patterns as the files sent.
+    """
+    instructions = [
+        EDIT_FORMAT_INSTRUCTION if diff else RESPONSE_FORMAT_INSTRUCTION,
+        spec.instruction,
+    ]
+    files = _filter_processing_files(get_processing_files(), instructions)
+    ai_client = get_ai_client()
+    for filepath in files:
+        try:
+            responses = _send_file_messages(
+                ai_client,
+                filepath,
+                instructions=instructions,
+                final_prompt=spec.final_prompt(filepath),
+            )
+            if diff:
+                file_map = _apply_edit_responses(responses, instructions)
+            else:
+                parse = partial(parse_code_response, instructions=instructions)
+                file_map = _collect_file_map(filepath, responses, parse)
+            rewrite_files(files=file_map, force=force)
+        except Exception as e:
+            typer.secho(
+                f"❌ Failed to {action} for {filepath!r}: {e}",
+                fg="red",
+                err=True,
+            )
+
+
 @code_app.command("unit-test")
 def create_unit_tests(
     force: bool = typer.Option(
         False,
         "--force",
     ),
+    skip_tested: bool = typer.Option(
+        False,
+        "--skip-tested",
+        help="Skip files that already have a matching test file.",
+    ),
 ):
-    for filepath in get_processing_files():
+    files = _filter_processing_files(get_processing_files(), _unit_test_instructions())
+    mappings = map_sources_to_tests(files, find_repo_root())
+    # files without tests first, so partial runs cover the gaps
+    mappings.sort(key=lambda m: (m.has_test, m.source))
+    tested = sum(1 for m in mappings if m.has_test)
+    if skip_tested and tested:
+        typer.secho(
+            f"⏭️  Skipping {tested} file(s) that already have tests.", fg="cyan"
+        )
+    for mapping in mappings:
+        if skip_tested and mapping.has_test:
+            continue
+        filepath = mapping.source
         try:
             create_unit_test(force, filepath)
         except Exception as e:
@@ -39,17 +232,21 @@ def create_unit_test(force: bool, filepath: str):
         typer.secho(f"⚠️  Skipping __init__.py file: {filepath}", fg="yellow")
         return
     ai_client = get_ai_client()
-    response = ai_client.send_message(
-        instructions=[
-            RESPONSE_FORMAT_INSTRUCTION,
-            UNIT_TEST_INSTRUCTION,
-        ],
-        prompt_files=[filepath],
+    responses = _send_file_messages(
+        ai_client,
+        filepath,
+        instructions=_unit_test_instructions(),
         final_prompt=f'Focus only on creating|fixing test(s) for "{filepath}"',
     )
-    file_map = parse_code_response(
-        response=response,
-        task_type=TaskType.TEST_GENERATION,
+    # the unit-test instruction's deny list (tests/, test_*.py) selects the
+    # sources to send; applied to the reply it would reject every test file
+    file_map = _collect_file_map(
+        filepath,
+        responses,
+        lambda response: parse_code_response(
+            response=response,
+            task_type=TaskType.TEST_GENERATION,
+        ),
     )
     for path, content in file_map.items():
         if not filepath.endswith(path):
@@ -68,16 +265,14 @@ def create_readme(
     ),
 ):
     ai_client = get_ai_client()
+    instructions = [RESPONSE_FORMAT_INSTRUCTION, get_instruction("readme").instruction]
     try:
         response = ai_client.send_message(
-            instructions=[
-                RESPONSE_FORMAT_INSTRUCTION,
-                README_INSTRUCTION,
-            ],
+            instructions=instructions,
             prompt_files=["./README.md"],
             final_prompt='Focus only on creating a single "README.md"',
         )
-        file_map = parse_code_response(response)
+        file_map = parse_code_response(response, instructions=instructions)
         rewrite_files(files=file_map, force=force)
     except Exception as e:
         typer.secho(
@@ -93,26 +288,21 @@ def fix_mypy_errors(
         False,
         "--force",
     ),
+    diff: bool = typer.Option(
+        False,
+        "--diff",
+        help="Ask for search/replace edits instead of whole files (fewer tokens).",
+    ),
 ):
-    ai_client = get_ai_client()
-    for filepath in get_processing_files():
-        try:
-            response = ai_client.send_message(
-                instructions=[
-                    RESPONSE_FORMAT_INSTRUCTION,
-                    MYPY_INSTRUCTION,
-                ],
-                prompt_files=[filepath],
-                final_prompt=f"Focus on fixing only mypy errors related to {filepath}",
-            )
-            file_map = parse_code_response(response)
-            rewrite_files(files=file_map, force=force)
-        except Exception as e:
-            typer.secho(
-                f"❌ Failed to fix mypy errors for {filepath!r}: {e}",
-                fg="red",
-                err=True,
-            )
+    _rewrite_each_file(
+        replace(
+            get_instruction("mypy"),
+            prompt="Focus on fixing only mypy errors related to {filepath}",
+        ),
+        force,
+        diff,
+        action="fix mypy errors",
+    )
 
 
 @code_app.command("typer-log")
@@ -121,26 +311,50 @@ def improve_typer_logs(
         False,
         "--force",
     ),
+    diff: bool = typer.Option(
+        False,
+        "--diff",
+        help="Ask for search/replace edits instead of whole files (fewer tokens).",
+    ),
 ):
-    ai_client = get_ai_client()
-    for filepath in get_processing_files():
-        if filepath.endswith("__init__.py"):
-            typer.secho(f"⚠️  Skipping __init__.py file: {filepath}", fg="yellow")
-            continue
-        try:
-            response = ai_client.send_message(
-                instructions=[
-                    RESPONSE_FORMAT_INSTRUCTION,
-                    TYPER_LOG_INSTRUCTION,
-                ],
-                prompt_files=[filepath],
-                final_prompt=f"Focus on only {filepath}",
-            )
-            file_map = parse_code_response(response)
-            rewrite_files(files=file_map, force=force)
-        except Exception as e:
-            typer.secho(
-                f"❌ Failed to improve typer logs for {filepath!r}: {e}",
-                fg="red",
-                err=True,
-            )
+    _rewrite_each_file(
+        get_instruction("typer-log"),
+        force,
+        diff,
+        action="improve typer logs",
+    )
+
+
+@code_app.command("run")
+def run_instruction(
+    name: str = typer.Argument(..., help="Built-in or user instruction name"),
+    force: bool = typer.Option(
+        False,
+        "--force",
+    ),
+    diff: bool = typer.Option(
+        False,
+        "--diff",
+        help="Ask for search/replace edits instead of whole files (fewer tokens).",
+    ),
+):
+    """Apply any registered instruction to each processing file."""
+    try:
+        spec = get_instruction(name)
+    except KeyError:
+        names = ", ".join(sorted(available_instructions()))
+        typer.secho(
+            f"❌ Unknown instruction {name!r}. Available: {names}", fg="red", err=True
+        )
+        raise typer.Exit(1)
+    except Exception as e:
+        typer.secho(f"❌ Failed to load instruction {name!r}: {e}", fg="red", err=True)
+        raise typer.Exit(1)
+    _rewrite_each_file(spec, force, diff, action=f"run {name}")
+
+
+@code_app.command("instructions")
+def list_instructions():
+    """List built-in and user instruction names with where they come from."""
+    for name, source in sorted(available_instructions().items()):
+        typer.echo(f"{name:<24} {source}")
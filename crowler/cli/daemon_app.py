@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Optional
+
+import typer
+
+from crowler.util.daemon_client import request, socket_path
+from crowler.util.session_util import CACHE_DIR, get_session_id, session_key
+
+START_TIMEOUT = 15.0
+
+daemon_app = typer.Typer(
+    name="daemon",
+    help="Keep a warm crowler process for this terminal session.",
+)
+
+
+def _ping() -> Optional[dict[str, Any]]:
+    try:
+        return request({"op": "ping"})
+    except (OSError, ValueError):
+        return None
+
+
+@daemon_app.command("start")
+def start_daemon(
+    foreground: bool = typer.Option(
+        False, "--foreground", help="Serve from this process instead of detaching."
+    ),
+):
+    """Start the daemon; set CROWLER_DAEMON=1 to route commands through it."""
+    status = _ping()
+    if status is not None:
+        typer.secho(f"ℹ️  Daemon already running (pid {status['pid']}).", fg="cyan")
+        return
+    if foreground:
+        from crowler.util.daemon_server import main
+
+        main()
+        return
+    log_path = CACHE_DIR / f"daemon.{get_session_id()}.log"
+    with open(log_path, "ab") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "crowler.util.daemon_server"],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            env={**os.environ, "HISTORY_SESSION_ID": session_key()},
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            break
+        status = _ping()
+        if status is not None:
+            typer.secho(
+                f"✅ Daemon started (pid {status['pid']}) on {socket_path()}.",
+                fg="green",
+            )
+            return
+        time.sleep(0.05)
+    typer.secho(f"❌ Daemon did not start; see {log_path}", fg="red", err=True)
+    raise typer.Exit(1)
+
+
+@daemon_app.command("stop")
+def stop_daemon():
+    """Stop this session's daemon."""
+    try:
+        reply = request({"op": "stop"})
+    except (OSError, ValueError) as e:
+        typer.secho(f"❌ Failed to stop daemon: {e}", fg="red", err=True)
+        raise typer.Exit(1)
+    if reply is None:
+        typer.secho("ℹ️  No daemon running.", fg="cyan")
+        return
+    typer.secho("✅ Daemon stopped.", fg="green")
+
+
+@daemon_app.command("status")
+def daemon_status():
+    """Show whether this session's daemon is running."""
+    status = _ping()
+    if status is None:
+        typer.echo("No daemon running.")
+        return
+    uptime = int(time.time() - status["started"])
+    typer.echo(
+        f"Daemon pid {status['pid']}, up {uptime}s, "
+        f"{status['requests']} command(s) served, socket {socket_path()}"
+    )
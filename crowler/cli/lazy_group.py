@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Any
+
+import typer
+from typer.core import TyperGroup
+
+from crowler.util.import_util import import_object
+
+
+class LazyGroup(TyperGroup):
+    """
+    Typer group whose sub-apps, given as "module:attribute" strings in
+    `lazy_subcommands`, are imported only when invoked (or listed in help).
+    """
+
+    lazy_subcommands: dict[str, str] = {}
+
+    # contexts and commands stay untyped: recent typer vendors its own click
+    def list_commands(self, ctx: Any) -> list[str]:
+        return super().list_commands(ctx) + [
+            name for name in self.lazy_subcommands if name not in self.commands
+        ]
+
+    def get_command(self, ctx: Any, name: str) -> Any:
+        if name not in self.commands and name in self.lazy_subcommands:
+            sub_app = import_object(self.lazy_subcommands[name])
+            # get_group, not get_command: no root-only completion options
+            command = typer.main.get_group(sub_app)
+            command.name = name
+            self.add_command(command, name)
+        return super().get_command(ctx, name)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import glob
+import os
+import shlex
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import typer
+
+from crowler.util.session_util import CACHE_DIR
+
+SHELL_PROMPT = "crowler> "
+SHELL_HISTORY_PATH = CACHE_DIR / "shell_history"
+SHELL_HISTORY_LENGTH = 1000
+EXIT_COMMANDS = {"exit", "quit"}
+
+
+def _subcommands(command: Any) -> Optional[list[str]]:
+    # groups have list_commands; the context argument is unused by them
+    if not hasattr(command, "list_commands"):
+        return None
+    return list(command.list_commands(None))
+
+
+def _options(command: Any) -> list[str]:
+    options = ["--help"]
+    for param in getattr(command, "params", []):
+        options += [*getattr(param, "opts", []), *getattr(param, "secondary_opts", [])]
+    return [o for o in options if o.startswith("-")]
+
+
+def _paths(word: str) -> list[str]:
+    matches = glob.glob(os.path.expanduser(word) + "*")
+    return [m + os.sep if os.path.isdir(m) else m for m in matches]
+
+
+def completions(root: Any, line: str) -> list[str]:
+    """
+    Candidates for the word being typed at the end of `line`: subcommands of
+    the group reached so far, options (after "-") of the command reached, or
+    filesystem paths for a command's arguments.
+    """
+    try:
+        tokens = shlex.split(line)
+    except ValueError:
+        tokens = line.split()
+    word = tokens.pop() if tokens and not line[-1:].isspace() else ""
+    command = root
+    for token in tokens:
+        if token.startswith("-") or _subcommands(command) is None:
+            continue
+        sub = command.get_command(None, token)
+        if sub is None:
+            return []
+        command = sub
+    if word.startswith("-"):
+        candidates = _options(command)
+    else:
+        subcommands = _subcommands(command)
+        candidates = _paths(word) if subcommands is None else subcommands
+    return sorted({c for c in candidates if c.startswith(word)})
+
+
+class CrowlerShell:
+    """
+    Read-eval loop over the CLI in one process: imports, parsed stores and AI
+    clients stay warm between commands.
+    """
+
+    def __init__(
+        self,
+        command: Any,
+        run: Callable[[list[str]], int],
+        history_path: Path = SHELL_HISTORY_PATH,
+    ) -> None:
+        self.command = command
+        self.run = run
+        self.history_path = history_path
+        self._matches: list[str] = []
+
+    def execute(self, line: str) -> bool:
+        """Run one input line; False once the shell should exit."""
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            typer.secho(f"❌ {e}", fg="red", err=True)
+            return True
+        if not argv:
+            return True
+        if argv[0] in EXIT_COMMANDS:
+            return False
+        if argv[0] == "shell":
+            typer.secho("ℹ️  Already in the crowler shell.", fg="cyan")
+            return True
+        if argv[0] == "help":
+            argv = [*argv[1:], "--help"]
+        self.run(argv)
+        return True
+
+    def loop(self) -> None:
+        readline = self._setup_readline()
+        typer.secho(
+            "crowler shell: run commands without the `crowler` prefix; "
+            "Tab completes, `exit` or Ctrl-D quits.",
+            fg="cyan",
+        )
+        try:
+            while True:
+                try:
+                    line = input(SHELL_PROMPT)
+                except KeyboardInterrupt:
+                    typer.echo()
+                    continue
+                except EOFError:
+                    typer.echo()
+                    break
+                if not self.execute(line):
+                    break
+        finally:
+            if readline is not None:
+                self._save_history(readline)
+
+    # ───── readline ──────────────────────────────────────────────────
+
+    def _setup_readline(self) -> Optional[Any]:
+        try:
+            import readline
+        except ImportError:
+            return None
+        try:
+            readline.read_history_file(self.history_path)
+        except OSError:
+            pass
+        readline.set_history_length(SHELL_HISTORY_LENGTH)
+        readline.set_completer_delims(" \t\n")
+        readline.set_completer(self._complete)
+        # libedit (macOS) and GNU readline spell the binding differently
+        if "libedit" in (readline.__doc__ or ""):
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+        return readline
+
+    def _complete(self, text: str, state: int) -> Optional[str]:
+        if state == 0:
+            import readline
+
+            line = readline.get_line_buffer()[: readline.get_endidx()]
+            self._matches = completions(self.command, line)
+        return self._matches[state] if state < len(self._matches) else None
+
+    def _save_history(self, readline: Any) -> None:
+        try:
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            readline.write_history_file(self.history_path)
+        except OSError as e:
+            typer.secho(f"⚠️  Failed to save shell history: {e}", fg="yellow", err=True)
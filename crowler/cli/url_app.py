@@ -1,14 +1,29 @@
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
 import typer
 from crowler.cli.app_factory import create_crud_app
 from crowler.db.url_db import (
     append_url,
+    append_urls,
     clear_urls,
     get_urls,
     remove_url,
     summary_urls,
     undo_urls,
 )
+from crowler.util.crawl_util import DEFAULT_DELAY, CrawlScope, crawl
 from crowler.util.html_util import extract_html_data
+from crowler.util.http_util import MAX_PER_HOST, MAX_WORKERS, fetch_concurrently
+from crowler.util.recrawl_util import RecrawlScheduler, refresh
+from crowler.util.sitemap_util import (
+    SitemapEntry,
+    filter_entries,
+    iter_feed,
+    iter_sitemap,
+)
+
+_DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]
 
 url_app = create_crud_app(
     name="url",
@@ -26,12 +41,170 @@ url_app = create_crud_app(
 
 
 @url_app.command("parse")
-def parse_urls():
-    """Undo the last change to your HTML URL history."""
-    for url in get_urls():
-        try:
-            data = extract_html_data(url)
-            print(data)
-        except Exception as e:
-            typer.secho(f"❌ Failed to undo last change: {e}", fg="red", err=True)
-            raise
+def parse_urls(
+    workers: int = typer.Option(
+        MAX_WORKERS, "--workers", help="Maximum requests in flight overall."
+    ),
+    per_host: int = typer.Option(
+        MAX_PER_HOST, "--per-host", help="Maximum requests in flight per host."
+    ),
+):
+    """Fetch and parse every tracked URL concurrently, printing as they finish."""
+    failed = 0
+    for url, data, err in fetch_concurrently(
+        sorted(get_urls()),
+        extract_html_data,
+        max_workers=workers,
+        max_per_host=per_host,
+    ):
+        if err is not None:
+            typer.secho(f"❌ Failed to parse {url}: {err}", fg="red", err=True)
+            failed += 1
+            continue
+        print(data)
+    if failed:
+        typer.secho(f"⚠️  {failed} URL(s) could not be parsed.", fg="yellow", err=True)
+        raise typer.Exit(1)
+
+
+@url_app.command("crawl")
+def crawl_urls(
+    seed: str = typer.Argument(..., help="URL to start crawling from"),
+    depth: int = typer.Option(1, "--depth", help="Link hops to follow from seed."),
+    max_pages: int = typer.Option(50, "--max-pages", help="Maximum pages to fetch."),
+    scope: CrawlScope = typer.Option(
+        CrawlScope.DOMAIN,
+        "--scope",
+        help="Follow links on the seed's host (domain) or under its URL (prefix).",
+    ),
+    delay: float = typer.Option(
+        DEFAULT_DELAY, "--delay", help="Minimum seconds between requests per host."
+    ),
+    ignore_robots: bool = typer.Option(
+        False, "--ignore-robots", help="Do not consult robots.txt."
+    ),
+    workers: int = typer.Option(
+        MAX_WORKERS, "--workers", help="Maximum requests in flight overall."
+    ),
+    per_host: int = typer.Option(
+        MAX_PER_HOST, "--per-host", help="Maximum requests in flight per host."
+    ),
+):
+    """Crawl from a seed URL and add every fetched page to your URL history."""
+    try:
+        pages = []
+        for data in crawl(
+            seed,
+            depth=depth,
+            max_pages=max_pages,
+            scope=scope,
+            delay=delay,
+            respect_robots=not ignore_robots,
+            max_workers=workers,
+            max_per_host=per_host,
+        ):
+            typer.secho(f"🌐 {data.url} ({len(data.text)} chars)")
+            pages.append(data.url)
+    except Exception as e:
+        typer.secho(f"❌ Failed to crawl {seed}: {e}", fg="red", err=True)
+        raise typer.Exit(1)
+    typer.secho(f"✅ Crawled {len(pages)} page(s) from {seed}", fg="green")
+    append_urls(pages)
+
+
+@url_app.command("refresh")
+def refresh_urls(
+    max_requests: Optional[int] = typer.Option(
+        None, "--max-requests", help="Fetch at most this many due URLs."
+    ),
+    time_budget: Optional[float] = typer.Option(
+        None, "--time-budget", help="Stop starting new fetches after this many seconds."
+    ),
+    workers: int = typer.Option(
+        MAX_WORKERS, "--workers", help="Maximum requests in flight overall."
+    ),
+    per_host: int = typer.Option(
+        MAX_PER_HOST, "--per-host", help="Maximum requests in flight per host."
+    ),
+):
+    """Refetch only the tracked URLs that are due, backing off unchanged pages."""
+    urls = get_urls()
+    changed = unchanged = failed = 0
+    for result in refresh(
+        urls,
+        RecrawlScheduler(),
+        max_requests=max_requests,
+        time_budget=time_budget,
+        max_workers=workers,
+        max_per_host=per_host,
+    ):
+        if result.error is not None:
+            typer.secho(
+                f"❌ Failed to refresh {result.url}: {result.error}", fg="red", err=True
+            )
+            failed += 1
+        elif result.changed:
+            typer.secho(f"🔄 {result.url} changed")
+            changed += 1
+        else:
+            unchanged += 1
+    skipped = len(urls) - changed - unchanged - failed
+    typer.secho(
+        f"✅ Refreshed {changed + unchanged} URL(s): {changed} changed, "
+        f"{unchanged} unchanged, {skipped} not due or over budget.",
+        fg="green",
+    )
+    if failed:
+        typer.secho(
+            f"⚠️  {failed} URL(s) could not be refreshed.", fg="yellow", err=True
+        )
+        raise typer.Exit(1)
+
+
+def _import_entries(
+    source: str,
+    entries: Iterator[SitemapEntry],
+    pattern: Optional[str],
+    since: Optional[datetime],
+) -> None:
+    try:
+        added = append_urls(filter_entries(entries, pattern, since))
+    except Exception as e:
+        typer.secho(f"❌ Failed to import {source}: {e}", fg="red", err=True)
+        raise typer.Exit(1)
+    if not added:
+        typer.secho(f"⚠️  No new URLs found in {source}", fg="yellow")
+
+
+def _as_utc(since: Optional[datetime]) -> Optional[datetime]:
+    return since.replace(tzinfo=timezone.utc) if since else None
+
+
+@url_app.command("import-sitemap")
+def import_sitemap(
+    source: str = typer.Argument(..., help="Sitemap or sitemap index URL or file"),
+    pattern: Optional[str] = typer.Option(
+        None, "--pattern", help="Only URLs matching this regular expression."
+    ),
+    since: Optional[datetime] = typer.Option(
+        None, "--since", formats=_DATE_FORMATS, help="Only URLs modified since (UTC)."
+    ),
+):
+    """Add every URL of a sitemap (gzip and nested indexes included) at once."""
+    since = _as_utc(since)
+    _import_entries(source, iter_sitemap(source, since=since), pattern, since)
+
+
+@url_app.command("import-feed")
+def import_feed(
+    source: str = typer.Argument(..., help="RSS or Atom feed URL or file"),
+    pattern: Optional[str] = typer.Option(
+        None, "--pattern", help="Only URLs matching this regular expression."
+    ),
+    since: Optional[datetime] = typer.Option(
+        None, "--since", formats=_DATE_FORMATS, help="Only items published since (UTC)."
+    ),
+):
+    """Add the item links of an RSS or Atom feed at once."""
+    since = _as_utc(since)
+    _import_entries(source, iter_feed(source), pattern, since)
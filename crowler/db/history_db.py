@@ -1,6 +1,7 @@
 import json
+import os
 from pathlib import Path
-from typing import Callable, Generic, List, Optional, TypeVar
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
 import typer
 
 T = TypeVar("T")
@@ -24,6 +25,9 @@ class HistoryDB(Generic[T]):
         self._empty = empty
         self._normalise = normalise or (lambda x: x)
         self._pretty = pretty or json.dumps
+        # parsed history and the (inode, mtime, size) it was read at; a
+        # long-lived process (the daemon) only re-parses files that changed
+        self._cache: Optional[Tuple[Tuple[int, int, int], List[T]]] = None
 
         # bootstrap file with one empty snapshot
         if not self._file.exists():
@@ -64,10 +68,19 @@ class HistoryDB(Generic[T]):
 
     # ───── private helpers ───────────────────────────────────────────
 
+    def _stat_key(self) -> Tuple[int, int, int]:
+        st = os.stat(self._file)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
     def _load(self) -> List[T]:
         try:
+            key = self._stat_key()
+            if self._cache is not None and self._cache[0] == key:
+                return list(self._cache[1])
             with open(self._file, "r", encoding="utf-8") as f:
-                return json.load(f)
+                history = json.load(f)
+            self._cache = (key, history)
+            return list(history)
         except Exception as e:
             typer.secho(
                 f"⚠️  Failed to load {self._file.name}; resetting. Error: {e}",
@@ -78,7 +91,13 @@ class HistoryDB(Generic[T]):
 
     def _save(self, history: List[T]) -> None:
         try:
+            self._cache = None
             with open(self._file, "w", encoding="utf-8") as f:
                 json.dump(history, f, indent=2)
         except Exception as e:
             typer.secho(f"❌ Failed to save {self._file.name}: {e}", fg="red", err=True)
+            return
+        try:
+            self._cache = (self._stat_key(), list(history))
+        except OSError:
+            pass
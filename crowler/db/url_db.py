@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Iterable
+
 import typer
 from crowler.db.history_db import HistoryDB
 from crowler.util.session_util import create_session_file
@@ -35,6 +37,21 @@ class UrlHistoryStore:
         urls.append(u)
         self._db.push(urls)
 
+    def append_many(self, urls: Iterable[str]) -> int:
+        """Add every new URL in a single snapshot; returns how many were new."""
+        current = self._snap()
+        known = set(current)
+        added = 0
+        for url in urls:
+            u = url.strip()
+            if u and u not in known:
+                known.add(u)
+                current.append(u)
+                added += 1
+        if added:
+            self._db.push(current)
+        return added
+
     def remove(self, url: str) -> None:
         u = url.strip()
         if not u:
@@ -79,6 +96,12 @@ def append_url(url: str) -> None:
     typer.secho(f"✅ URL appended: {url}", fg="green")
 
 
+def append_urls(urls: Iterable[str]) -> int:
+    added = _store.append_many(urls)
+    typer.secho(f"✅ {added} new URL(s) appended.", fg="green")
+    return added
+
+
 def remove_url(url: str) -> None:
     _store.remove(url)
     typer.secho(f"✅ URL removed: {url}", fg="green")
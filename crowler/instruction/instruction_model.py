@@ -1,7 +1,10 @@
 import re
 from dataclasses import dataclass
+from functools import cached_property
 from typing import List, Pattern
 
+from crowler.util.token_util import count_tokens
+
 
 def _compile(patterns: List[str]) -> List[Pattern]:
     return [re.compile(p) for p in patterns]
@@ -20,5 +23,12 @@ class Instruction:
         deny_file_patterns: List[str] = [],
     ):
         self.instructions = instructions
+        # joined once here instead of on every request
+        self.system_text = "\n".join(instructions)
         self.allow_file_patterns = _compile(allow_file_patterns)
         self.deny_file_patterns = _compile(deny_file_patterns)
+
+    @cached_property
+    def token_count(self) -> int:
+        """Tokens of `system_text`, counted on first use."""
+        return count_tokens(self.system_text)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from crowler.instruction.instruction_model import Instruction
+from crowler.util.file_util import find_repo_root
+from crowler.util.import_util import import_object
+
+DEFAULT_PROMPT = "Focus on only {filepath}"
+
+# name -> "module:ATTRIBUTE"; imported only when the instruction is used
+BUILTIN_INSTRUCTIONS = {
+    "unit-test": "crowler.instruction.instructions.unit_test:UNIT_TEST_INSTRUCTION",
+    "mypy": "crowler.instruction.instructions.mypy:MYPY_INSTRUCTION",
+    "readme": "crowler.instruction.instructions.readme:README_INSTRUCTION",
+    "typer-log": "crowler.instruction.instructions.typer_log:TYPER_LOG_INSTRUCTION",
+    "instruction-review": (
+        "crowler.instruction.instructions.instruction_review"
+        ":INSTRUCTION_REVIEW_INSTRUCTION"
+    ),
+}
+
+USER_INSTRUCTION_DIR = Path.home() / ".config" / "crowler" / "instructions"
+PROJECT_INSTRUCTION_DIR = Path(".crowler") / "instructions"  # under the repo root
+INSTRUCTION_SUFFIXES = (".toml", ".yaml", ".yml")
+
+
+@dataclass
+class InstructionSpec:
+    name: str
+    instruction: Instruction
+    source: str
+    description: str = ""
+    prompt: str = DEFAULT_PROMPT
+
+    def final_prompt(self, filepath: str) -> str:
+        return self.prompt.format(filepath=filepath)
+
+
+# compiled user instructions, keyed by name and sha256 of the file contents
+_compiled: dict[tuple[str, str], InstructionSpec] = {}
+
+
+def instruction_dirs() -> list[Path]:
+    """Lookup order for instruction files: project first, then user."""
+    return [find_repo_root() / PROJECT_INSTRUCTION_DIR, USER_INSTRUCTION_DIR]
+
+
+def available_instructions() -> dict[str, str]:
+    """
+    Name -> source of every known instruction. Only directory listings are
+    read here; no instruction module is imported and no file is parsed.
+    """
+    found = dict(BUILTIN_INSTRUCTIONS)
+    for directory in reversed(instruction_dirs()):
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.iterdir()):
+            if path.suffix in INSTRUCTION_SUFFIXES:
+                found[path.stem] = str(path)
+    return found
+
+
+def get_instruction(name: str) -> InstructionSpec:
+    """Resolve `name` to a compiled instruction; KeyError when unknown."""
+    source = available_instructions().get(name)
+    if source is None:
+        raise KeyError(name)
+    if source in BUILTIN_INSTRUCTIONS.values():
+        return _load_builtin(name, source)
+    return load_instruction_file(Path(source))
+
+
+def _load_builtin(name: str, target: str) -> InstructionSpec:
+    return InstructionSpec(name=name, instruction=import_object(target), source=target)
+
+
+def load_instruction_file(path: Path) -> InstructionSpec:
+    """
+    Parse and compile a TOML/YAML instruction file, reusing the compiled
+    form while the file's contents are unchanged. Keys: `instructions`
+    (list of strings, required), `allow_file_patterns`, `deny_file_patterns`,
+    `description`, and `prompt` (a template with `{filepath}`).
+    """
+    raw = path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    cached = _compiled.get((path.stem, digest))
+    if cached is not None:
+        return cached
+
+    data = _PARSERS[path.suffix](raw)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a table/mapping at the top level")
+    spec = InstructionSpec(
+        name=path.stem,
+        instruction=Instruction(
+            instructions=_strings(data, "instructions", path, required=True),
+            allow_file_patterns=_strings(data, "allow_file_patterns", path),
+            deny_file_patterns=_strings(data, "deny_file_patterns", path),
+        ),
+        source=str(path),
+        description=str(data.get("description", "")),
+        prompt=str(data.get("prompt", DEFAULT_PROMPT)),
+    )
+    _compiled[(path.stem, digest)] = spec
+    return spec
+
+
+def _strings(
+    data: dict[str, Any], key: str, path: Path, required: bool = False
+) -> list[str]:
+    value = data.get(key)
+    if value is None:
+        if required:
+            raise ValueError(f"{path}: missing '{key}'")
+        return []
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"{path}: '{key}' must be a string or a list of strings")
+    return value
+
+
+def _optional_module(*names: str) -> Optional[Any]:
+    for name in names:
+        try:
+            return importlib.import_module(name)
+        except ModuleNotFoundError:
+            continue
+    return None
+
+
+def _parse_toml(raw: bytes) -> Any:
+    toml = _optional_module("tomllib", "tomli")
+    if toml is None:
+        raise RuntimeError("TOML instructions need Python 3.11+ or 'tomli'")
+    return toml.loads(raw.decode("utf-8"))
+
+
+def _parse_yaml(raw: bytes) -> Any:
+    yaml = _optional_module("yaml")
+    if yaml is None:
+        raise RuntimeError("YAML instructions need the 'PyYAML' package")
+    return yaml.safe_load(raw)
+
+
+_PARSERS: dict[str, Callable[[bytes], Any]] = {
+    ".toml": _parse_toml,
+    ".yaml": _parse_yaml,
+    ".yml": _parse_yaml,
+}
@@ -0,0 +1,40 @@
+from crowler.instruction.instruction_model import Instruction
+
+EDIT_FORMAT_INSTRUCTION = Instruction(
+    instructions=[
+        # ───────────── mandatory rules ─────────────
+        "✅ MANDATORY: Reply only with edits. Emit one fenced block *per file*"
+        " using exactly this pattern:\n"
+        '   ~~~"relative/path.ext"  (opening fence + quoted path)\n'
+        "   <<<<<<< SEARCH\n"
+        "   …existing lines, copied exactly…\n"
+        "   =======\n"
+        "   …lines that replace them…\n"
+        "   >>>>>>> REPLACE\n"
+        "   ~~~                     (closing fence)",
+        "🔹 A block may hold several SEARCH/REPLACE pairs; they are applied"
+        " in order.",
+        "🔹 Each SEARCH section must match the current file exactly, including"
+        " indentation, and include just enough lines to be unique.",
+        "🔹 To create a new file, leave the SEARCH section empty.",
+        "",
+        # ───────────── things NOT to do ────────────
+        "🚫 DO NOT re-emit unchanged parts of a file.",
+        "🚫 No comments, markdown headings, or prose before, between,"
+        " or after the blocks.",
+        '🚫 Paths must be relative and must not escape the sandbox (e.g., avoid "../").',
+        "",
+        # ───────────── example ───────────────
+        "📄 Example:\n"
+        '~~~"main.py"\n'
+        "<<<<<<< SEARCH\n"
+        "def greet(name):\n"
+        "    print('hi')\n"
+        "=======\n"
+        "def greet(name: str) -> None:\n"
+        "    print(f'hi {name}')\n"
+        ">>>>>>> REPLACE\n"
+        "~~~",
+        "",
+    ]
+)
@@ -1,4 +1,6 @@
 from crowler.instruction.instruction_model import Instruction
 
-
-MYPY_INSTRUCTION = Instruction(instructions=[])
+MYPY_INSTRUCTION = Instruction(
+    instructions=[],
+    allow_file_patterns=[r"\.pyi?$"],
+)
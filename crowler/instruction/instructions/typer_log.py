@@ -35,4 +35,6 @@ TYPER_LOG_INSTRUCTION = Instruction(
         "in the final patch.",
         "🚫 DO NOT over-log: one log per logical operation is enough.",
     ],
+    allow_file_patterns=[r"\.py$"],
+    deny_file_patterns=[r"(^|/)__init__\.py$"],
 )
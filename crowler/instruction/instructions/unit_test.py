@@ -40,4 +40,13 @@ UNIT_TEST_INSTRUCTION = Instruction(
         "No need to confirm print/log output in tests;"
         "evaluate behavior by calling the function and validating expected results.",
     ],
+    allow_file_patterns=[r"\.py$"],
+    deny_file_patterns=[
+        r"(^|/)tests?/",
+        r"(^|/)test_[^/]*\.py$",
+        r"_test\.py$",
+        r"(^|/)conftest\.py$",
+        r"(^|/)__init__\.py$",
+        r"(^|/)setup\.py$",
+    ],
 )
@@ -1,11 +1,62 @@
-from dotenv import load_dotenv
-from crowler.cli.app import app
+import os
+import sys
+
+from crowler.util.startup_profile import StartupProfile
 
 
 def main():
+    profile = StartupProfile.from_argv(sys.argv)
+    if profile.enabled:
+        sys.exit(profiled_main(profile))
+
+    # thin client: hand the command to this session's daemon when one runs
+    if os.getenv("CROWLER_DAEMON") and sys.argv[1:2] != ["daemon"]:
+        from crowler.util.daemon_client import forward
+
+        code = forward(sys.argv[1:])
+        if code is not None:
+            sys.exit(code)
+
+    from dotenv import load_dotenv
+    from crowler.cli.app import app
+
     load_dotenv()
     app()
 
 
+def profiled_main(profile: StartupProfile) -> int:
+    """
+    Local run split into timed phases; imports made by the command itself
+    (provider SDKs, bs4, ...) are timed too. Never forwards to a daemon.
+    """
+    with profile.phase("load_dotenv"):
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    with profile.phase("session_id"):
+        from crowler.util.session_util import get_session_id
+
+        get_session_id()
+    with profile.phase("stores"):
+        from crowler.db.process_file_db import get_processing_files
+        from crowler.db.prompt_db import get_latest_prompts
+        from crowler.db.shared_file_db import get_shared_files
+        from crowler.db.url_db import get_urls
+
+        get_latest_prompts()
+        get_shared_files()
+        get_processing_files()
+        get_urls()
+    with profile.phase("cli_import"):
+        from crowler.cli.app import build_command, invoke
+    with profile.phase("app_construction"):
+        command = build_command()
+    try:
+        with profile.phase("command"):
+            return invoke(sys.argv[1:], command)
+    finally:
+        profile.finish()
+
+
 if __name__ == "__main__":
     main()
@@ -2,50 +2,174 @@ from typing import Any, Optional, Union
 from crowler.db.shared_file_db import get_shared_files
 
 from crowler.db.prompt_db import get_latest_prompts
+from crowler.db.url_db import get_urls
+from crowler.util.budget_util import (
+    DROPPED,
+    TRUNCATED,
+    BudgetPlan,
+    Priority,
+    Section,
+    plan_budget,
+)
 from crowler.util.file_util import stringify_file_contents
-
-from crowler.util.string_util import get_instruction_strings
+from crowler.util.retrieval_util import retrieval_k, stringify_relevant_chunks
+from crowler.util.token_util import count_tokens
+from crowler.util.url_context_util import stringify_url_contents
 
 from crowler.instruction.instruction_model import Instruction
 from pathlib import Path
 
+import typer
 
-def format_messages(
+
+def _block_sections(part: str, blocks: list[str], priority: Priority) -> list[Section]:
+    """Sections for a labelled block list (`[header, block, ...]`)."""
+    header, *rest = blocks
+    return [
+        Section(
+            part=part,
+            name=block.split("\n", 1)[0],
+            text=block,
+            priority=priority,
+            header=header,
+        )
+        for block in rest
+    ]
+
+
+def build_sections(
     instructions: Optional[list[Instruction]] = None,
     prompt_files: Optional[Union[list[str], list[Path]]] = None,
     final_prompt: Optional[str] = None,
-) -> list[dict[str, Any]]:
-    msgs: list[dict[str, Any]] = []
-
-    if instructions:
-        instruction_strings = get_instruction_strings(instructions)
-        msgs.append(
-            {
-                "role": "system",
-                "content": "\n".join(instruction_strings),
-            }
+) -> list[Section]:
+    """Every block a request would carry, in message order."""
+    sections = [
+        Section(
+            part="system",
+            name=f"instruction #{i}",
+            text=instruction.system_text,
+            priority=Priority.REQUIRED,
+            tokens=instruction.token_count,
         )
+        for i, instruction in enumerate(instructions or [], 1)
+        if instruction.instructions
+    ]
 
-    user_parts = []
+    prompts = get_latest_prompts()
+    prompt_files_content = stringify_file_contents(prompt_files) if prompt_files else []
 
     shared_files = get_shared_files()
-    if shared_files:
-        shared_files_content = stringify_file_contents(
-            list(shared_files), "File context"
+    urls = get_urls()
+    k = retrieval_k()
+    query = "\n".join([*prompts, *prompt_files_content[1:], final_prompt or ""])
+    if k > 0 and query.strip() and (shared_files or urls):
+        relevant_content = stringify_relevant_chunks(
+            sorted(shared_files), sorted(urls), query, k
         )
-        user_parts.append("\n".join(shared_files_content))
+        if relevant_content:
+            sections += _block_sections(
+                "relevant", relevant_content, Priority.SHARED_FILE
+            )
+    else:
+        if shared_files:
+            shared_files_content = stringify_file_contents(
+                list(shared_files), "File context"
+            )
+            if shared_files_content:
+                sections += _block_sections(
+                    "shared", shared_files_content, Priority.SHARED_FILE
+                )
 
-    prompts = get_latest_prompts()
-    if prompts:
-        user_parts.append("\n".join(prompts))
+        if urls:
+            url_content = stringify_url_contents(sorted(urls))
+            if url_content:
+                sections += _block_sections("urls", url_content, Priority.URL)
 
-    if prompt_files:
-        prompt_files_content = stringify_file_contents(prompt_files)
-        user_parts.append("\n".join(prompt_files_content))
+    sections += [
+        Section(part="prompts", name=f"prompt #{i}", text=p, priority=Priority.PROMPT)
+        for i, p in enumerate(prompts, 1)
+    ]
+
+    if prompt_files_content:
+        sections += _block_sections(
+            "prompt_files", prompt_files_content, Priority.REQUIRED
+        )
 
     if final_prompt:
-        user_parts.append(final_prompt)
+        sections.append(
+            Section(
+                part="final",
+                name="final prompt",
+                text=final_prompt,
+                priority=Priority.REQUIRED,
+            )
+        )
+    return sections
+
+
+def _render_parts(sections: list[Section]) -> list[str]:
+    """Join consecutive sections of the same part, under its header."""
+    parts: list[str] = []
+    current: Optional[str] = None
+    lines: list[str] = []
+    for section in sections:
+        if section.status == DROPPED:
+            continue
+        if section.part != current:
+            if lines:
+                parts.append("\n".join(lines))
+            current = section.part
+            lines = [section.header] if section.header else []
+        lines.append(section.text)
+    if lines:
+        parts.append("\n".join(lines))
+    return parts
+
+
+def _overhead(sections: list[Section]) -> int:
+    """Headers plus roughly one token per separator."""
+    headers = {s.header for s in sections if s.header}
+    return sum(count_tokens(h) for h in headers) + len(sections)
+
+
+def plan_messages(
+    instructions: Optional[list[Instruction]] = None,
+    prompt_files: Optional[Union[list[str], list[Path]]] = None,
+    final_prompt: Optional[str] = None,
+    budget: Optional[int] = None,
+) -> BudgetPlan:
+    """Build the request's sections and fit them into `budget` tokens."""
+    sections = build_sections(instructions, prompt_files, final_prompt)
+    return plan_budget(sections, budget, overhead=_overhead(sections))
+
+
+def format_messages(
+    instructions: Optional[list[Instruction]] = None,
+    prompt_files: Optional[Union[list[str], list[Path]]] = None,
+    final_prompt: Optional[str] = None,
+    budget: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    plan = plan_messages(instructions, prompt_files, final_prompt, budget)
+    dropped, truncated = plan.count(DROPPED), plan.count(TRUNCATED)
+    if dropped or truncated:
+        typer.secho(
+            f"✂️  Trimmed context to fit {budget} tokens: "
+            f"dropped {dropped}, truncated {truncated} section(s).",
+            fg="yellow",
+        )
+    if not plan.fits:
+        typer.secho(
+            f"⚠️  Request needs ~{plan.tokens} tokens but the budget is {budget}.",
+            fg="yellow",
+            err=True,
+        )
+
+    msgs: list[dict[str, Any]] = []
+    system = [s for s in plan.sections if s.part == "system"]
+    if system:
+        msgs.append({"role": "system", "content": "\n".join(s.text for s in system)})
 
+    user_parts = _render_parts([s for s in plan.sections if s.part != "system"])
     if user_parts:
         msgs.append(
             {
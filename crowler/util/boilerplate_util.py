@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import math
+import re
+import zlib
+from collections import defaultdict
+from dataclasses import replace
+
+from crowler.util.html_util import HtmlData
+from crowler.util.http_util import url_host
+
+SHINGLE_WORDS = 3
+MIN_BLOCK_WORDS = 3
+NUM_HASHES = 32
+NUM_BANDS = 8
+SIMILARITY = 0.8
+BOILERPLATE_SHARE = 0.3
+
+_ROWS = NUM_HASHES // NUM_BANDS
+_SEEDS = tuple(zlib.crc32(f"seed-{i}".encode()) for i in range(NUM_HASHES))
+_WORD_RE = re.compile(r"\w+")
+
+Signature = tuple[int, ...]
+
+
+def shingles(block: str, size: int = SHINGLE_WORDS) -> set[str]:
+    """Lower-cased word `size`-grams; shorter blocks are a single shingle."""
+    words = _WORD_RE.findall(block.lower())
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(items: set[str]) -> Signature:
+    """Deterministic MinHash signature (salted CRC32, stable across runs)."""
+    hashes = [zlib.crc32(item.encode()) for item in items]
+    return tuple(min(h ^ seed for h in hashes) for seed in _SEEDS)
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of the sets behind two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def strip_repeated_blocks(
+    texts: list[str], share: float = BOILERPLATE_SHARE
+) -> list[str]:
+    """
+    Drop lines that recur, verbatim or nearly so, on at least `share` of
+    `texts` (and on two pages at minimum). Lines are bucketed by LSH band so
+    only likely matches are compared; lines under `MIN_BLOCK_WORDS` words
+    are never dropped, since short headings repeat legitimately.
+    """
+    if len(texts) < 2:
+        return texts
+    min_pages = max(2, math.ceil(share * len(texts)))
+    docs = [text.split("\n") for text in texts]
+
+    signatures: dict[tuple[int, int], Signature] = {}
+    buckets: dict[tuple[int, Signature], set[tuple[int, int]]] = defaultdict(set)
+    for doc_id, lines in enumerate(docs):
+        for line_id, line in enumerate(lines):
+            if len(_WORD_RE.findall(line)) < MIN_BLOCK_WORDS:
+                continue
+            signature = minhash(shingles(line))
+            signatures[(doc_id, line_id)] = signature
+            for band in range(NUM_BANDS):
+                rows = signature[band * _ROWS : (band + 1) * _ROWS]
+                buckets[(band, rows)].add((doc_id, line_id))
+
+    repeated: set[tuple[int, int]] = set()
+    for block, signature in signatures.items():
+        candidates: set[tuple[int, int]] = set()
+        for band in range(NUM_BANDS):
+            rows = signature[band * _ROWS : (band + 1) * _ROWS]
+            candidates |= buckets[(band, rows)]
+        pages = {
+            doc_id
+            for doc_id, line_id in candidates
+            if similarity(signature, signatures[(doc_id, line_id)]) >= SIMILARITY
+        }
+        if len(pages) >= min_pages:
+            repeated.add(block)
+
+    return [
+        "\n".join(
+            line
+            for line_id, line in enumerate(lines)
+            if (doc_id, line_id) not in repeated
+        )
+        for doc_id, lines in enumerate(docs)
+    ]
+
+
+def remove_boilerplate(
+    pages: dict[str, HtmlData], share: float = BOILERPLATE_SHARE
+) -> dict[str, HtmlData]:
+    """`strip_repeated_blocks` applied to the pages of each host separately."""
+    by_host: dict[str, list[str]] = defaultdict(list)
+    for url in pages:
+        by_host[url_host(url)].append(url)
+
+    cleaned = dict(pages)
+    for urls in by_host.values():
+        texts = strip_repeated_blocks([pages[url].text for url in urls], share)
+        for url, text in zip(urls, texts):
+            cleaned[url] = replace(pages[url], text=text)
+    return cleaned
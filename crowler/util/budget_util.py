@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Optional
+
+from crowler.util.env_util import env_int
+from crowler.util.token_util import (
+    TruncateStrategy,
+    count_tokens,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+
+DEFAULT_CONTEXT_WINDOW = 128_000
+# a section that would keep fewer tokens than this is dropped, not cut
+MIN_TRUNCATED_TOKENS = 200
+# room left for the truncation marker
+_MARKER_TOKENS = 16
+
+KEPT = "kept"
+TRUNCATED = "truncated"
+DROPPED = "dropped"
+
+
+class Priority(IntEnum):
+    """Lower priorities are trimmed first; REQUIRED is never trimmed."""
+
+    URL = 0
+    SHARED_FILE = 1
+    PROMPT = 2
+    REQUIRED = 3
+
+
+@dataclass
+class Section:
+    """
+    One block of a request. Sections sharing `part` are rendered together
+    under `header`; `tokens` is counted on creation unless given.
+    """
+
+    part: str
+    name: str
+    text: str
+    priority: Priority
+    header: str = ""
+    tokens: int = -1
+    original_tokens: int = -1
+    status: str = KEPT
+
+    def __post_init__(self) -> None:
+        if self.tokens < 0:
+            self.tokens = count_tokens(self.text)
+        if self.original_tokens < 0:
+            self.original_tokens = self.tokens
+
+
+@dataclass
+class BudgetPlan:
+    sections: list[Section]
+    budget: Optional[int]
+    overhead: int = 0
+
+    @property
+    def tokens(self) -> int:
+        return self.overhead + sum(
+            s.tokens for s in self.sections if s.status != DROPPED
+        )
+
+    @property
+    def fits(self) -> bool:
+        return self.budget is None or self.tokens <= self.budget
+
+    def count(self, status: str) -> int:
+        return sum(1 for s in self.sections if s.status == status)
+
+
+def context_window(config: Any) -> int:
+    """
+    Context window of the model behind `config`: $CROWLER_CONTEXT_WINDOW,
+    else the config's `context_window`, else `DEFAULT_CONTEXT_WINDOW`.
+    """
+    default = getattr(config, "context_window", None) or DEFAULT_CONTEXT_WINDOW
+    return env_int("CROWLER_CONTEXT_WINDOW", default)
+
+
+def input_budget(config: Any) -> int:
+    """Tokens left for the request once `max_tokens` is reserved for output."""
+    return max(0, context_window(config) - config.max_tokens)
+
+
+def plan_budget(
+    sections: list[Section], budget: Optional[int], overhead: int = 0
+) -> BudgetPlan:
+    """
+    Fit `sections` into `budget` tokens. Over budget, the lowest-priority
+    sections go first (the last one listed within a priority): each is cut
+    with `TruncateStrategy.HEAD_TAIL` when enough of it would remain, and
+    dropped otherwise. REQUIRED sections are always kept, so the plan may
+    still not fit.
+    """
+    plan = BudgetPlan(sections=sections, budget=budget, overhead=overhead)
+    if budget is None:
+        return plan
+    over = plan.tokens - budget
+    order = sorted(
+        (i for i, s in enumerate(sections) if s.priority < Priority.REQUIRED),
+        key=lambda i: (sections[i].priority, -i),
+    )
+    for section in (sections[i] for i in order):
+        if over <= 0:
+            break
+        keep = section.tokens - over - _MARKER_TOKENS
+        if keep >= MIN_TRUNCATED_TOKENS:
+            _truncate(section, keep)
+            over = plan.tokens - budget
+        else:
+            section.status = DROPPED
+            over -= section.tokens
+    return plan
+
+
+def _truncate(section: Section, keep: int) -> None:
+    # truncate_to_tokens works in heuristic tokens; scale to this text's ratio
+    target = keep * estimate_tokens(section.text) // max(1, section.tokens)
+    section.text = truncate_to_tokens(section.text, target, TruncateStrategy.HEAD_TAIL)
+    section.tokens = count_tokens(section.text)
+    section.status = TRUNCATED
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import mmap
+import tokenize
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+_CHUNK_BYTES = 64 * 1024
+_ANY_LINE = 0  # from `_statement_starts`: cut at any line from here on
+_NON_STATEMENT_TOKENS = frozenset(
+    (tokenize.ENCODING, tokenize.NL, tokenize.COMMENT, tokenize.ENDMARKER)
+)
+
+
+@dataclass
+class FileChunk:
+    path: str
+    index: int
+    total: int
+    start_line: int
+    end_line: int
+    text: str
+
+
+def iter_file_chunks(
+    path: Union[str, Path],
+    max_bytes: int = _CHUNK_BYTES,
+) -> Iterator[FileChunk]:
+    """
+    Split `path` into chunks of roughly `max_bytes`, reading through mmap so
+    only one chunk is decoded at a time. Python files are cut before
+    top-level statements (decorators included), found by a streaming
+    `tokenize` pass that runs alongside the line scan, so a `def` line
+    inside a string is never a cut and the file is never held whole. Other
+    files, statements longer than `max_bytes` and the rest of a file that
+    stops tokenizing are cut at line boundaries.
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            starts = _statement_starts(mm) if path.suffix == ".py" else None
+            spans = _chunk_spans(mm, max_bytes, starts)
+            for index, (start, end, start_line, end_line) in enumerate(spans, 1):
+                yield FileChunk(
+                    path=str(path),
+                    index=index,
+                    total=len(spans),
+                    start_line=start_line,
+                    end_line=end_line,
+                    text=mm[start:end].decode("utf-8", errors="replace"),
+                )
+
+
+def _statement_starts(mm: mmap.mmap) -> Iterator[int]:
+    """
+    First lines (1-based, increasing) of top-level statements, a decorated
+    definition starting at its first decorator. Yields `_ANY_LINE` and stops
+    if the source cannot be tokenized.
+    """
+    mm.seek(0)
+    depth = 0
+    at_statement = True
+    after_decorator = False
+    try:
+        for tok in tokenize.tokenize(mm.readline):
+            if tok.type == tokenize.INDENT:
+                depth += 1
+            elif tok.type == tokenize.DEDENT:
+                depth -= 1
+            elif tok.type == tokenize.NEWLINE:
+                at_statement = True
+            elif tok.type not in _NON_STATEMENT_TOKENS and at_statement:
+                at_statement = False
+                if depth == 0:
+                    if not after_decorator:
+                        yield tok.start[0]
+                    after_decorator = tok.string == "@"
+    except (tokenize.TokenError, SyntaxError):
+        yield _ANY_LINE
+
+
+def _chunk_spans(
+    mm: mmap.mmap, max_bytes: int, starts: Optional[Iterator[int]]
+) -> list[tuple[int, int, int, int]]:
+    """
+    Return (start, end, first_line, last_line) byte spans, lines 1-based.
+    With `starts`, cuts fall only on those lines when possible.
+    """
+    spans: list[tuple[int, int, int, int]] = []
+    size = len(mm)
+    start, start_line = 0, 1
+    boundary: tuple[int, int] | None = None
+    next_start: Optional[int] = _ANY_LINE if starts is None else next(starts, None)
+    pos, line = 0, 1
+
+    while pos < size:
+        nl = mm.find(b"\n", pos)
+        end = size if nl == -1 else nl + 1
+
+        while starts is not None and next_start not in (None, _ANY_LINE):
+            if next_start >= line:
+                break
+            next_start = next(starts, None)
+        if pos > start and next_start in (line, _ANY_LINE):
+            boundary = (pos, line)
+
+        if end - start > max_bytes and pos > start:
+            cut, cut_line = boundary if boundary else (pos, line)
+            spans.append((start, cut, start_line, cut_line - 1))
+            start, start_line = cut, cut_line
+            boundary = None
+
+        pos, line = end, line + 1
+
+    spans.append((start, size, start_line, line - 1))
+    return spans
+
+
+def merge_chunks(chunks: list[FileChunk], replies: dict[int, str]) -> str:
+    """
+    Rebuild a chunked file from the replies for its parts, keyed by chunk
+    index. Parts stay at their original boundaries and keep the blank lines
+    around them; a part without a reply keeps its original text. Raises
+    ValueError unless every one of the file's chunks is present.
+    """
+    by_index = {chunk.index: chunk for chunk in chunks}
+    total = chunks[0].total if chunks else 0
+    if not chunks or sorted(by_index) != list(range(1, total + 1)):
+        raise ValueError(f"got {len(by_index)} of {total} part(s) of the file")
+    parts: list[str] = []
+    for index in range(1, total + 1):
+        text = by_index[index].text
+        reply = replies.get(index)
+        parts.append(text if reply is None else _fit_reply(reply, text))
+    return "".join(parts)
+
+
+def _fit_reply(reply: str, original: str) -> str:
+    # a reply's own leading/trailing newlines are replaced by the original's
+    core = original.strip("\n")
+    if not core:
+        return original
+    lead = original[: original.index(core[0])]
+    trail = original[len(lead) + len(core) :]
+    return lead + reply.strip("\n") + trail
+
+
+def stringify_chunk(chunk: FileChunk) -> str:
+    return (
+        f"File: {chunk.path} (part {chunk.index}/{chunk.total}, "
+        f"lines {chunk.start_line}-{chunk.end_line})\n```\n{chunk.text}\n```\n"
+        "This is only one part of a larger file; answer for this part alone "
+        "and keep the same file path so parts can be merged."
+    )
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import threading
+import time
+from enum import Enum
+from typing import Callable, Iterator, Optional
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+import typer
+
+from crowler.util.html_util import HtmlData, extract_html_data
+from crowler.util.http_util import (
+    DEFAULT_TIMEOUT,
+    MAX_PER_HOST,
+    MAX_WORKERS,
+    USER_AGENT,
+    fetch_concurrently,
+    url_host,
+)
+
+DEFAULT_DELAY = 0.5
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_DISALLOW_ALL = ["User-agent: *", "Disallow: /"]
+
+
+class CrawlScope(str, Enum):
+    DOMAIN = "domain"
+    PREFIX = "prefix"
+
+
+class RobotsDisallowed(Exception):
+    pass
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    Canonical form used for dedup: resolved against `base`, fragment dropped,
+    scheme/host lower-cased, default port removed and an empty path made "/".
+    Returns None for anything that is not http(s).
+    """
+    absolute, _ = urldefrag(urljoin(base, url.strip()) if base else url.strip())
+    parts = urlsplit(absolute)
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return None
+    host = parts.hostname.lower()
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    if port and port != _DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+def in_scope(url: str, seed: str, scope: CrawlScope) -> bool:
+    if scope == CrawlScope.PREFIX:
+        return url.startswith(seed)
+    return url_host(url) == url_host(seed)
+
+
+class RobotsCache:
+    """robots.txt rules per host, fetched once and shared by worker threads."""
+
+    def __init__(self) -> None:
+        self._parsers: dict[str, RobotFileParser] = {}
+        self._lock = threading.Lock()
+        self._host_locks: dict[str, threading.Lock] = {}
+
+    def _parser(self, url: str, session: requests.Session) -> RobotFileParser:
+        host = url_host(url)
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            parser = self._parsers.get(host)
+            if parser is None:
+                parser = _fetch_robots(url, session)
+                self._parsers[host] = parser
+            return parser
+
+    def allowed(self, url: str, session: requests.Session) -> bool:
+        return self._parser(url, session).can_fetch(USER_AGENT, url)
+
+    def crawl_delay(self, url: str, session: requests.Session) -> float:
+        delay = self._parser(url, session).crawl_delay(USER_AGENT)
+        return float(delay) if delay else 0.0
+
+
+def _fetch_robots(url: str, session: requests.Session) -> RobotFileParser:
+    parts = urlsplit(url)
+    robots_url = urlunsplit((parts.scheme, parts.netloc, "/robots.txt", "", ""))
+    parser = RobotFileParser(robots_url)
+    try:
+        resp = session.get(robots_url, timeout=DEFAULT_TIMEOUT)
+    except requests.RequestException:
+        parser.parse(_DISALLOW_ALL)
+        return parser
+    # RFC 9309: a missing robots.txt allows everything, a server error nothing
+    if resp.status_code >= 500:
+        parser.parse(_DISALLOW_ALL)
+    elif resp.status_code >= 400:
+        parser.parse([])
+    else:
+        parser.parse(resp.text.splitlines())
+    return parser
+
+
+class HostThrottle:
+    """Keep successive requests to one host at least `delay` seconds apart."""
+
+    def __init__(self) -> None:
+        self._next_slot: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str, delay: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + delay
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def crawl(
+    seed: str,
+    depth: int = 1,
+    max_pages: int = 50,
+    scope: CrawlScope = CrawlScope.DOMAIN,
+    delay: float = DEFAULT_DELAY,
+    respect_robots: bool = True,
+    max_workers: int = MAX_WORKERS,
+    max_per_host: int = MAX_PER_HOST,
+    fetch: Callable[[str, requests.Session], HtmlData] = extract_html_data,
+) -> Iterator[HtmlData]:
+    """
+    Breadth-first crawl from `seed`, one depth level per concurrent batch.
+    Links are normalized and deduplicated, kept within `scope`, checked
+    against robots.txt and fetched no faster than `delay` (or the site's
+    Crawl-delay) per host. Yields pages as they are fetched.
+    """
+    start = normalize_url(seed)
+    if start is None:
+        raise ValueError(f"Not an http(s) URL: {seed}")
+
+    robots = RobotsCache()
+    throttle = HostThrottle()
+
+    def polite_fetch(url: str, session: requests.Session) -> HtmlData:
+        host_delay = delay
+        if respect_robots:
+            if not robots.allowed(url, session):
+                raise RobotsDisallowed("blocked by robots.txt")
+            host_delay = max(delay, robots.crawl_delay(url, session))
+        throttle.wait(url_host(url), host_delay)
+        return fetch(url, session)
+
+    seen = {start}
+    frontier = [start]
+    attempted = 0
+
+    for level in range(depth + 1):
+        batch = frontier[: max_pages - attempted]
+        if not batch:
+            break
+        attempted += len(batch)
+        next_frontier: list[str] = []
+
+        for url, data, err in fetch_concurrently(
+            batch, polite_fetch, max_workers=max_workers, max_per_host=max_per_host
+        ):
+            if err is not None or data is None:
+                typer.secho(f"⚠️  Skipped {url}: {err}", fg="yellow", err=True)
+                continue
+            yield data
+            if level == depth:
+                continue
+            for link in data.links:
+                candidate = normalize_url(link, base=url)
+                if (
+                    candidate
+                    and candidate not in seen
+                    and in_scope(candidate, start, scope)
+                ):
+                    seen.add(candidate)
+                    next_frontier.append(candidate)
+
+        frontier = next_frontier
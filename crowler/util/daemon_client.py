@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from crowler.util.session_util import CACHE_DIR, get_session_id
+
+# kept to the standard library: this runs before every forwarded command
+
+HEADER = struct.Struct("!I")
+STDIO_FDS = (0, 1, 2)
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+def socket_path() -> Path:
+    """Socket of this terminal session's daemon."""
+    return CACHE_DIR / f"daemon.{get_session_id()}.sock"
+
+
+def encode(message: dict[str, Any]) -> bytes:
+    data = json.dumps(message).encode("utf-8")
+    return HEADER.pack(len(data)) + data
+
+
+def _recv_exact(sock: socket.socket, size: int, buffer: bytes = b"") -> bytes:
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError("connection closed mid-message")
+        buffer += chunk
+    return buffer
+
+
+def read_message(sock: socket.socket, buffer: bytes = b"") -> dict[str, Any]:
+    """One length-prefixed JSON message; `buffer` holds bytes already read."""
+    head = _recv_exact(sock, HEADER.size, buffer[: HEADER.size])
+    (size,) = HEADER.unpack(head)
+    if size > MAX_MESSAGE_BYTES:
+        raise ValueError(f"message of {size} bytes is too large")
+    body = _recv_exact(sock, size, buffer[HEADER.size :])
+    return json.loads(body)
+
+
+def connect(path: Optional[Path] = None) -> Optional[socket.socket]:
+    """Connected socket, or None when no daemon is listening."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path or socket_path()))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def request(
+    message: dict[str, Any],
+    fds: Sequence[int] = (),
+    path: Optional[Path] = None,
+) -> Optional[dict[str, Any]]:
+    """
+    Send `message` (and `fds`) to the daemon and wait for its reply; None
+    when no daemon is running.
+    """
+    sock = connect(path)
+    if sock is None:
+        return None
+    with sock:
+        if fds:
+            socket.send_fds(sock, [encode(message)], list(fds))
+        else:
+            sock.sendall(encode(message))
+        return read_message(sock)
+
+
+def forward(argv: list[str], path: Optional[Path] = None) -> Optional[int]:
+    """
+    Run `argv` in the daemon with this process's stdin/stdout/stderr, cwd and
+    environment. Returns its exit code, or None when no daemon is running and
+    the command should run locally.
+    """
+    message = {"op": "run", "argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+    try:
+        reply = request(message, fds=STDIO_FDS, path=path)
+    except (OSError, ValueError) as e:
+        # the daemon took the command; running it again locally could repeat it
+        print(f"❌ Lost the crowler daemon: {e}", file=sys.stderr)
+        return 1
+    if reply is None:
+        return None
+    return int(reply.get("exit", 1))
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import _thread
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from crowler.util.daemon_client import (
+    STDIO_FDS,
+    encode,
+    read_message,
+    socket_path,
+)
+from crowler.util.env_util import env_int
+from crowler.util.session_util import session_key
+
+DAEMON_IDLE_TIMEOUT = 30 * 60
+
+
+def daemon_idle_timeout() -> int:
+    """Seconds without a request before the daemon exits ($CROWLER_DAEMON_IDLE)."""
+    return env_int("CROWLER_DAEMON_IDLE", DAEMON_IDLE_TIMEOUT)
+
+
+def warm_up() -> None:
+    """
+    Import everything a command may need up front: the CLI with all its
+    sub-apps and the configured provider SDK. Clients created by commands
+    are then kept for the daemon's lifetime.
+    """
+    from crowler.ai import ai_client_factory
+    from crowler.cli.app import CrowlerGroup
+    from crowler.util.import_util import import_object
+
+    ai_client_factory.enable_client_cache()
+    targets = list(CrowlerGroup.lazy_subcommands.values())
+    client = (os.getenv("AI_CLIENT") or "").strip().lower()
+    if client in ai_client_factory.AI_CLIENTS:
+        targets.append(ai_client_factory.AI_CLIENTS[client])
+    for target in targets:
+        try:
+            import_object(target)
+        except Exception as e:
+            print(f"⚠️  Could not preload {target}: {e}", file=sys.stderr)
+
+
+class DaemonServer:
+    """
+    Serves one terminal session's commands over a Unix socket, one at a time,
+    in a process that keeps imports, AI clients and parsed stores warm. Each
+    command runs on the client's own stdin/stdout/stderr (passed as file
+    descriptors), in its cwd and with its environment.
+    """
+
+    def __init__(self, path: Optional[Path] = None, idle_timeout: int = 0) -> None:
+        self.path = path or socket_path()
+        self.idle_timeout = idle_timeout or daemon_idle_timeout()
+        self.session_key = session_key()
+        self.started = time.time()
+        self.requests = 0
+        self._stopping = False
+        self._command: Any = None  # the CLI's click command, built once
+
+    def serve_forever(self) -> None:
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.path.unlink(missing_ok=True)
+            old_umask = os.umask(0o177)
+            try:
+                server.bind(str(self.path))
+            finally:
+                os.umask(old_umask)
+            server.listen()
+            server.settimeout(self.idle_timeout)
+            while not self._stopping:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    break
+                with conn:
+                    self._handle(conn)
+        finally:
+            server.close()
+            self.path.unlink(missing_ok=True)
+
+    def _handle(self, conn: socket.socket) -> None:
+        fds: list[int] = []
+        try:
+            conn.settimeout(None)
+            data, fds, _, _ = socket.recv_fds(conn, 64 * 1024, len(STDIO_FDS))
+            message = read_message(conn, data)
+            reply = self._dispatch(message, fds, conn)
+            conn.sendall(encode(reply))
+        except (OSError, ValueError, KeyboardInterrupt) as e:
+            print(f"⚠️  Dropped a request: {e!r}", file=sys.stderr)
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def _dispatch(
+        self, message: dict[str, Any], fds: list[int], conn: socket.socket
+    ) -> dict[str, Any]:
+        op = message.get("op")
+        if op == "ping":
+            return {
+                "pid": os.getpid(),
+                "started": self.started,
+                "requests": self.requests,
+            }
+        if op == "stop":
+            self._stopping = True
+            return {"ok": True}
+        if op == "run" and len(fds) == len(STDIO_FDS):
+            self.requests += 1
+            return {"exit": self._run(message, fds, conn)}
+        return {"error": f"unsupported request {op!r}"}
+
+    def _run(self, message: dict[str, Any], fds: list[int], conn: socket.socket) -> int:
+        from crowler.cli.app import build_command, invoke
+
+        if self._command is None:
+            self._command = build_command()
+        saved_fds = [os.dup(fd) for fd in STDIO_FDS]
+        saved_cwd = os.getcwd()
+        saved_env = dict(os.environ)
+        done = threading.Event()
+        watcher = threading.Thread(
+            target=_interrupt_on_hangup, args=(conn, done), daemon=True
+        )
+        try:
+            _flush()
+            for fd, target in zip(fds, STDIO_FDS):
+                os.dup2(fd, target)
+            os.chdir(message["cwd"])
+            os.environ.clear()
+            os.environ.update(message["env"])
+            os.environ["HISTORY_SESSION_ID"] = self.session_key
+            _load_dotenv()
+            watcher.start()
+            return invoke(list(message["argv"]), self._command)
+        finally:
+            done.set()
+            _flush()
+            for fd, target in zip(saved_fds, STDIO_FDS):
+                os.dup2(fd, target)
+                os.close(fd)
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_env)
+
+
+def _flush() -> None:
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+
+def _load_dotenv() -> None:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def _interrupt_on_hangup(conn: socket.socket, done: threading.Event) -> None:
+    # the client only closes early when interrupted (Ctrl-C): stop the command
+    try:
+        conn.recv(1)
+    except OSError:
+        return
+    if not done.is_set():
+        _thread.interrupt_main()
+
+
+def main() -> None:
+    server = DaemonServer()
+    warm_up()
+    print(f"crowler daemon {os.getpid()} listening on {server.path}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import os
+
+import typer
+
+
+def env_int(name: str, default: int) -> int:
+    """Integer from environment variable `name`, or `default` if unset/invalid."""
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        typer.secho(
+            f"⚠️  Invalid {name}={raw!r}; using {default}.", fg="yellow", err=True
+        )
+        return default
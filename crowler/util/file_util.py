@@ -1,11 +1,17 @@
 from __future__ import annotations
+import codecs
+import hashlib
 import os
-import subprocess
+import re
+import stat
+import tempfile
 import typer
 
+from dataclasses import dataclass
 from fnmatch import fnmatch
+from functools import lru_cache
 from pathlib import Path
-from typing import OrderedDict, Sequence, Union
+from typing import Iterable, Optional, OrderedDict, Sequence, Union
 
 
 DEFAULT_IGNORES: tuple[str, ...] = (
@@ -20,8 +26,26 @@ DEFAULT_IGNORES: tuple[str, ...] = (
     ".mypy_cache",
     "LICENSE",
     "*.webp",
-    "*.jpe?g",
+    "*.jpg",
+    "*.jpeg",
     "*.gif",
+    "*.png",
+    "*.ico",
+    "*.pdf",
+    "*.zip",
+    "*.gz",
+    "*.tar",
+    "*.whl",
+    "*.so",
+    "*.dylib",
+    "*.dll",
+    "*.exe",
+    "*.sqlite",
+    "*.sqlite3",
+    "*.db",
+    "*.min.js",
+    "*.min.css",
+    "*.map",
 )
 
 # ────────────────────────────────────────────────────────────────────
@@ -37,6 +61,63 @@ def should_ignore(name: str, patterns: Sequence[str] = DEFAULT_IGNORES) -> bool:
     return any(fnmatch(name, pat) for pat in patterns)
 
 
+# ────────────────────────────────────────────────────────────────────
+# content sniffing
+# ────────────────────────────────────────────────────────────────────
+_SNIFF_BYTES = 8 * 1024
+_MAX_BAD_CHAR_RATIO = 0.1
+_MAX_AVG_LINE_LENGTH = 500
+# generator markers on a comment line: `@generated`, Go's "Code generated
+# ... DO NOT EDIT.", protoc's "Generated by ... DO NOT EDIT!", "autogenerated"
+_GENERATED_MARKER_RE = re.compile(
+    r"^\s*(?:#|//|/\*|\*|--|;|<!--).*?"
+    r"(?:@generated\b|\bcode generated\b.*\bdo not edit\b"
+    r"|\bgenerated by\b.*\bdo not edit\b|\bauto-?generated\b)",
+    re.IGNORECASE | re.MULTILINE,
+)
+_GENERATED_HEADER_LINES = 5
+_TEXT_CONTROL_CHARS = frozenset("\t\n\r\f\b")
+
+
+def sniff_file(path: Union[str, Path]) -> Optional[str]:
+    """
+    Inspect the first few KB of `path` and return a reason why it should
+    not be sent to the model (binary, badly encoded, minified or generated),
+    or None when it looks like regular source text.
+    """
+    with open(path, "rb") as f:
+        head = f.read(_SNIFF_BYTES)
+    return sniff_bytes(head)
+
+
+def sniff_bytes(head: bytes) -> Optional[str]:
+    if not head:
+        return None
+    if b"\x00" in head:
+        return "binary content (NUL bytes)"
+
+    # incremental decode: a multi-byte char cut at the sample edge is not an error
+    sample = codecs.getincrementaldecoder("utf-8")(errors="replace").decode(head)
+    if not sample:
+        return None
+    bad = sum(
+        1
+        for ch in sample
+        if ch == "\ufffd" or (ch < " " and ch not in _TEXT_CONTROL_CHARS)
+    )
+    if bad / len(sample) > _MAX_BAD_CHAR_RATIO:
+        return f"low UTF-8 confidence ({bad} undecodable char(s) in sample)"
+
+    avg_line = len(sample) / (sample.count("\n") + 1)
+    if avg_line > _MAX_AVG_LINE_LENGTH:
+        return f"minified content (~{int(avg_line)} chars per line)"
+
+    header = "\n".join(sample.splitlines()[:_GENERATED_HEADER_LINES])
+    if _GENERATED_MARKER_RE.search(header):
+        return "generated file marker in header"
+    return None
+
+
 # ────────────────────────────────────────────────────────────────────
 # file discovery
 # ────────────────────────────────────────────────────────────────────
@@ -51,9 +132,12 @@ def get_all_files(
         return []
 
     if root.is_file():
+        if _skip_reason(root):
+            return []
         return [str(root)]
 
     results: list[str] = []
+    skipped = 0
 
     for dirpath, dirnames, filenames in os.walk(root):
         dirnames[:] = [d for d in dirnames if not should_ignore(d, ignore_patterns)]
@@ -62,12 +146,27 @@ def get_all_files(
             if should_ignore(fname, ignore_patterns):
                 continue
             full = Path(dirpath) / fname
+            if _skip_reason(full):
+                skipped += 1
+                continue
             results.append(str(full))
 
     typer.secho(f"✅ Found {len(results)} file(s) under {root}", fg="green")
+    if skipped:
+        typer.secho(f"⚠️  Skipped {skipped} non-text file(s).", fg="yellow")
     return results
 
 
+def _skip_reason(path: Path) -> Optional[str]:
+    try:
+        reason = sniff_file(path)
+    except OSError as err:
+        reason = f"unreadable ({err})"
+    if reason:
+        typer.secho(f"⚠️  Skipped {path}: {reason}", fg="yellow")
+    return reason
+
+
 # ────────────────────────────────────────────────────────────────────
 # file <-> string helpers
 # ────────────────────────────────────────────────────────────────────
@@ -94,6 +193,14 @@ def stringify_file_contents(
     return string_list
 
 
+def is_oversized(path: Union[str, Path]) -> bool:
+    """True when `path` exceeds the single-request cap and must be chunked."""
+    try:
+        return Path(path).stat().st_size > _MAX_MB * 1024 * 1024
+    except OSError:
+        return False
+
+
 def stringify_file_content(path: Union[str, Path]) -> str:
     try:
         if isinstance(path, str):
@@ -101,6 +208,8 @@ def stringify_file_content(path: Union[str, Path]) -> str:
         if path.stat().st_size > _MAX_MB * 1024 * 1024:
             typer.secho(f"⚠️  {path} bigger than {_MAX_MB} MB; skipped.", fg="yellow")
             return ""
+        if _skip_reason(path):
+            return ""
         text = path.read_text(encoding="utf-8", errors="replace").strip()
         return text
     except Exception as err:
@@ -113,51 +222,142 @@ def stringify_file_content(path: Union[str, Path]) -> str:
 # ────────────────────────────────────────────────────────────────────
 
 
+@dataclass
+class RewriteReport:
+    written: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
 def rewrite_files(
     files: OrderedDict[str, str],
     force: bool = False,
-) -> None:
+) -> RewriteReport:
+    report = RewriteReport()
     for path, content in files.items():
+        if is_unchanged(path, content):
+            typer.secho(f"⏸️  Unchanged {path}", fg="cyan")
+            report.unchanged += 1
+            continue
         if not force:
             if not typer.confirm(f"Overwrite {path}?"):
                 typer.secho(f"✋  Skipped {path}", fg="cyan")
+                report.skipped += 1
                 continue
-        rewrite_file(path, content)
-        typer.secho(f"✅ Wrote {path}", fg="green")
-    typer.secho("✅ All file rewrites complete.", fg="green")
-
-
-def rewrite_file(file_path: str, content: str) -> None:
+        if rewrite_file(path, content):
+            typer.secho(f"✅ Wrote {path}", fg="green")
+            report.written += 1
+        else:
+            report.failed += 1
+    typer.secho(
+        f"✅ All file rewrites complete: {report.written} written, "
+        f"{report.unchanged} unchanged, {report.skipped} skipped"
+        + (f", {report.failed} failed." if report.failed else "."),
+        fg="green",
+    )
+    return report
+
+
+def is_unchanged(file_path: str, content: str) -> bool:
+    """
+    True when `file_path` already holds exactly `content`; sizes are compared
+    before hashing so most real changes never read the old file.
+    """
+    path = Path(file_path).expanduser()
+    data = content.encode("utf-8")
+    try:
+        if not path.is_file() or path.stat().st_size != len(data):
+            return False
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(64 * 1024), b""):
+                digest.update(block)
+        return digest.digest() == hashlib.sha256(data).digest()
+    except OSError:
+        return False
+
+
+@lru_cache(maxsize=None)
+def _umask() -> int:
+    # reading the umask means setting it; a restrictive placeholder keeps
+    # files created meanwhile by other threads private
+    mask = os.umask(0o077)
+    os.umask(mask)
+    return mask
+
+
+def rewrite_file(file_path: str, content: str) -> bool:
     """
-    Overwrite `file_path` with `content`, creating parent dirs as needed.
+    Atomically overwrite `file_path` with `content`, creating parent dirs as
+    needed: data goes to a temp file in the same directory, is fsynced, and is
+    renamed over the target so readers never see a truncated file. A
+    symlink is followed: the file it points to is replaced, not the link.
     """
 
     path = Path(file_path).expanduser()
     try:
+        if path.is_symlink():
+            path = path.resolve()
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(content, encoding="utf-8")
+        if path.exists():
+            mode = stat.S_IMODE(path.stat().st_mode)
+        else:
+            mode = 0o666 & ~_umask()
+        fd, tmp = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp, mode)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return True
     except Exception as err:
         typer.secho(f"❌ Error writing {path}: {err}", fg="red", err=True)
+        return False
 
 
 def find_repo_root() -> Path:
     """
-    Try to find the git top-level; if that fails, fall back to cwd().
+    Walk up from cwd() to the git top-level; if there is none, fall back to cwd().
     """
-    try:
-        git_root = (
-            subprocess.check_output(
-                ["git", "rev-parse", "--show-toplevel"], stderr=subprocess.DEVNULL
-            )
-            .decode()
-            .strip()
-        )
-        return Path(git_root)
-    except Exception as err:
+    cwd = Path.cwd()
+    root = _find_git_root(cwd)
+    if root is None:
         typer.secho(
-            f"⚠️  Could not find git repo root, using cwd: {err}", fg="yellow", err=True
+            f"⚠️  Could not find git repo root, using cwd: {cwd}", fg="yellow", err=True
         )
-        return Path.cwd()
+        return cwd
+    return root
+
+
+@lru_cache(maxsize=None)
+def _find_git_root(start: Path) -> Optional[Path]:
+    """
+    Nearest ancestor of `start` holding a `.git` entry: a directory for plain
+    checkouts, or a `gitdir:` file for worktrees and submodules. Memoised per
+    start directory for the life of the process.
+    """
+    for candidate in (start, *start.parents):
+        git = candidate / ".git"
+        if git.is_dir() or (git.is_file() and _is_gitfile(git)):
+            return candidate
+    return None
+
+
+def _is_gitfile(path: Path) -> bool:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.readline().startswith("gitdir:")
+    except OSError:
+        return False
 
 
 def source_to_test_path(
@@ -177,3 +377,56 @@ def source_to_test_path(
     test_path = repo_root / tests_dir / relative_without_pkg.parent / test_name
     typer.secho(f"✅ Source file {src} maps to test path {test_path}", fg="green")
     return test_path
+
+
+@dataclass
+class SourceTestMapping:
+    source: str
+    test_path: Optional[Path]
+    has_test: bool
+
+
+def map_sources_to_tests(
+    sources: Iterable[Union[str, Path]],
+    repo_root: Path,
+    tests_dir: str = "tests",
+) -> list[SourceTestMapping]:
+    """
+    Batch version of `source_to_test_path`: index the existing tests tree once,
+    then map every source without per-file resolve() calls or logging.
+    Sources outside `repo_root` (or directly in it) get `test_path=None`;
+    files already under `tests_dir` map to themselves.
+    """
+    root = os.path.abspath(repo_root)
+    existing = _index_tests(Path(root) / tests_dir)
+
+    mappings: list[SourceTestMapping] = []
+    for src in sources:
+        rel = os.path.relpath(os.path.abspath(src), root)
+        parts = Path(rel).parts
+        if len(parts) < 2 or parts[0] == os.pardir:
+            mappings.append(SourceTestMapping(str(src), None, False))
+            continue
+        if parts[0] == tests_dir:
+            mappings.append(SourceTestMapping(str(src), Path(root, *parts), True))
+            continue
+        rel_test = Path(*parts[1:-1], f"test_{parts[-1]}")
+        mappings.append(
+            SourceTestMapping(
+                source=str(src),
+                test_path=Path(root, tests_dir, rel_test),
+                has_test=rel_test.as_posix() in existing,
+            )
+        )
+    return mappings
+
+
+def _index_tests(tests_root: Path) -> set[str]:
+    """Posix paths, relative to `tests_root`, of every file in the tests tree."""
+    index: set[str] = set()
+    for dirpath, dirnames, filenames in os.walk(tests_root):
+        dirnames[:] = [d for d in dirnames if not should_ignore(d)]
+        rel_dir = Path(dirpath).relative_to(tests_root)
+        for fname in filenames:
+            index.add((rel_dir / fname).as_posix())
+    return index
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+import typer
+
+from crowler.util.session_util import CACHE_DIR
+
+HTML_CACHE_DIR = CACHE_DIR / "html_cache"
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+# bump whenever html_util.parse_html extracts differently; older entries miss
+EXTRACTOR_VERSION = 2
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    data: dict[str, Any]
+    extractor: int = 0
+
+    def validators(self) -> dict[str, str]:
+        """Headers for a conditional GET against this entry."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HtmlCache:
+    """
+    On-disk cache of extracted pages, one JSON file per URL, keeping the
+    ETag/Last-Modified validators next to the extracted data. Least recently
+    used entries (by file mtime) are evicted once the directory outgrows
+    `max_bytes`. The directory is scanned once per process for its size,
+    which writes then keep up to date; it is only rescanned to evict.
+    """
+
+    def __init__(
+        self, directory: Path = HTML_CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES
+    ) -> None:
+        self._dir = directory
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None  # bytes on disk, scanned on first write
+        self._dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        return self._dir / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        path = self._path(url)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = CacheEntry(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            typer.secho(
+                f"⚠️  Dropping unreadable cache entry for {url}: {err}",
+                fg="yellow",
+                err=True,
+            )
+            self._remove(path)
+            return None
+        if entry.url != url or entry.extractor != EXTRACTOR_VERSION:
+            return None
+        self.touch(url)
+        return entry
+
+    def touch(self, url: str) -> None:
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def put(
+        self,
+        url: str,
+        data: dict[str, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        entry = CacheEntry(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=time.time(),
+            data=data,
+            extractor=EXTRACTOR_VERSION,
+        )
+        path = self._path(url)
+        with self._lock:
+            self._disk_size()  # scanned before this write lands
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(dataclasses.asdict(entry), f)
+            added = os.path.getsize(tmp) - _file_size(path)
+            os.replace(tmp, path)
+        except Exception as err:
+            typer.secho(f"⚠️  Failed to cache {url}: {err}", fg="yellow", err=True)
+            return
+        with self._lock:
+            self._size = self._disk_size() + added
+            over = self._size > self._max_bytes
+        if over:
+            self._evict()
+
+    def refresh(
+        self,
+        entry: CacheEntry,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Restamp `entry` as fetched now, after a 304 revalidated it."""
+        self.put(
+            entry.url,
+            entry.data,
+            etag=etag or entry.etag,
+            last_modified=last_modified or entry.last_modified,
+        )
+
+    def clear(self) -> None:
+        for path in self._dir.glob("*.json"):
+            self._remove(path)
+        with self._lock:
+            self._size = None
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self._dir.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _disk_size(self) -> int:
+        # callers hold the lock
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._scan())
+        return self._size
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = self._scan()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self._max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+            self._size = total
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+@lru_cache(maxsize=None)
+def get_html_cache() -> HtmlCache:
+    return HtmlCache()
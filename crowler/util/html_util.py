@@ -1,8 +1,16 @@
-from dataclasses import dataclass
-from typing import Any
+import codecs
+import importlib.util
+import re
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Optional
 import requests
 from bs4 import BeautifulSoup, Tag
 
+from crowler.util.env_util import env_int
+from crowler.util.html_cache import HtmlCache, get_html_cache
+from crowler.util.http_util import DEFAULT_TIMEOUT
+
 LINK_SKIP_PATTERNS = [
     "javascript:",
     "mailto:",
@@ -26,6 +34,19 @@ NON_CONTENT_ELEMENTS = [
     "iframe",
     "form",
 ]
+_NON_CONTENT = frozenset(NON_CONTENT_ELEMENTS)
+
+MAX_HTML_BYTES = 5 * 1024 * 1024
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+# text-bearing elements scored for main-content detection
+_BLOCK_TAGS = frozenset(
+    ("p", "pre", "li", "td", "dd", "blockquote", "h1", "h2", "h3", "h4", "h5", "h6")
+)
+_MIN_BLOCK_CHARS = 25
+_MAIN_CONTENT_SHARE = 0.5
+
+_STREAM_CHUNK = 64 * 1024
+_CHARSET_RE = re.compile(rb"""charset\s*=\s*["']?([\w.:-]+)""", re.IGNORECASE)
 
 
 @dataclass
@@ -37,48 +58,205 @@ class HtmlData:
     text: str
 
 
-def extract_html_data(url: str) -> HtmlData:
+def max_html_bytes() -> int:
+    """Download cap per page; override with $CROWLER_MAX_HTML_BYTES."""
+    return env_int("CROWLER_MAX_HTML_BYTES", MAX_HTML_BYTES)
+
+
+def extract_html_data(
+    url: str,
+    session: Optional[requests.Session] = None,
+    cache: Optional[HtmlCache] = None,
+    max_bytes: Optional[int] = None,
+) -> HtmlData:
     """
     Fetches a URL, parses its HTML, and extracts relevant data.
     Returns a dictionary with title, meta tags, links, and visible text.
+    Pass a pooled `session` to reuse keep-alive connections across calls.
+    Pages are revalidated against the on-disk cache with a conditional GET;
+    a 304 answer is served from the cache without reparsing and restamps
+    the entry as fresh.
+    The body is streamed and the download aborted as soon as it turns out
+    not to be HTML or to exceed `max_bytes`.
+    """
+    cache = cache or get_html_cache()
+    cached = cache.get(url)
+    headers = cached.validators() if cached else {}
+
+    resp = (session or requests).get(
+        url, timeout=DEFAULT_TIMEOUT, headers=headers, stream=True
+    )
+    try:
+        if cached and resp.status_code == 304:
+            cache.refresh(
+                cached,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            )
+            return HtmlData(**cached.data)
+        resp.raise_for_status()
+        html = read_html_body(
+            resp, max_html_bytes() if max_bytes is None else max_bytes
+        )
+    finally:
+        resp.close()
+
+    data = parse_html(url, html)
+    cache.put(
+        url,
+        asdict(data),
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+    )
+    return data
+
+
+def read_html_body(resp: requests.Response, max_bytes: int) -> str:
+    """
+    Decode a streamed response incrementally, refusing non-HTML content types
+    and bodies over `max_bytes` (declared or actual) before buffering them.
     """
-    resp = requests.get(url, timeout=10)
-    resp.raise_for_status()
+    mime = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if mime and mime not in HTML_CONTENT_TYPES:
+        raise ValueError(f"Not an HTML page (Content-Type: {mime})")
+    length = resp.headers.get("Content-Length", "")
+    if length.isdigit() and int(length) > max_bytes:
+        raise ValueError(f"Page is {length} bytes; limit is {max_bytes}")
+
+    decoder: Optional[codecs.IncrementalDecoder] = None
+    parts: list[str] = []
+    total = 0
+    for chunk in resp.iter_content(chunk_size=_STREAM_CHUNK):
+        total += len(chunk)
+        if total > max_bytes:
+            raise ValueError(f"Page exceeds the {max_bytes}-byte limit")
+        if decoder is None:
+            decoder = _incremental_decoder(resp, chunk)
+        parts.append(decoder.decode(chunk))
+    if decoder is not None:
+        parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+def _incremental_decoder(
+    resp: requests.Response, first_chunk: bytes
+) -> codecs.IncrementalDecoder:
+    """Charset from the Content-Type header, else a <meta charset>, else UTF-8."""
+    match = _CHARSET_RE.search(resp.headers.get("Content-Type", "").encode())
+    match = match or _CHARSET_RE.search(first_chunk[:2048])
+    encoding = match.group(1).decode("ascii", "replace") if match else "utf-8"
+    try:
+        return codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
 
-    soup = BeautifulSoup(resp.text, "html.parser")
 
-    title = soup.title.string.strip() if soup.title and soup.title.string else ""
+@lru_cache(maxsize=None)
+def html_parser_backend() -> str:
+    """`lxml` when it is installed (several times faster), else the stdlib parser."""
+    return "lxml" if importlib.util.find_spec("lxml") else "html.parser"
 
+
+def parse_html(url: str, html: str, parser: Optional[str] = None) -> HtmlData:
+    """
+    Extract title, meta tags, links and visible text from `html` with a single
+    parse and one walk over the element tree; non-content elements found on
+    the way are decomposed in place afterwards. The text comes from the main
+    content container (see `_main_content`), not the whole page.
+    """
+    soup = BeautifulSoup(html, parser or html_parser_backend())
+
+    title = ""
     meta: dict[str, Any] = {}
-    for tag in soup.find_all("meta"):
-        if isinstance(tag, Tag):
-            name = tag.get("name")
-            property_attr = tag.get("property")
-            content = tag.get("content")
-            if name and content:
-                key = name if isinstance(name, str) else " ".join(name)
-                meta[key] = content
-            elif property_attr and content:
-                key = (
-                    property_attr
-                    if isinstance(property_attr, str)
-                    else " ".join(property_attr)
-                )
-                meta[key] = content
-
-    links = []
-    for el in soup.find_all("a"):
-        if isinstance(el, Tag):
-            href = el.get("href")
+    links: list[str] = []
+    non_content: list[Tag] = []
+    blocks: list[Tag] = []
+
+    for tag in soup.find_all(True):
+        if not isinstance(tag, Tag):
+            continue
+        name = tag.name
+        if name == "a":
+            href = tag.get("href")
             if href and isinstance(href, str):
                 if not any(skip in href.lower() for skip in LINK_SKIP_PATTERNS):
                     links.append(href)
+        elif name == "meta":
+            _collect_meta(tag, meta)
+        elif name == "title" and not title and tag.string:
+            title = tag.string.strip()
+        if name in _NON_CONTENT:
+            non_content.append(tag)
+        elif name in _BLOCK_TAGS:
+            blocks.append(tag)
 
-    content_soup = BeautifulSoup(str(soup), "html.parser")
-
-    for element in content_soup(NON_CONTENT_ELEMENTS):
-        element.decompose()
+    main = _main_content(soup, blocks)
+    for element in non_content:
+        if not element.decomposed:
+            element.decompose()
 
-    text = content_soup.get_text(separator="\n", strip=True)
+    text = main.get_text(separator="\n", strip=True)
 
     return HtmlData(url=url, title=title, meta=meta, links=links, text=text)
+
+
+def _main_content(soup: BeautifulSoup, blocks: list[Tag]) -> Tag:
+    """
+    Content-density pick of the main article: each text block scores its
+    length discounted by link density (menus and link lists score ~0), the
+    score is credited to every enclosing container, and the deepest
+    container holding more than `_MAIN_CONTENT_SHARE` of the page's total
+    wins. Containers over half the total form one ancestor chain, so an
+    article next to a smaller text sidebar is picked without the sidebar;
+    text blocks themselves are never picked, so a heading or short
+    paragraph next to one long paragraph is kept. Falls back to the whole
+    page when nothing scores. Runs before non-content elements are
+    decomposed, so blocks inside them are skipped by ancestry.
+    """
+    totals: dict[int, float] = {}
+    nodes: dict[int, Tag] = {}
+    depths: dict[int, int] = {}
+    page_total = 0.0
+
+    for block in blocks:
+        ancestors = [block, *block.parents]
+        if any(node.name in _NON_CONTENT for node in ancestors):
+            continue
+        text_len = len(block.get_text(" ", strip=True))
+        if text_len < _MIN_BLOCK_CHARS:
+            continue
+        link_len = sum(len(a.get_text(" ", strip=True)) for a in block.find_all("a"))
+        score = text_len * max(0.0, 1 - link_len / text_len)
+        if not score:
+            continue
+        page_total += score
+        for depth, node in enumerate(reversed(ancestors)):
+            if node.name in _BLOCK_TAGS:
+                continue
+            key = id(node)
+            totals[key] = totals.get(key, 0.0) + score
+            nodes[key] = node
+            depths[key] = depth
+
+    if not page_total:
+        return soup
+    threshold = page_total * _MAIN_CONTENT_SHARE
+    best = max(
+        (key for key, total in totals.items() if total > threshold),
+        key=lambda key: depths[key],
+    )
+    return nodes[best]
+
+
+def _collect_meta(tag: Tag, meta: dict[str, Any]) -> None:
+    name = tag.get("name")
+    property_attr = tag.get("property")
+    content = tag.get("content")
+    if name and content:
+        key = name if isinstance(name, str) else " ".join(name)
+        meta[key] = content
+    elif property_attr and content:
+        key = (
+            property_attr if isinstance(property_attr, str) else " ".join(property_attr)
+        )
+        meta[key] = content
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 10
+USER_AGENT = "crowler"
+MAX_WORKERS = 16
+MAX_PER_HOST = 4
+
+T = TypeVar("T")
+
+FetchResult = tuple[str, Optional[T], Optional[Exception]]
+
+
+def url_host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+class SessionPool:
+    """
+    One keep-alive `requests.Session` per host, shared by worker threads.
+    Each session's connection pool is sized to the per-host concurrency.
+    """
+
+    def __init__(self, pool_size: int = MAX_PER_HOST) -> None:
+        self._pool_size = pool_size
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> requests.Session:
+        host = url_host(url)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers["User-Agent"] = USER_AGENT
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def __enter__(self) -> SessionPool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def interleave_by_host(urls: Iterable[str]) -> list[str]:
+    """
+    Round-robin URLs across hosts so a long run of one host does not park
+    every worker on that host's limit while other hosts sit idle.
+    """
+    queues: dict[str, deque[str]] = defaultdict(deque)
+    for url in urls:
+        queues[url_host(url)].append(url)
+    ordered: list[str] = []
+    while queues:
+        for host in list(queues):
+            ordered.append(queues[host].popleft())
+            if not queues[host]:
+                del queues[host]
+    return ordered
+
+
+def fetch_concurrently(
+    urls: Iterable[str],
+    fetch: Callable[[str, requests.Session], T],
+    max_workers: int = MAX_WORKERS,
+    max_per_host: int = MAX_PER_HOST,
+) -> Iterator[FetchResult[T]]:
+    """
+    Run `fetch(url, session)` for every URL on a thread pool, with at most
+    `max_workers` requests in flight overall and `max_per_host` per host.
+    Yields `(url, result, error)` tuples as soon as each one completes.
+    """
+    ordered = interleave_by_host(urls)
+    if not ordered:
+        return
+    limits = {
+        host: threading.BoundedSemaphore(max(1, max_per_host))
+        for host in {url_host(u) for u in ordered}
+    }
+
+    with SessionPool(max_per_host) as pool:
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+
+        def run(url: str) -> T:
+            with limits[url_host(url)]:
+                return fetch(url, pool.get(url))
+
+        try:
+            futures = {executor.submit(run, url): url for url in ordered}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    yield url, future.result(), None
+                except Exception as err:
+                    yield url, None, err
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
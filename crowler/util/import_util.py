@@ -0,0 +1,9 @@
+import importlib
+from typing import Any
+
+
+def import_object(target: str) -> Any:
+    """The object named by a "package.module:attribute" string."""
+    module_name, _, attr = target.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr) if attr else module
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable
+
+from crowler.instruction.instruction_model import Instruction
+
+
+@dataclass(frozen=True)
+class FileMatcher:
+    """
+    Allow/deny path filter. Each pattern list is folded into one compiled
+    alternation when its patterns can be joined safely, so a path is usually
+    tested with at most two regex searches. An empty allow list allows
+    everything.
+    """
+
+    allow: tuple[re.Pattern[str], ...]
+    deny: tuple[re.Pattern[str], ...]
+
+    def is_allowed(self, path: str) -> bool:
+        return not self.allow or any(p.search(path) for p in self.allow)
+
+    def is_denied(self, path: str) -> bool:
+        return any(p.search(path) for p in self.deny)
+
+    def matches(self, path: str) -> bool:
+        return self.is_allowed(path) and not self.is_denied(path)
+
+
+def _joinable(pattern: re.Pattern[str]) -> bool:
+    # global inline flags, capturing groups (named or numbered, and the
+    # backreferences to them) change meaning or fail once alternated
+    return pattern.groups == 0 and pattern.flags == re.compile("").flags
+
+
+def _alternation(patterns: tuple[str, ...]) -> tuple[re.Pattern[str], ...]:
+    compiled = tuple(re.compile(p) for p in patterns)
+    if len(compiled) < 2 or not all(_joinable(p) for p in compiled):
+        return compiled
+    try:
+        return (re.compile("|".join(f"(?:{p})" for p in patterns)),)
+    except re.error:
+        return compiled
+
+
+@lru_cache(maxsize=None)
+def get_matcher(allow: tuple[str, ...] = (), deny: tuple[str, ...] = ()) -> FileMatcher:
+    """Shared matcher for a pattern set, compiled on first use only."""
+    return FileMatcher(_alternation(allow), _alternation(deny))
+
+
+def instruction_patterns(
+    instructions: Iterable[Instruction],
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Union of the allow and of the deny patterns of `instructions`."""
+    allow: dict[str, None] = {}
+    deny: dict[str, None] = {}
+    for instruction in instructions:
+        allow.update(dict.fromkeys(p.pattern for p in instruction.allow_file_patterns))
+        deny.update(dict.fromkeys(p.pattern for p in instruction.deny_file_patterns))
+    return tuple(allow), tuple(deny)
+
+
+def instruction_matcher(instructions: Iterable[Instruction]) -> FileMatcher:
+    return get_matcher(*instruction_patterns(instructions))
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+import requests
+import typer
+
+from crowler.util.html_util import HtmlData, extract_html_data
+from crowler.util.http_util import MAX_PER_HOST, MAX_WORKERS, fetch_concurrently
+from crowler.util.session_util import CACHE_DIR
+
+RECRAWL_STATE_PATH = CACHE_DIR / "recrawl.json"
+MIN_INTERVAL = 60 * 60
+DEFAULT_INTERVAL = 24 * 60 * 60
+MAX_INTERVAL = 30 * 24 * 60 * 60
+
+
+@dataclass
+class RecrawlState:
+    url: str
+    last_fetch: float
+    digest: str
+    interval: float = DEFAULT_INTERVAL
+    changes: int = 0
+
+    @property
+    def next_due(self) -> float:
+        return self.last_fetch + self.interval
+
+
+@dataclass
+class RefreshResult:
+    url: str
+    changed: Optional[bool]
+    error: Optional[Exception] = None
+
+
+class RecrawlScheduler:
+    """
+    Per-URL fetch history (last fetch, content digest, revisit interval) in
+    one JSON file. A page found unchanged has its interval doubled, up to
+    `MAX_INTERVAL`; a changed page has it halved, down to `MIN_INTERVAL`.
+    """
+
+    def __init__(self, path: Path = RECRAWL_STATE_PATH) -> None:
+        self._path = path
+        self._states: dict[str, RecrawlState] = self._load()
+
+    def get(self, url: str) -> Optional[RecrawlState]:
+        return self._states.get(url)
+
+    def due(self, urls: Iterable[str], now: Optional[float] = None) -> list[str]:
+        """URLs whose interval has elapsed, never-fetched and most overdue first."""
+        now = time.time() if now is None else now
+        due: list[tuple[float, str]] = []
+        for url in urls:
+            state = self._states.get(url)
+            if state is None:
+                due.append((float("-inf"), url))
+            elif state.next_due <= now:
+                due.append((state.next_due, url))
+        return [url for _, url in sorted(due)]
+
+    def record(self, url: str, text: str, now: Optional[float] = None) -> bool:
+        """Store a fetch of `url` and adapt its interval; True when it changed."""
+        now = time.time() if now is None else now
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        state = self._states.get(url)
+        if state is None:
+            self._states[url] = RecrawlState(url=url, last_fetch=now, digest=digest)
+            return True
+        changed = digest != state.digest
+        if changed:
+            state.interval = max(MIN_INTERVAL, state.interval / 2)
+            state.changes += 1
+        else:
+            state.interval = min(MAX_INTERVAL, state.interval * 2)
+        state.last_fetch = now
+        state.digest = digest
+        return changed
+
+    def save(self) -> None:
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self._path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump([dataclasses.asdict(s) for s in self._states.values()], f)
+            os.replace(tmp, self._path)
+        except Exception as err:
+            typer.secho(
+                f"⚠️  Failed to save recrawl state: {err}", fg="yellow", err=True
+            )
+
+    def _load(self) -> dict[str, RecrawlState]:
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                return {d["url"]: RecrawlState(**d) for d in json.load(f)}
+        except FileNotFoundError:
+            return {}
+        except Exception as err:
+            typer.secho(
+                f"⚠️  Failed to load {self._path.name}; resetting. Error: {err}",
+                fg="yellow",
+                err=True,
+            )
+            return {}
+
+
+def refresh(
+    urls: Iterable[str],
+    scheduler: RecrawlScheduler,
+    max_requests: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    fetch: Callable[[str, requests.Session], HtmlData] = extract_html_data,
+    max_workers: int = MAX_WORKERS,
+    max_per_host: int = MAX_PER_HOST,
+) -> Iterator[RefreshResult]:
+    """
+    Refetch the due subset of `urls`, most overdue first, stopping after
+    `max_requests` fetches or once `time_budget` seconds have passed (fetches
+    still in flight then finish but are not recorded). State is saved when
+    the run ends.
+    """
+    due = scheduler.due(urls)
+    if max_requests is not None:
+        due = due[: max(0, max_requests)]
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    try:
+        for url, data, err in fetch_concurrently(
+            due, fetch, max_workers=max_workers, max_per_host=max_per_host
+        ):
+            if data is None:
+                yield RefreshResult(url, None, err)
+            else:
+                yield RefreshResult(url, scheduler.record(url, data.text))
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+    finally:
+        scheduler.save()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from crowler.util.boilerplate_util import remove_boilerplate
+from crowler.util.env_util import env_int
+from crowler.util.file_util import stringify_file_content
+from crowler.util.html_cache import HtmlCache, get_html_cache
+from crowler.util.search_index import SearchIndex, get_search_index
+from crowler.util.url_context_util import URL_CONTEXT_MAX_AGE, load_url_pages
+
+RETRIEVAL_K = 0
+
+
+def retrieval_k() -> int:
+    """
+    Chunks sent in place of the full shared files and URLs; 0 (the default)
+    sends everything. Override with $CROWLER_RETRIEVAL_K.
+    """
+    return env_int("CROWLER_RETRIEVAL_K", RETRIEVAL_K)
+
+
+def index_sources(
+    files: Union[list[str], list[Path]],
+    urls: list[str],
+    index: Optional[SearchIndex] = None,
+    cache: Optional[HtmlCache] = None,
+) -> list[str]:
+    """
+    Bring the index up to date for `files` and `urls`; returns their keys.
+    Files are re-read only when their size or mtime changed, and URLs are
+    re-extracted only when their cached page is stale or was refetched.
+    """
+    index = index or get_search_index()
+    sources: list[str] = []
+    for path in files:
+        source = str(path)
+        stamp = _file_stamp(path)
+        if stamp is None or index.stamp(source) != stamp:
+            text = stringify_file_content(path)
+            index.update(source, text, label=f"File: {source}", stamp=stamp)
+        sources.append(source)
+    if urls:
+        cache = cache or get_html_cache()
+        stamps = [_url_stamp(url, cache) for url in urls]
+        if any(s is None or index.stamp(u) != s for u, s in zip(urls, stamps)):
+            # boilerplate is judged across a site's pages, so redo them all
+            pages = remove_boilerplate(load_url_pages(urls, cache))
+            for url, page in pages.items():
+                title = f" ({page.title})" if page.title else ""
+                index.update(
+                    url,
+                    page.text,
+                    label=f"URL: {url}{title}",
+                    stamp=_url_stamp(url, cache),
+                )
+        sources += urls
+    return sources
+
+
+def _file_stamp(path: Union[str, Path]) -> Optional[str]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _url_stamp(url: str, cache: HtmlCache) -> Optional[str]:
+    """When the cached page was fetched, while `load_url_pages` would use it."""
+    entry = cache.get(url)
+    if entry is None or time.time() - entry.fetched_at > URL_CONTEXT_MAX_AGE:
+        return None
+    return repr(entry.fetched_at)
+
+
+def stringify_relevant_chunks(
+    files: Union[list[str], list[Path]],
+    urls: list[str],
+    query: str,
+    k: int,
+    label: str = "Relevant context",
+    index: Optional[SearchIndex] = None,
+    cache: Optional[HtmlCache] = None,
+) -> list[str]:
+    """
+    The `k` chunks of `files` and `urls` ranked most relevant to `query`,
+    in the labelled-block layout of `stringify_file_contents`. Unchanged
+    sources are not read again, so this is mostly the index query.
+    """
+    index = index or get_search_index()
+    sources = index_sources(files, urls, index, cache)
+    hits = index.query(query, k, sources=sources)
+    if not hits:
+        return []
+    return [f"🔎 {label}:"] + [f"{hit.label}\n```\n{hit.text}\n```" for hit in hits]
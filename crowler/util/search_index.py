@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+from crowler.util.session_util import CACHE_DIR
+
+SEARCH_INDEX_PATH = CACHE_DIR / "search_index.sqlite3"
+CHUNK_CHARS = 1500
+MAX_QUERY_TERMS = 64
+
+_TERM_RE = re.compile(r"\w{3,}")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    stamp TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(
+    body, source UNINDEXED, label UNINDEXED
+);
+"""
+
+
+@dataclass
+class SearchHit:
+    source: str
+    label: str
+    text: str
+    score: float
+
+
+def split_text(text: str, max_chars: int = CHUNK_CHARS) -> list[tuple[int, int, str]]:
+    """Cut `text` at line boundaries into (first_line, last_line, text) chunks."""
+    chunks: list[tuple[int, int, str]] = []
+    lines: list[str] = []
+    size = 0
+    start = 1
+    for number, line in enumerate(text.splitlines(), 1):
+        if lines and size + len(line) > max_chars:
+            chunks.append((start, number - 1, "\n".join(lines)))
+            lines, size, start = [], 0, number
+        lines.append(line)
+        size += len(line) + 1
+    if lines:
+        chunks.append((start, start + len(lines) - 1, "\n".join(lines)))
+    return chunks
+
+
+def match_expression(text: str, max_terms: int = MAX_QUERY_TERMS) -> str:
+    """FTS5 MATCH expression OR-ing the distinct words of free text."""
+    terms = dict.fromkeys(term.lower() for term in _TERM_RE.findall(text))
+    return " OR ".join(f'"{term}"' for term in list(terms)[:max_terms])
+
+
+class SearchIndex:
+    """
+    SQLite FTS5 index of text chunks, keyed by source (a file path or URL).
+    Sources are re-chunked only when their content digest changes, and can
+    carry a caller-defined stamp (e.g. a file's mtime) to skip even reading
+    them; queries are ranked with FTS5's built-in BM25.
+    """
+
+    def __init__(self, path: Path = SEARCH_INDEX_PATH) -> None:
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self._path)
+            self._conn.executescript(_SCHEMA)
+            columns = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(sources)")
+            }
+            if "stamp" not in columns:  # indexes written before stamps
+                self._conn.execute("ALTER TABLE sources ADD COLUMN stamp TEXT")
+        return self._conn
+
+    def stamp(self, source: str) -> Optional[str]:
+        """The stamp `source` was last indexed with, if any."""
+        row = self.conn.execute(
+            "SELECT stamp FROM sources WHERE source = ?", (source,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def update(
+        self,
+        source: str,
+        text: str,
+        label: Optional[str] = None,
+        stamp: Optional[str] = None,
+    ) -> bool:
+        """(Re)index `source`; returns False when its content is unchanged."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        row = self.conn.execute(
+            "SELECT digest FROM sources WHERE source = ?", (source,)
+        ).fetchone()
+        if row and row[0] == digest:
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE sources SET stamp = ? WHERE source = ?", (stamp, source)
+                )
+            return False
+        label = label or source
+        with self.conn:
+            self.conn.execute("DELETE FROM chunks WHERE source = ?", (source,))
+            self.conn.executemany(
+                "INSERT INTO chunks (body, source, label) VALUES (?, ?, ?)",
+                (
+                    (body, source, f"{label} (lines {first}-{last})")
+                    for first, last, body in split_text(text)
+                ),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources (source, digest, stamp)"
+                " VALUES (?, ?, ?)",
+                (source, digest, stamp),
+            )
+        return True
+
+    def remove(self, source: str) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM chunks WHERE source = ?", (source,))
+            self.conn.execute("DELETE FROM sources WHERE source = ?", (source,))
+
+    def query(
+        self, text: str, k: int, sources: Optional[Iterable[str]] = None
+    ) -> list[SearchHit]:
+        """Top `k` chunks for free `text`, optionally restricted to `sources`."""
+        expression = match_expression(text)
+        if not expression or k <= 0:
+            return []
+        sql = (
+            "SELECT source, label, body, bm25(chunks) FROM chunks WHERE chunks MATCH ?"
+        )
+        params: list[object] = [expression]
+        if sources is not None:
+            allowed = list(sources)
+            if not allowed:
+                return []
+            sql += f" AND source IN ({', '.join('?' * len(allowed))})"
+            params.extend(allowed)
+        sql += " ORDER BY bm25(chunks) LIMIT ?"
+        params.append(k)
+        return [
+            SearchHit(source=source, label=label, text=body, score=-rank)
+            for source, label, body, rank in self.conn.execute(sql, params)
+        ]
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+@lru_cache(maxsize=None)
+def get_search_index() -> SearchIndex:
+    return SearchIndex()
@@ -3,7 +3,9 @@ import os
 from pathlib import Path
 import sys
 from typing import Union
-import typer
+
+# typer is imported only on the error paths: the daemon client imports this
+# module and must stay fast
 
 CACHE_DIR = Path.home() / ".cache" / "cli_history"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
@@ -30,22 +32,30 @@ def get_session_id() -> str:
       4. parent PID
     """
     try:
-        raw = (
-            os.getenv("HISTORY_SESSION_ID")
-            or _try_pty()
-            or os.getenv("WT_SESSION")
-            or str(os.getppid())
-        )
-        session_id = _hash(raw)
+        session_id = _hash(session_key())
         return session_id
     except Exception as e:
+        import typer
+
         typer.secho(f"❌ Failed to determine session ID: {e}", fg="red", err=True)
         raise
 
 
+def session_key() -> str:
+    """The raw value `get_session_id` hashes; a valid $HISTORY_SESSION_ID."""
+    return (
+        os.getenv("HISTORY_SESSION_ID")
+        or _try_pty()
+        or os.getenv("WT_SESSION")
+        or str(os.getppid())
+    )
+
+
 def _try_pty() -> Union[str, None]:
     try:
         return os.ttyname(sys.stdin.fileno())
     except Exception as e:
+        import typer
+
         typer.secho(f"⚠️  Could not get TTY name: {e}", fg="yellow", err=True)
         return None
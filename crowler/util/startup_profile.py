@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+# standard library only: this is imported before anything it measures
+
+PROFILE_FLAG = "--profile-startup"
+PROFILE_ENV = "CROWLER_PROFILE_STARTUP"
+REPORT_VERSION = 1
+
+
+def default_report_path() -> Path:
+    # session_util.CACHE_DIR, without importing what is being measured
+    return Path.home() / ".cache" / "cli_history" / "startup_profile.json"
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+@dataclass
+class PhaseTiming:
+    name: str
+    ms: float
+
+
+class _TimedLoader:
+    """Wraps a module's loader for the duration of its execution."""
+
+    def __init__(self, loader: Any, profile: StartupProfile) -> None:
+        self._loader = loader
+        self._profile = profile
+
+    def create_module(self, spec: ModuleSpec) -> Any:
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create else None
+
+    def exec_module(self, module: Any) -> None:
+        stack = self._profile._import_stack
+        depth = len(stack)
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self._profile.imports.append(
+                ImportTiming(
+                    module=module.__name__,
+                    self_ms=round((elapsed - children) * 1000, 3),
+                    cumulative_ms=round(elapsed * 1000, 3),
+                    depth=depth,
+                )
+            )
+            # hand the module its real loader back
+            if getattr(module, "__spec__", None) is not None:
+                module.__spec__.loader = self._loader
+            module.__loader__ = self._loader
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class _ImportTimer(MetaPathFinder):
+    """Finds specs through the other finders and times their loaders."""
+
+    def __init__(self, profile: StartupProfile) -> None:
+        self._profile = profile
+
+    def find_spec(
+        self, fullname: str, path: Optional[Sequence[str]], target: Any = None
+    ) -> Optional[ModuleSpec]:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profile)  # type: ignore
+            return spec
+        return None
+
+
+@dataclass
+class StartupProfile:
+    """
+    Per-module import times (like `python -X importtime`) and named startup
+    phases, written as one JSON report. Disabled profiles cost nothing.
+    """
+
+    enabled: bool = False
+    report_path: Optional[Path] = None
+    argv: list[str] = field(default_factory=list)
+    phases: list[PhaseTiming] = field(default_factory=list)
+    imports: list[ImportTiming] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._start = time.perf_counter()
+        self._import_stack: list[float] = []
+        self._timer: Optional[_ImportTimer] = None
+        if self.enabled:
+            self._timer = _ImportTimer(self)
+            sys.meta_path.insert(0, self._timer)
+
+    @classmethod
+    def from_argv(cls, argv: list[str]) -> StartupProfile:
+        """
+        Profile when argv[1] is `--profile-startup[=PATH]` (removed from
+        `argv`) or $CROWLER_PROFILE_STARTUP is set ("1" or a report path).
+        """
+        value = os.getenv(PROFILE_ENV) or None
+        if len(argv) > 1 and argv[1].split("=", 1)[0] == PROFILE_FLAG:
+            _, _, value = argv.pop(1).partition("=")
+            value = value or "1"
+        if not value or value == "0":
+            return cls()
+        path = default_report_path() if value == "1" else Path(value)
+        return cls(enabled=True, report_path=path, argv=argv[1:])
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.phases.append(PhaseTiming(name, round(elapsed, 3)))
+
+    def packages(self) -> dict[str, float]:
+        """Import time spent in each top-level package, slowest first."""
+        totals: dict[str, float] = {}
+        for timing in self.imports:
+            top = timing.module.split(".", 1)[0]
+            totals[top] = totals.get(top, 0.0) + timing.self_ms
+        ranked = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+        return {name: round(ms, 3) for name, ms in ranked}
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "version": REPORT_VERSION,
+            "argv": self.argv,
+            "python": platform.python_version(),
+            "total_ms": round((time.perf_counter() - self._start) * 1000, 3),
+            "import_ms": round(sum(t.self_ms for t in self.imports), 3),
+            "phases": [asdict(p) for p in self.phases],
+            "packages": self.packages(),
+            "imports": [asdict(t) for t in self.imports],
+        }
+
+    def finish(self) -> Optional[dict[str, Any]]:
+        """Stop timing imports and write the report; returns it."""
+        if not self.enabled:
+            return None
+        if self._timer in sys.meta_path:
+            sys.meta_path.remove(self._timer)
+        report = self.report()
+        assert self.report_path is not None
+        try:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            self.report_path.write_text(json.dumps(report, indent=2), "utf-8")
+        except OSError as e:
+            print(f"⚠️  Failed to write startup profile: {e}", file=sys.stderr)
+        slowest = ", ".join(
+            f"{name} {ms:.1f} ms" for name, ms in list(report["packages"].items())[:3]
+        )
+        print(
+            f"⏱️  Profiled {report['total_ms']:.1f} ms "
+            f"(imports {report['import_ms']:.1f} ms: {slowest}); "
+            f"report: {self.report_path}",
+            file=sys.stderr,
+        )
+        return report
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import re
+import difflib
 from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 from enum import Enum
 
 from crowler.instruction.instruction_model import Instruction
+from crowler.util.pattern_util import get_matcher, instruction_patterns
 from builtins import print
 
 DEFAULT_FENCE = "~~~"
-_FENCE_RE = re.escape(DEFAULT_FENCE)
 QUOTES = "\"'`"
 
 
@@ -48,17 +51,37 @@ PATTERN_SETS = {
 
 DEFAULT_ALLOWED_PATTERNS = PATTERN_SETS[TaskType.GENERAL_DEVELOPMENT]
 
-CODE_BLOCK_RE = re.compile(
-    rf"""
-    {_FENCE_RE}                   # opening fence, optional indent
-    (?P<quote>[{QUOTES}])              #   opening quote
-    (?P<path>[^\r\n]+?)                #   path (no EOL)
-    (?P=quote)                         #   closing quote
-    (?P<body>.*?)                 # body (non-greedy)
-    {_FENCE_RE}                   # closing fence, its own line
-    """,
-    re.MULTILINE | re.DOTALL | re.VERBOSE,
-)
+
+@lru_cache(maxsize=None)
+def _fence_line_re(fence: str) -> re.Pattern[str]:
+    # anchored at a line start and confined to one line: no backtracking
+    # across lines, so matching is linear in the response length
+    return re.compile(rf"^[ \t]*{re.escape(fence)}([^\r\n]*)", re.MULTILINE)
+
+
+def iter_code_blocks(
+    response: str, fence: str = DEFAULT_FENCE
+) -> Iterator[tuple[str, str]]:
+    """
+    Yield (path, body) for each ~~~"path" ... ~~~ block, visiting only the
+    lines that start with a fence, so the cost stays linear even when a
+    block is never closed. Fences may be indented. The body runs from after
+    the closing quote to the start of the closing fence line. An opening
+    fence inside an open block starts a new block, and a block left open at
+    the end (a truncated response) is dropped.
+    """
+    path: Optional[str] = None
+    body_start = 0
+    for match in _fence_line_re(fence).finditer(response):
+        rest = match.group(1)
+        if path is not None and not rest.strip():
+            yield path, response[body_start : match.start()]
+            path = None
+        elif rest[:1] and rest[0] in QUOTES:
+            close = rest.find(rest[0], 1)
+            if close != -1:
+                path = rest[1:close]
+                body_start = match.start(1) + close + 1
 
 
 def parse_code_response(
@@ -66,23 +89,30 @@ def parse_code_response(
     root: Union[str, Path, None] = None,
     task_type: Optional[TaskType] = None,
     allowed_patterns: Optional[list[str]] = None,
+    instructions: Optional[list[Instruction]] = None,
 ) -> OrderedDict[str, str]:
+    """
+    Decode the ~~~"path" blocks of a model reply into {path: content}.
+    Paths are allowed by `allowed_patterns`, else the `task_type` pattern
+    set, else the allow patterns of `instructions`, else the general
+    development set; deny patterns of `instructions` always apply.
+    """
     files: OrderedDict[str, str] = OrderedDict()
     base = Path(root).resolve() if root else None
 
+    allow, deny = instruction_patterns(instructions or [])
     if allowed_patterns:
-        patterns = allowed_patterns
+        allow = tuple(allowed_patterns)
     elif task_type:
-        patterns = PATTERN_SETS.get(task_type, DEFAULT_ALLOWED_PATTERNS)
-    else:
-        patterns = DEFAULT_ALLOWED_PATTERNS
+        allow = tuple(PATTERN_SETS.get(task_type, DEFAULT_ALLOWED_PATTERNS))
+    elif not allow:
+        allow = tuple(DEFAULT_ALLOWED_PATTERNS)
+    matcher = get_matcher(allow, deny)
 
     filtered_count = 0
-    allowed_regex = [re.compile(p) for p in patterns]
 
-    for match in CODE_BLOCK_RE.finditer(response):
-        raw_path = match.group("path").strip().strip(QUOTES)
-        code = match.group("body")
+    for path, code in iter_code_blocks(response):
+        raw_path = path.strip().strip(QUOTES)
 
         if not raw_path:
             continue
@@ -93,11 +123,16 @@ def parse_code_response(
             print(f"Rejected path outside root sandbox: {norm}")
             continue
 
-        if not any(r.search(norm) for r in allowed_regex):
+        if not matcher.is_allowed(norm):
             print(f"Rejected file not matching allowed patterns: {norm}")
             filtered_count += 1
             continue
 
+        if matcher.is_denied(norm):
+            print(f"Rejected file matching denied patterns: {norm}")
+            filtered_count += 1
+            continue
+
         if norm in files:
             print(f"Duplicate file path in response: {norm} (overwriting)")
 
@@ -112,6 +147,167 @@ def parse_code_response(
     return files
 
 
+# ────────────────────────────────────────────────────────────────────
+# search/replace edits
+# ────────────────────────────────────────────────────────────────────
+FUZZY_MATCH_RATIO = 0.8
+
+_SEARCH_RE = re.compile(r"^<{5,9} ?SEARCH\s*$")
+_DIVIDER_RE = re.compile(r"^={5,9}\s*$")
+_REPLACE_RE = re.compile(r"^>{5,9} ?REPLACE\s*$")
+
+
+class EditError(ValueError):
+    """A SEARCH section that cannot be located in the file."""
+
+
+@dataclass
+class SearchReplace:
+    search: str
+    replace: str
+
+
+def parse_edit_response(
+    response: str,
+    root: Union[str, Path, None] = None,
+    task_type: Optional[TaskType] = None,
+    allowed_patterns: Optional[list[str]] = None,
+    instructions: Optional[list[Instruction]] = None,
+) -> OrderedDict[str, list[SearchReplace]]:
+    """
+    Parse a reply in the `EDIT_FORMAT_INSTRUCTION` protocol into the edits
+    for each file; paths are filtered exactly as in `parse_code_response`.
+    """
+    blocks = parse_code_response(
+        response, root, task_type, allowed_patterns, instructions
+    )
+    edits: OrderedDict[str, list[SearchReplace]] = OrderedDict()
+    for path, body in blocks.items():
+        file_edits = parse_search_replace(body)
+        if file_edits:
+            edits[path] = file_edits
+    return edits
+
+
+def parse_search_replace(body: str) -> list[SearchReplace]:
+    """SEARCH/REPLACE pairs of one block; an unterminated pair is dropped."""
+    edits: list[SearchReplace] = []
+    section: Optional[list[str]] = None
+    search: list[str] = []
+    for line in body.splitlines(keepends=True):
+        marker = line.rstrip("\r\n")
+        if _SEARCH_RE.match(marker):
+            section = search = []
+        elif section is search and _DIVIDER_RE.match(marker):
+            section = []
+        elif section is not None and _REPLACE_RE.match(marker):
+            if section is not search:
+                edits.append(SearchReplace("".join(search), "".join(section)))
+            section = None
+        elif section is not None:
+            section.append(line)
+    return edits
+
+
+def apply_edits(original: str, edits: list[SearchReplace]) -> str:
+    """
+    Apply `edits` in order. Each SEARCH text is located exactly first, then
+    line by line ignoring surrounding whitespace (the replacement is
+    re-indented to match), then as the most similar run of lines scoring at
+    least `FUZZY_MATCH_RATIO`. An empty SEARCH appends to the file. Raises
+    `EditError` when a SEARCH text cannot be located.
+    """
+    text = original
+    for edit in edits:
+        if not edit.search.strip():
+            text += edit.replace
+        else:
+            start = _find_whole_lines(text, edit.search)
+            if start is None:
+                text = _apply_by_lines(text, edit)
+            else:
+                end = start + len(edit.search)
+                text = text[:start] + edit.replace + text[end:]
+    return text
+
+
+def _find_whole_lines(text: str, search: str) -> Optional[int]:
+    """First offset where `search` occurs as whole lines of `text`, or None."""
+    start = text.find(search)
+    while start != -1:
+        end = start + len(search)
+        starts_line = start == 0 or text[start - 1] == "\n"
+        ends_line = search.endswith("\n") or end == len(text) or text[end] in "\r\n"
+        if starts_line and ends_line:
+            return start
+        start = text.find(search, start + 1)
+    return None
+
+
+def _apply_by_lines(text: str, edit: SearchReplace) -> str:
+    lines = text.splitlines(keepends=True)
+    search = edit.search.splitlines(keepends=True)
+    replace = edit.replace.splitlines(keepends=True)
+    size = len(search)
+    wanted = [line.strip() for line in search]
+    stripped = [line.strip() for line in lines]
+
+    start = next(
+        (i for i in range(len(lines) - size + 1) if stripped[i : i + size] == wanted),
+        None,
+    )
+    if start is None:
+        start = _most_similar_window(lines, edit.search, size)
+    if start is None:
+        first = edit.search.strip().splitlines()[0]
+        raise EditError(f"SEARCH text not found: {first!r}")
+
+    replace = _reindent(replace, search[0], lines[start])
+    if replace:
+        last = lines[start + size - 1]
+        ending = last[len(last.rstrip("\r\n")) :]
+        replace[-1] = replace[-1].rstrip("\r\n") + ending
+    return "".join(lines[:start] + replace + lines[start + size :])
+
+
+def _most_similar_window(lines: list[str], search: str, size: int) -> Optional[int]:
+    best, best_ratio = None, FUZZY_MATCH_RATIO
+    matcher = difflib.SequenceMatcher(autojunk=False)
+    matcher.set_seq2(search)
+    for i in range(len(lines) - size + 1):
+        matcher.set_seq1("".join(lines[i : i + size]))
+        if matcher.real_quick_ratio() < best_ratio:
+            continue
+        if matcher.quick_ratio() < best_ratio:
+            continue
+        ratio = matcher.ratio()
+        if ratio > best_ratio or (best is None and ratio == best_ratio):
+            best, best_ratio = i, ratio
+    return best
+
+
+def _indent(line: str) -> str:
+    return line[: len(line) - len(line.lstrip())]
+
+
+def _reindent(replace: list[str], search_first: str, matched_first: str) -> list[str]:
+    """Shift `replace` by the indentation difference between SEARCH and file."""
+    have, want = _indent(search_first), _indent(matched_first)
+    if have == want:
+        return replace
+    if want.startswith(have):
+        extra = want[len(have) :]
+        return [extra + line if line.strip() else line for line in replace]
+    if have.startswith(want):
+        cut = len(have) - len(want)
+        # whitespace-only lines go through lstrip and keep their line break
+        return [
+            line[cut:] if line.strip() and line[:cut].isspace() else line.lstrip(" \t")
+            for line in replace
+        ]
+    return replace
+
+
 def get_instruction_strings(
     instructions: Optional[list[Instruction]] = None,
 ) -> list[str]:
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+from collections import OrderedDict
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Optional
+
+CHARS_PER_TOKEN = 4
+DEFAULT_ENCODING = "o200k_base"
+TOKEN_CACHE_SIZE = 4096
+
+# sha1 of the text -> token count, least recently used first
+_token_cache: OrderedDict[bytes, int] = OrderedDict()
+
+
+class TruncateStrategy(str, Enum):
+    HEAD = "head"
+    HEAD_TAIL = "head_tail"
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English and code)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@lru_cache(maxsize=None)
+def _encoding() -> Optional[Any]:
+    """
+    The tiktoken encoding named by $CROWLER_TOKENIZER (default o200k_base),
+    or None when tiktoken is missing, the encoding cannot be loaded, or the
+    variable is set to "heuristic".
+    """
+    name = os.getenv("CROWLER_TOKENIZER") or DEFAULT_ENCODING
+    if name == "heuristic":
+        return None
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(name)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Token count of `text` with the local tokenizer when available, else
+    `estimate_tokens`. Counts are cached by content, so instructions, shared
+    files and prompts that repeat across requests are tokenized once.
+    """
+    if not text:
+        return 0
+    key = hashlib.sha1(text.encode("utf-8", "surrogatepass")).digest()
+    cached = _token_cache.get(key)
+    if cached is not None:
+        _token_cache.move_to_end(key)
+        return cached
+    encoding = _encoding()
+    if encoding is None:
+        count = estimate_tokens(text)
+    else:
+        count = len(encoding.encode(text, disallowed_special=()))
+    _token_cache[key] = count
+    if len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    return count
+
+
+def truncate_to_tokens(
+    text: str,
+    max_tokens: int,
+    strategy: TruncateStrategy = TruncateStrategy.HEAD,
+) -> str:
+    """
+    Cut `text` to roughly `max_tokens`. HEAD keeps the beginning; HEAD_TAIL
+    keeps the first two thirds and the last third of the budget, so both the
+    introduction and the closing sections of a page survive.
+    """
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    dropped = estimate_tokens(text) - max_tokens
+    marker = f"\n[… ~{dropped} tokens truncated …]\n"
+    if strategy == TruncateStrategy.HEAD_TAIL:
+        head = max_chars * 2 // 3
+        tail = max_chars - head
+        return text[:head].rstrip() + marker + text[-tail:].lstrip()
+    return text[:max_chars].rstrip() + marker
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+import requests
+import typer
+
+from crowler.util.boilerplate_util import remove_boilerplate
+from crowler.util.env_util import env_int
+from crowler.util.html_cache import HtmlCache, get_html_cache
+from crowler.util.html_util import HtmlData, extract_html_data
+from crowler.util.http_util import fetch_concurrently
+from crowler.util.token_util import TruncateStrategy, truncate_to_tokens
+
+URL_CONTEXT_TOKENS = 2000
+URL_CONTEXT_MAX_AGE = 60 * 60
+URL_CONTEXT_MAX_URLS = 20
+
+
+def url_context_tokens() -> int:
+    """Per-URL token budget; override with $CROWLER_URL_CONTEXT_TOKENS."""
+    return env_int("CROWLER_URL_CONTEXT_TOKENS", URL_CONTEXT_TOKENS)
+
+
+def url_context_max_urls() -> int:
+    """URLs sent per request; override with $CROWLER_URL_CONTEXT_MAX_URLS."""
+    return env_int("CROWLER_URL_CONTEXT_MAX_URLS", URL_CONTEXT_MAX_URLS)
+
+
+def load_url_pages(
+    urls: list[str],
+    cache: Optional[HtmlCache] = None,
+    max_age: float = URL_CONTEXT_MAX_AGE,
+) -> dict[str, HtmlData]:
+    """
+    Extracted pages for `urls`: entries cached within `max_age` seconds are
+    used as-is, the rest are (re)validated concurrently in one batch.
+    """
+    cache = cache or get_html_cache()
+    pages: dict[str, HtmlData] = {}
+    stale: list[str] = []
+    now = time.time()
+    for url in urls:
+        entry = cache.get(url)
+        if entry and now - entry.fetched_at <= max_age:
+            pages[url] = HtmlData(**entry.data)
+        else:
+            stale.append(url)
+
+    def fetch(url: str, session: requests.Session) -> HtmlData:
+        return extract_html_data(url, session, cache=cache)
+
+    for url, data, err in fetch_concurrently(stale, fetch):
+        if data is None:
+            typer.secho(f"⚠️  Skipped URL context {url}: {err}", fg="yellow", err=True)
+            continue
+        pages[url] = data
+    return pages
+
+
+def stringify_url_contents(
+    urls: list[str],
+    label: str = "URL context",
+    tokens_per_url: Optional[int] = None,
+    strategy: TruncateStrategy = TruncateStrategy.HEAD_TAIL,
+    cache: Optional[HtmlCache] = None,
+    max_urls: Optional[int] = None,
+) -> list[str]:
+    """
+    Extracted text of each URL, truncated to `tokens_per_url`, in the same
+    labelled-block layout as `stringify_file_contents`. Blocks repeated
+    across pages of the same site (navigation, banners) are dropped first.
+    Only the first `max_urls` URLs are fetched.
+    """
+    if not urls:
+        return []
+    budget = url_context_tokens() if tokens_per_url is None else tokens_per_url
+    limit = url_context_max_urls() if max_urls is None else max_urls
+    if len(urls) > limit:
+        typer.secho(
+            f"ℹ️  Sending {limit} of {len(urls)} URLs as context; "
+            "raise CROWLER_URL_CONTEXT_MAX_URLS or set CROWLER_RETRIEVAL_K "
+            "to search them all.",
+            fg="cyan",
+            err=True,
+        )
+        urls = urls[:limit]
+    pages = remove_boilerplate(load_url_pages(urls, cache=cache))
+    string_list = [f"🌐 {label}:"]
+    for url in urls:
+        page = pages.get(url)
+        if page is None or not page.text:
+            continue
+        text = truncate_to_tokens(page.text, budget, strategy)
+        title = f" ({page.title})" if page.title else ""
+        string_list.append(f"URL: {url}{title}\n```\n{text}\n```")
+    return string_list
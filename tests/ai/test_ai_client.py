@@ -66,6 +66,7 @@ def test_send_message_with_all_arguments(ai_client, monkeypatch):
         instructions=mock_instructions,
         prompt_files=mock_prompt_files,
         final_prompt=mock_final_prompt,
+        budget=128_000 - 500,
     )
 
     # Verify get_response was called with the formatted messages
@@ -90,7 +91,7 @@ def test_send_message_with_default_arguments(ai_client, monkeypatch):
 
     # Verify format_messages was called correctly with None arguments
     mock_format.assert_called_once_with(
-        instructions=None, prompt_files=None, final_prompt=None
+        instructions=None, prompt_files=None, final_prompt=None, budget=127_500
     )
 
     # Verify get_response was called with empty messages
@@ -114,7 +115,10 @@ def test_send_message_with_path_objects(ai_client, monkeypatch):
     result = ai_client.send_message(prompt_files=path_files)
 
     mock_format.assert_called_once_with(
-        instructions=None, prompt_files=path_files, final_prompt=None
+        instructions=None,
+        prompt_files=path_files,
+        final_prompt=None,
+        budget=127_500,
     )
     assert result == "Path response"
 
@@ -22,8 +22,16 @@ def patch_ai_clients(monkeypatch):
     def dummy_claude(config=None):
         return types.SimpleNamespace(name="claude", config=config)
 
-    monkeypatch.setitem(ai_client_factory.AI_CLIENTS, "openai", dummy_openai)
-    monkeypatch.setitem(ai_client_factory.AI_CLIENTS, "claude", dummy_claude)
+    dummies = {
+        ai_client_factory.AI_CLIENTS["openai"]: dummy_openai,
+        ai_client_factory.AI_CLIENTS["claude"]: dummy_claude,
+    }
+    real_import = ai_client_factory.import_object
+    monkeypatch.setattr(
+        ai_client_factory,
+        "import_object",
+        lambda target: dummies.get(target) or real_import(target),
+    )
     yield
 
 
@@ -59,3 +67,33 @@ def test_get_ai_client_unsupported_client(monkeypatch):
     assert "unknown_client" in str(excinfo.value)
     assert "openai" in str(excinfo.value)
     assert "claude" in str(excinfo.value)
+
+
+def test_get_ai_config_returns_default_config(monkeypatch):
+    monkeypatch.setenv("AI_CLIENT", "openai")
+    config = ai_client_factory.get_ai_config()
+    assert config.model == "gpt-4.1"
+    assert config.context_window > config.max_tokens
+
+
+def test_get_ai_config_unsupported_client(monkeypatch):
+    monkeypatch.setenv("AI_CLIENT", "unknown_client")
+    with pytest.raises(ValueError, match="Unsupported AI_CLIENT"):
+        ai_client_factory.get_ai_config()
+
+
+def test_client_cache_reuses_clients_until_env_changes(monkeypatch):
+    monkeypatch.setattr(ai_client_factory, "_client_cache", None)
+    ai_client_factory.enable_client_cache()
+    monkeypatch.setenv("AI_CLIENT", "openai")
+    first = ai_client_factory.get_ai_client()
+    assert ai_client_factory.get_ai_client() is first
+    assert ai_client_factory.get_ai_client(MockAIConfig()) is not first
+    monkeypatch.setenv("OPENAI_API_KEY", "other")
+    assert ai_client_factory.get_ai_client() is not first
+
+
+def test_clients_are_not_cached_by_default(monkeypatch):
+    monkeypatch.setattr(ai_client_factory, "_client_cache", None)
+    monkeypatch.setenv("AI_CLIENT", "claude")
+    assert ai_client_factory.get_ai_client() is not ai_client_factory.get_ai_client()
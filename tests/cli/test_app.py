@@ -99,7 +99,7 @@ def test_ask_command():
     # Test the ask command with mocked environment variable
     with (
         patch("os.environ", {"AI_CLIENT": "openai"}),
-        patch("crowler.cli.app.get_ai_client") as mock_get_client,
+        patch("crowler.ai.ai_client_factory.get_ai_client") as mock_get_client,
     ):
         mock_client = mock_get_client.return_value
         mock_client.send_message.return_value = "AI response"
@@ -110,3 +110,38 @@ def test_ask_command():
         mock_get_client.assert_called_once()
         mock_client.send_message.assert_called_once()
         assert "AI response" in result.stdout
+
+
+def test_plan_command_shows_budget_without_calling_model():
+    from crowler.ai.openai.openai_config import OpenAIConfig
+    from crowler.util.ai_util import plan_messages
+
+    def fake_plan(instructions, files, prompt, budget):
+        with (
+            patch("crowler.util.ai_util.get_latest_prompts", return_value=["p"]),
+            patch("crowler.util.ai_util.get_shared_files", return_value=set()),
+            patch("crowler.util.ai_util.get_urls", return_value=set()),
+        ):
+            return plan_messages(instructions, files, prompt, budget)
+
+    config = OpenAIConfig(max_tokens=1000, context_window=5000)
+    with (
+        patch("crowler.ai.ai_client_factory.get_ai_config", return_value=config),
+        patch("crowler.util.ai_util.plan_messages", side_effect=fake_plan),
+        patch("crowler.ai.ai_client_factory.get_ai_client") as mock_client,
+    ):
+        result = runner.invoke(app, ["plan", "-i", "unit-test", "--prompt", "go"])
+
+    assert result.exit_code == 0
+    assert "input budget 4000" in result.output
+    assert "instruction #1" in result.output
+    assert "final prompt" in result.output
+    assert "fits the budget" in result.output
+    mock_client.assert_not_called()
+
+
+def test_plan_command_unknown_instruction():
+    with patch("crowler.ai.ai_client_factory.get_ai_config"):
+        result = runner.invoke(app, ["plan", "-i", "nope"])
+    assert result.exit_code == 1
+    assert "Unknown instruction 'nope'" in result.output
@@ -5,6 +5,7 @@ from typer.testing import CliRunner
 from collections import OrderedDict
 
 from crowler.cli.code_app import code_app, create_unit_test
+from crowler.util.chunk_util import FileChunk
 from crowler.util.string_util import TaskType
 
 
@@ -180,7 +181,7 @@ def test_create_readme_command(
         prompt_files=["./README.md"],
         final_prompt='Focus only on creating a single "README.md"',
     )
-    mock_readme_parser.assert_called_once_with("readme response")
+    mock_readme_parser.assert_called_once_with("readme response", instructions=ANY)
     mock_rewrite_files.assert_called_once_with(
         files=OrderedDict([("README.md", "# Project Title\n\nProject description")]),
         force=True,
@@ -239,7 +240,7 @@ def test_fix_mypy_errors_command(
         ]
     )
     mock_parse_code_response.assert_has_calls(
-        [call("mypy response"), call("mypy response")]
+        [call("mypy response", instructions=ANY)] * 2
     )
     mock_rewrite_files.assert_has_calls(
         [
@@ -313,7 +314,7 @@ def test_improve_typer_logs_command(
         ]
     )
     mock_parse_code_response.assert_has_calls(
-        [call("typer log response"), call("typer log response")]
+        [call("typer log response", instructions=ANY)] * 2
     )
     mock_rewrite_files.assert_has_calls(
         [
@@ -443,3 +444,261 @@ def test_create_unit_test_empty_parsed_response(mock_ai_client, mock_rewrite_fil
             response="test response", task_type=TaskType.TEST_GENERATION
         )
         mock_rewrite_files.assert_not_called()
+
+
+def _file_chunks(path, *texts):
+    return [
+        FileChunk(
+            path=path, index=i, total=len(texts), start_line=0, end_line=0, text=t
+        )
+        for i, t in enumerate(texts, 1)
+    ]
+
+
+def test_create_unit_test_oversized_file_sent_in_chunks(
+    mock_ai_client, mock_rewrite_files, mock_parse_code_response
+):
+    chunks = _file_chunks("big.py", "one = 1\n\n", "two = 2\n")
+    mock_ai_client.send_message.side_effect = ["r1", "r2"]
+    mock_parse_code_response.side_effect = [
+        OrderedDict([("big.py", "part one\n")]),
+        OrderedDict([("big.py", "part two\n")]),
+    ]
+    with (
+        patch("crowler.cli.code_app.is_oversized", return_value=True),
+        patch("crowler.cli.code_app.iter_file_chunks", return_value=chunks),
+        patch("crowler.cli.code_app.stringify_chunk", side_effect=["C1", "C2"]),
+    ):
+        create_unit_test(True, "big.py")
+
+    assert mock_ai_client.send_message.call_count == 2
+    first_prompt = mock_ai_client.send_message.call_args_list[0].kwargs["final_prompt"]
+    assert first_prompt.startswith("C1")
+    assert "prompt_files" not in mock_ai_client.send_message.call_args_list[0].kwargs
+    mock_rewrite_files.assert_called_once_with(
+        files=OrderedDict([("big.py", "part one\n\npart two\n")]), force=True
+    )
+
+
+def test_fix_mypy_errors_chunk_without_reply_keeps_original(
+    runner, mock_ai_client, mock_rewrite_files
+):
+    chunks = _file_chunks("big.py", "a = 1\n\n", "b: int = 'x'\n\n", "c = 3\n")
+    mock_ai_client.send_message.side_effect = [
+        '~~~"big.py"\na = 10\n~~~',
+        "Nothing to fix in this part.",
+        '~~~"big.py"\nc = 30\n~~~',
+    ]
+    with (
+        patch("crowler.cli.code_app.get_processing_files", return_value=["big.py"]),
+        patch("crowler.cli.code_app.is_oversized", return_value=True),
+        patch("crowler.cli.code_app.iter_file_chunks", return_value=chunks),
+    ):
+        result = runner.invoke(code_app, ["mypy"])
+
+    assert result.exit_code == 0
+    mock_rewrite_files.assert_called_once_with(
+        files=OrderedDict([("big.py", "a = 10\n\nb: int = 'x'\n\nc = 30\n")]),
+        force=False,
+    )
+
+
+def test_fix_mypy_errors_missing_chunk_writes_nothing(
+    runner, mock_ai_client, mock_rewrite_files
+):
+    chunks = _file_chunks("big.py", "a = 1\n", "b = 2\n", "c = 3\n")
+    mock_ai_client.send_message.return_value = '~~~"big.py"\nx = 0\n~~~'
+    with (
+        patch("crowler.cli.code_app.get_processing_files", return_value=["big.py"]),
+        patch("crowler.cli.code_app.is_oversized", return_value=True),
+        patch("crowler.cli.code_app.iter_file_chunks", return_value=chunks[:2]),
+    ):
+        result = runner.invoke(code_app, ["mypy"])
+
+    assert "2 of 3" in result.output
+    mock_rewrite_files.assert_not_called()
+
+
+def test_create_unit_tests_skip_tested_and_prioritizes_untested(
+    runner, mock_ai_client, mock_rewrite_files, tmp_path
+):
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_done.py").write_text("x")
+    files = [str(tmp_path / "pkg" / "done.py"), str(tmp_path / "pkg" / "todo.py")]
+
+    with (
+        patch("crowler.cli.code_app.get_processing_files", return_value=files),
+        patch("crowler.cli.code_app.find_repo_root", return_value=tmp_path),
+        patch("crowler.cli.code_app.create_unit_test") as mock_create,
+    ):
+        result = runner.invoke(code_app, ["unit-test", "--force"])
+        assert result.exit_code == 0
+        assert [c.args[1] for c in mock_create.call_args_list] == [
+            files[1],
+            files[0],
+        ]
+
+        mock_create.reset_mock()
+        result = runner.invoke(code_app, ["unit-test", "--force", "--skip-tested"])
+        assert result.exit_code == 0
+        mock_create.assert_called_once_with(True, files[1])
+
+
+def test_fix_mypy_errors_diff_applies_edits(
+    runner, mock_ai_client, mock_rewrite_files, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "mod.py").write_text("def f(x):\n    return x\n")
+    mock_ai_client.send_message.return_value = (
+        '~~~"mod.py"\n<<<<<<< SEARCH\ndef f(x):\n=======\n'
+        "def f(x: int) -> int:\n>>>>>>> REPLACE\n~~~"
+    )
+    with patch("crowler.cli.code_app.get_processing_files", return_value=["mod.py"]):
+        result = runner.invoke(code_app, ["mypy", "--diff"])
+
+    assert result.exit_code == 0
+    instructions = mock_ai_client.send_message.call_args.kwargs["instructions"]
+    assert "<<<<<<< SEARCH" in "\n".join(instructions[0].instructions)
+    mock_rewrite_files.assert_called_once_with(
+        files=OrderedDict({"mod.py": "def f(x: int) -> int:\n    return x\n"}),
+        force=False,
+    )
+
+
+def test_improve_typer_logs_diff_reports_unmatched_edits(
+    runner, mock_ai_client, mock_rewrite_files, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "mod.py").write_text("x = 1\n")
+    mock_ai_client.send_message.return_value = (
+        '~~~"mod.py"\n<<<<<<< SEARCH\nnothing like this\n=======\n'
+        "y = 2\n>>>>>>> REPLACE\n~~~"
+    )
+    with patch("crowler.cli.code_app.get_processing_files", return_value=["mod.py"]):
+        result = runner.invoke(code_app, ["typer-log", "--diff"])
+
+    assert "Could not apply edits to mod.py" in result.output
+    mock_rewrite_files.assert_called_once_with(files=OrderedDict(), force=False)
+
+
+def test_create_unit_tests_filters_files_before_requests(
+    runner, mock_ai_client, mock_rewrite_files, mock_parse_code_response
+):
+    files = [
+        "pkg/module.py",
+        "conftest.py",
+        "tests/test_module.py",
+        "pkg/__init__.py",
+        "data.json",
+    ]
+    mock_ai_client.send_message.return_value = "response"
+    with patch("crowler.cli.code_app.get_processing_files", return_value=files):
+        result = runner.invoke(code_app, ["unit-test"])
+
+    assert result.exit_code == 0
+    assert [
+        c.kwargs["prompt_files"] for c in mock_ai_client.send_message.call_args_list
+    ] == [["pkg/module.py"]]
+    assert "Skipping conftest.py: matched by a denied pattern" in result.output
+    assert "Skipping data.json: not matched by the allowed patterns" in result.output
+    assert "Filtered out 4 file(s); 4 model call(s) avoided." in result.output
+
+
+def test_fix_mypy_errors_skips_non_python_files(
+    runner, mock_ai_client, mock_rewrite_files, mock_parse_code_response
+):
+    mock_ai_client.send_message.return_value = "response"
+    with patch(
+        "crowler.cli.code_app.get_processing_files",
+        return_value=["README.md", "stubs/mod.pyi"],
+    ):
+        result = runner.invoke(code_app, ["mypy"])
+
+    assert result.exit_code == 0
+    mock_ai_client.send_message.assert_called_once()
+    assert "Skipping README.md" in result.output
+
+
+def test_improve_typer_logs_rejects_denied_reply_paths(
+    runner, mock_ai_client, mock_rewrite_files
+):
+    mock_ai_client.send_message.return_value = (
+        '~~~"pkg/mod.py"\nimport typer\n~~~\n~~~"pkg/__init__.py"\nx = 1\n~~~\n'
+    )
+    with patch(
+        "crowler.cli.code_app.get_processing_files", return_value=["pkg/mod.py"]
+    ):
+        result = runner.invoke(code_app, ["typer-log"])
+
+    assert result.exit_code == 0
+    mock_rewrite_files.assert_called_once_with(
+        files=OrderedDict([("pkg/mod.py", "\nimport typer\n")]), force=False
+    )
+
+
+def test_run_user_instruction(
+    runner, mock_ai_client, mock_rewrite_files, mock_parse_code_response, tmp_path
+):
+    (tmp_path / "docs.toml").write_text(
+        'instructions = ["Add docstrings."]\n'
+        'allow_file_patterns = ["\\\\.py$"]\n'
+        'prompt = "Document {filepath}"\n'
+    )
+    mock_ai_client.send_message.return_value = "response"
+    with (
+        patch(
+            "crowler.instruction.instruction_registry.instruction_dirs",
+            return_value=[tmp_path],
+        ),
+        patch(
+            "crowler.cli.code_app.get_processing_files",
+            return_value=["mod.py", "notes.md"],
+        ),
+    ):
+        result = runner.invoke(code_app, ["run", "docs"])
+
+    assert result.exit_code == 0
+    kwargs = mock_ai_client.send_message.call_args.kwargs
+    assert kwargs["prompt_files"] == ["mod.py"]
+    assert kwargs["final_prompt"] == "Document mod.py"
+    assert kwargs["instructions"][1].instructions == ["Add docstrings."]
+    mock_rewrite_files.assert_called_once()
+
+
+def test_run_user_instruction_parses_replies_with_its_patterns(
+    runner, mock_ai_client, mock_rewrite_files, tmp_path
+):
+    (tmp_path / "ts.toml").write_text(
+        'instructions = ["Add types."]\n'
+        'allow_file_patterns = ["\\\\.ts$"]\n'
+        'deny_file_patterns = ["generated/"]\n'
+    )
+    mock_ai_client.send_message.return_value = (
+        '~~~"src/app.ts"\nconst a: number = 1;\n~~~\n'
+        '~~~"generated/api.ts"\nexport {};\n~~~\n'
+    )
+    with (
+        patch(
+            "crowler.instruction.instruction_registry.instruction_dirs",
+            return_value=[tmp_path],
+        ),
+        patch(
+            "crowler.cli.code_app.get_processing_files",
+            return_value=["src/app.ts"],
+        ),
+    ):
+        result = runner.invoke(code_app, ["run", "ts"])
+
+    assert result.exit_code == 0
+    mock_rewrite_files.assert_called_once_with(
+        files=OrderedDict([("src/app.ts", "\nconst a: number = 1;\n")]), force=False
+    )
+
+
+def test_run_unknown_instruction_lists_available(runner, mock_ai_client):
+    result = runner.invoke(code_app, ["run", "nope"])
+
+    assert result.exit_code == 1
+    assert "Unknown instruction 'nope'" in result.output
+    assert "mypy" in result.output
+    mock_ai_client.send_message.assert_not_called()
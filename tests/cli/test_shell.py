@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from crowler.cli.app import build_command
+from crowler.cli.shell import CrowlerShell, completions
+
+
+@pytest.fixture(scope="module")
+def root():
+    return build_command()
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("pro", ["process", "prompt"]),
+        ("prompt ", ["add", "clear", "list", "remove", "undo"]),
+        ("prompt a", ["add"]),
+        ("code run --f", ["--force"]),
+        ("unknown ", []),
+    ],
+)
+def test_completions(root, line, expected):
+    assert completions(root, line) == expected
+
+
+def test_completions_paths_for_arguments(root, tmp_path, monkeypatch):
+    (tmp_path / "module.py").write_text("")
+    (tmp_path / "pkg").mkdir()
+    monkeypatch.chdir(tmp_path)
+    assert completions(root, "file add m") == ["module.py"]
+    assert completions(root, "file add p") == ["pkg/"]
+
+
+def test_execute_runs_commands_until_exit(tmp_path):
+    run = MagicMock(return_value=0)
+    shell = CrowlerShell(MagicMock(), run, history_path=tmp_path / "history")
+
+    assert shell.execute('prompt add "two words"') is True
+    assert shell.execute("   ") is True
+    assert shell.execute("help prompt") is True
+    assert shell.execute("exit") is False
+    assert [c.args[0] for c in run.call_args_list] == [
+        ["prompt", "add", "two words"],
+        ["prompt", "--help"],
+    ]
+
+
+def test_execute_reports_bad_quoting_and_nested_shell(tmp_path):
+    run = MagicMock()
+    shell = CrowlerShell(MagicMock(), run, history_path=tmp_path / "history")
+    with patch("typer.secho") as mock_secho:
+        assert shell.execute('prompt add "open') is True
+        assert shell.execute("shell") is True
+    run.assert_not_called()
+    messages = [c.args[0] for c in mock_secho.call_args_list]
+    assert any("No closing quotation" in m for m in messages)
+    assert any("Already in the crowler shell" in m for m in messages)
+
+
+def test_loop_reads_until_eof(tmp_path, monkeypatch):
+    lines = iter(["show", "prompt list"])
+
+    def fake_input(prompt):
+        try:
+            return next(lines)
+        except StopIteration:
+            raise EOFError
+
+    monkeypatch.setattr("builtins.input", fake_input)
+    run = MagicMock(return_value=0)
+    CrowlerShell(MagicMock(), run, history_path=tmp_path / "history").loop()
+    assert [c.args[0] for c in run.call_args_list] == [["show"], ["prompt", "list"]]
+
+
+def test_shell_command_runs_in_process():
+    from typer.testing import CliRunner
+
+    from crowler.cli.app import app
+
+    with (
+        patch("crowler.cli.app.summary_all", return_value="All summaries"),
+        patch("crowler.cli.shell.CrowlerShell._setup_readline", return_value=None),
+    ):
+        result = CliRunner().invoke(app, ["shell"], input="show\nexit\n")
+
+    assert result.exit_code == 0
+    assert "All summaries" in result.output
@@ -1,5 +1,5 @@
 # tests/cli/test_url_app.py
-from unittest.mock import patch, call, Mock
+from unittest.mock import patch, ANY, call, Mock
 import pytest
 from typer.testing import CliRunner
 
@@ -15,7 +15,8 @@ def test_parse_urls_success():
 
         # Arrange: two example URLs and mocked extracted data
         mock_get_urls.return_value = ["https://a.example", "https://b.example"]
-        mock_extract.side_effect = ["DATA A", "DATA B"]
+        data = {"https://a.example": "DATA A", "https://b.example": "DATA B"}
+        mock_extract.side_effect = lambda url, session: data[url]
 
         # Import the Typer app and run the 'parse' command
         from crowler.cli.url_app import url_app
@@ -26,7 +27,8 @@ def test_parse_urls_success():
         assert result.exit_code == 0
         mock_get_urls.assert_called_once()
         mock_extract.assert_has_calls(
-            [call("https://a.example"), call("https://b.example")]
+            [call("https://a.example", ANY), call("https://b.example", ANY)],
+            any_order=True,
         )
 
         # Click/Typer's CliRunner returns combined stdout+stderr in result.output.
@@ -50,18 +52,117 @@ def test_parse_urls_failure():
 
         result = runner.invoke(url_app, ["parse"])
 
-        # Because parse_urls catches, secho's an error and then re-raises,
-        # the command should exit with non-zero code.
+        # Failures are reported per URL and turn into a non-zero exit code
         assert result.exit_code != 0
+        assert "❌ Failed to parse https://bad.example" in result.output
+        assert "boom" in result.output
 
-        # The secho error message should appear in the output (stderr merged into result.output)
-        assert (
-            "❌ Failed to undo last change" in result.output
-            or "Failed to undo" in result.output
+
+def test_parse_urls_keeps_going_after_a_failure():
+    with (
+        patch("crowler.cli.url_app.get_urls") as mock_get_urls,
+        patch("crowler.cli.url_app.extract_html_data") as mock_extract,
+    ):
+        mock_get_urls.return_value = ["https://bad.example", "https://ok.example"]
+
+        def fake_extract(url, session):
+            if "bad" in url:
+                raise RuntimeError("boom")
+            return "DATA OK"
+
+        mock_extract.side_effect = fake_extract
+
+        from crowler.cli.url_app import url_app
+
+        result = runner.invoke(url_app, ["parse", "--workers", "2"])
+
+        assert result.exit_code == 1
+        assert "DATA OK" in result.output
+        assert "1 URL(s) could not be parsed" in result.output
+
+
+def test_crawl_command_adds_pages_in_one_write():
+    pages = [
+        Mock(url="https://a.example/", text="x"),
+        Mock(url="https://a.example/b", text="y"),
+    ]
+    with (
+        patch("crowler.cli.url_app.crawl", return_value=iter(pages)) as mock_crawl,
+        patch("crowler.cli.url_app.append_urls") as mock_append,
+    ):
+        from crowler.cli.url_app import url_app
+
+        result = runner.invoke(
+            url_app,
+            ["crawl", "https://a.example/", "--depth", "2", "--scope", "prefix"],
+        )
+
+        assert result.exit_code == 0
+        assert mock_crawl.call_args.kwargs["depth"] == 2
+        assert mock_crawl.call_args.kwargs["scope"] == "prefix"
+        mock_append.assert_called_once_with(
+            ["https://a.example/", "https://a.example/b"]
         )
-        # Optional: assert the exception message is in output or raised in exception
-        assert (
-            "boom" in result.output
-            or "RuntimeError" in result.stdout
-            or "boom" in str(result.exception)
+        assert "Crawled 2 page(s)" in result.output
+
+
+def test_import_sitemap_adds_filtered_urls_in_one_write(tmp_path):
+    sitemap = tmp_path / "sitemap.xml"
+    sitemap.write_text(
+        "<urlset>"
+        "<url><loc>https://a.example/docs/1</loc><lastmod>2024-05-01</lastmod></url>"
+        "<url><loc>https://a.example/docs/2</loc><lastmod>2022-05-01</lastmod></url>"
+        "<url><loc>https://a.example/blog/1</loc><lastmod>2024-05-01</lastmod></url>"
+        "</urlset>"
+    )
+    with patch("crowler.cli.url_app.append_urls") as mock_append:
+        mock_append.side_effect = lambda urls: len(list(urls))
+        from crowler.cli.url_app import url_app
+
+        result = runner.invoke(
+            url_app,
+            ["import-sitemap", str(sitemap), "--pattern", "/docs/"],
+        )
+        assert result.exit_code == 0
+        mock_append.assert_called_once()
+
+        seen = []
+        mock_append.side_effect = lambda urls: seen.extend(urls) or len(seen)
+        result = runner.invoke(
+            url_app, ["import-sitemap", str(sitemap), "--since", "2024-01-01"]
         )
+        assert result.exit_code == 0
+        assert seen == ["https://a.example/docs/1", "https://a.example/blog/1"]
+
+
+def test_import_feed_reports_failures(tmp_path):
+    from crowler.cli.url_app import url_app
+
+    result = runner.invoke(url_app, ["import-feed", str(tmp_path / "missing.xml")])
+    assert result.exit_code == 1
+    assert "❌ Failed to import" in result.output
+
+
+def test_refresh_reports_changes_and_failures():
+    from crowler.util.recrawl_util import RefreshResult
+
+    results = [
+        RefreshResult("https://a.example", True),
+        RefreshResult("https://b.example", False),
+        RefreshResult("https://c.example", None, RuntimeError("boom")),
+    ]
+    with (
+        patch("crowler.cli.url_app.get_urls") as mock_get_urls,
+        patch("crowler.cli.url_app.RecrawlScheduler"),
+        patch("crowler.cli.url_app.refresh", return_value=iter(results)) as mock_ref,
+    ):
+        mock_get_urls.return_value = {f"https://{c}.example" for c in "abcd"}
+        from crowler.cli.url_app import url_app
+
+        result = runner.invoke(url_app, ["refresh", "--max-requests", "3"])
+
+    assert result.exit_code == 1
+    assert mock_ref.call_args.kwargs["max_requests"] == 3
+    assert "🔄 https://a.example changed" in result.output
+    assert "❌ Failed to refresh https://c.example: boom" in result.output
+    assert "1 changed, 1 unchanged, 1 not due" in result.output
@@ -112,3 +112,22 @@ def test_save_handles_write_exception(tmp_path, capsys, monkeypatch):
     db._save([{"foo": "fail"}])
     captured = capsys.readouterr()
     assert "Failed to save" in captured.err
+
+
+def test_load_reuses_parsed_history_until_file_changes(history_db, tmp_history_file):
+    history_db.latest()
+    with patch("crowler.db.history_db.json.load") as mock_load:
+        assert history_db.latest() == {"foo": "bar"}
+        mock_load.assert_not_called()
+
+    tmp_history_file.write_text(json.dumps([{"foo": "bar"}, {"foo": "changed!"}]))
+    assert history_db.latest() == {"foo": "changed!"}
+
+
+def test_push_refreshes_cache_without_rereading(history_db):
+    history_db.push({"foo": "new"})
+    with patch("crowler.db.history_db.json.load") as mock_load:
+        assert history_db.latest() == {"foo": "NEW"}
+        mock_load.assert_not_called()
+    assert history_db.undo() is True
+    assert history_db.latest() == {"foo": "bar"}
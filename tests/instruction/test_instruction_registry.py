@@ -0,0 +1,103 @@
+import pytest
+
+from crowler.instruction import instruction_registry
+from crowler.instruction.instruction_registry import (
+    available_instructions,
+    get_instruction,
+    load_instruction_file,
+)
+
+SECURITY_TOML = """
+description = "Security review"
+prompt = "Review {filepath} for injection bugs"
+instructions = ["Find injection bugs.", "Explain each fix."]
+allow_file_patterns = ["\\\\.py$"]
+deny_file_patterns = ["^tests/"]
+"""
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    user = tmp_path / "user"
+    project.mkdir()
+    user.mkdir()
+    monkeypatch.setattr(
+        instruction_registry, "instruction_dirs", lambda: [project, user]
+    )
+    monkeypatch.setattr(instruction_registry, "_compiled", {})
+    return project, user
+
+
+def test_available_lists_builtins_and_files_without_importing(dirs):
+    project, user = dirs
+    (user / "security.toml").write_text("not = [valid")
+    names = available_instructions()
+    assert {"unit-test", "mypy", "readme", "typer-log"} <= names.keys()
+    assert names["security"] == str(user / "security.toml")
+
+
+def test_project_file_overrides_user_and_builtin(dirs):
+    project, user = dirs
+    (user / "mypy.toml").write_text('instructions = ["user"]')
+    (project / "mypy.toml").write_text('instructions = ["project"]')
+    spec = get_instruction("mypy")
+    assert spec.instruction.instructions == ["project"]
+    assert spec.source == str(project / "mypy.toml")
+
+
+def test_get_builtin_instruction(dirs):
+    spec = get_instruction("mypy")
+    assert spec.source.endswith(":MYPY_INSTRUCTION")
+    assert spec.final_prompt("a.py") == "Focus on only a.py"
+
+
+def test_get_unknown_instruction_raises_key_error(dirs):
+    with pytest.raises(KeyError):
+        get_instruction("nope")
+
+
+def test_load_toml_file(dirs):
+    _, user = dirs
+    (user / "security.toml").write_text(SECURITY_TOML)
+    spec = get_instruction("security")
+    assert spec.description == "Security review"
+    assert spec.final_prompt("a.py") == "Review a.py for injection bugs"
+    assert [p.pattern for p in spec.instruction.allow_file_patterns] == ["\\.py$"]
+    assert [p.pattern for p in spec.instruction.deny_file_patterns] == ["^tests/"]
+    assert spec.instruction.system_text == "Find injection bugs.\nExplain each fix."
+
+
+def test_compiled_spec_reused_until_contents_change(dirs):
+    _, user = dirs
+    path = user / "security.toml"
+    path.write_text(SECURITY_TOML)
+    first = load_instruction_file(path)
+    assert load_instruction_file(path) is first
+    path.write_text('instructions = "changed"')
+    changed = load_instruction_file(path)
+    assert changed is not first
+    assert changed.instruction.instructions == ["changed"]
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        ('description = "x"', "missing 'instructions'"),
+        ("instructions = [1, 2]", "must be a string or a list of strings"),
+    ],
+)
+def test_invalid_files_raise_value_error(dirs, content, message):
+    _, user = dirs
+    path = user / "bad.toml"
+    path.write_text(content)
+    with pytest.raises(ValueError, match=message):
+        load_instruction_file(path)
+
+
+def test_yaml_file(dirs):
+    pytest.importorskip("yaml")
+    _, user = dirs
+    path = user / "docs.yaml"
+    path.write_text("instructions:\n  - Write docstrings.\n")
+    assert load_instruction_file(path).instruction.instructions == ["Write docstrings."]
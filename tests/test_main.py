@@ -0,0 +1,56 @@
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# provider SDKs and HTTP/HTML stacks that only `code`, `url` and `ask` need
+HEAVY_MODULES = ["openai", "boto3", "botocore", "requests", "bs4", "pyperclip"]
+# `import crowler.main` takes ~0.1s lazily and well over 1s with the SDKs
+IMPORT_BUDGET_SECONDS = 0.75
+
+SCRIPT = textwrap.dedent("""
+    import json, sys, time
+    start = time.perf_counter()
+    from crowler.cli.app import app
+    elapsed = time.perf_counter() - start
+    try:
+        app(sys.argv[1:], standalone_mode=False)
+    except SystemExit:
+        pass
+    print(json.dumps({
+        "elapsed": elapsed,
+        "heavy": [m for m in %r if m in sys.modules],
+    }))
+    """ % HEAVY_MODULES)
+
+
+def run_cli(args, tmp_path):
+    env = {"HOME": str(tmp_path), "PATH": "/usr/bin:/bin", "AI_CLIENT": "openai"}
+    out = subprocess.run(
+        [sys.executable, "-c", SCRIPT, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=REPO_ROOT,
+        check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "args", [["show"], ["prompt", "add", "x"], ["prompt", "list"], ["file", "list"]]
+)
+def test_common_commands_skip_heavy_imports(args, tmp_path):
+    result = run_cli(args, tmp_path)
+    assert result["heavy"] == []
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS
+
+
+def test_code_help_skips_provider_sdks(tmp_path):
+    result = run_cli(["code", "--help"], tmp_path)
+    assert not {"openai", "boto3", "botocore"} & set(result["heavy"])
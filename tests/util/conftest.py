@@ -0,0 +1,13 @@
+import pytest
+
+from crowler.util.html_util import HtmlData
+
+
+@pytest.fixture
+def make_page():
+    """Factory for extracted pages: make_page(url, text="body", title="T")."""
+
+    def _make(url, text="body", title="T"):
+        return HtmlData(url=url, title=title, meta={}, links=[], text=text)
+
+    return _make
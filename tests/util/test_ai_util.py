@@ -0,0 +1,112 @@
+import pytest
+
+import crowler.util.ai_util as ai_util
+from crowler.instruction.instruction_model import Instruction
+
+
+@pytest.fixture(autouse=True)
+def empty_stores(monkeypatch):
+    monkeypatch.setattr(ai_util, "get_shared_files", lambda: set())
+    monkeypatch.setattr(ai_util, "get_latest_prompts", lambda: [])
+    monkeypatch.setattr(ai_util, "get_urls", lambda: set())
+
+
+def test_format_messages_empty():
+    assert ai_util.format_messages() == []
+
+
+def test_format_messages_system_and_final_prompt():
+    msgs = ai_util.format_messages(
+        instructions=[Instruction(instructions=["a", "b"])], final_prompt="go"
+    )
+    assert msgs == [
+        {"role": "system", "content": "a\nb"},
+        {"role": "user", "content": "go"},
+    ]
+
+
+def test_format_messages_includes_url_context(monkeypatch):
+    monkeypatch.setattr(ai_util, "get_urls", lambda: {"https://b", "https://a"})
+    seen = []
+
+    def fake_stringify(urls):
+        seen.append(urls)
+        return ["🌐 URL context:", "URL: https://a\n```\nA\n```"]
+
+    monkeypatch.setattr(ai_util, "stringify_url_contents", fake_stringify)
+    msgs = ai_util.format_messages(final_prompt="go")
+    assert seen == [["https://a", "https://b"]]
+    assert msgs[0]["content"].startswith("🌐 URL context:")
+    assert msgs[0]["content"].endswith("go")
+
+
+def test_format_messages_skips_empty_url_context(monkeypatch):
+    monkeypatch.setattr(ai_util, "get_urls", lambda: {"https://a"})
+    monkeypatch.setattr(
+        ai_util, "stringify_url_contents", lambda urls: ["🌐 URL context:"]
+    )
+    assert ai_util.format_messages(final_prompt="go") == [
+        {"role": "user", "content": "go"}
+    ]
+
+
+def test_format_messages_uses_retrieval_when_enabled(monkeypatch):
+    monkeypatch.setattr(ai_util, "retrieval_k", lambda: 2)
+    monkeypatch.setattr(ai_util, "get_shared_files", lambda: {"b.py", "a.py"})
+    monkeypatch.setattr(ai_util, "get_latest_prompts", lambda: ["fix caching"])
+    calls = []
+
+    def fake_relevant(files, urls, query, k):
+        calls.append((files, urls, query, k))
+        return ["🔎 Relevant context:", "File: a.py (lines 1-3)\n```\nA\n```"]
+
+    monkeypatch.setattr(ai_util, "stringify_relevant_chunks", fake_relevant)
+    monkeypatch.setattr(ai_util, "stringify_file_contents", pytest.fail, raising=True)
+    msgs = ai_util.format_messages(final_prompt="go")
+    assert calls == [(["a.py", "b.py"], [], "fix caching\ngo", 2)]
+    assert msgs[0]["content"] == (
+        "🔎 Relevant context:\nFile: a.py (lines 1-3)\n```\nA\n```\n\nfix caching\n\ngo"
+    )
+
+
+def test_format_messages_retrieval_needs_a_query(monkeypatch):
+    monkeypatch.setattr(ai_util, "retrieval_k", lambda: 2)
+    monkeypatch.setattr(ai_util, "get_urls", lambda: {"https://a"})
+    monkeypatch.setattr(
+        ai_util, "stringify_url_contents", lambda urls: ["🌐 URL context:", "U"]
+    )
+    assert ai_util.format_messages()[0]["content"] == "🌐 URL context:\nU"
+
+
+def test_format_messages_trims_context_to_budget(monkeypatch):
+    monkeypatch.setattr("crowler.util.token_util._encoding", lambda: None)
+    monkeypatch.setattr(ai_util, "get_urls", lambda: {"https://a"})
+    monkeypatch.setattr(
+        ai_util,
+        "stringify_url_contents",
+        lambda urls: [
+            "🌐 URL context:",
+            "URL: https://a\n```\n" + "u" * 4000 + "\n```",
+        ],
+    )
+    msgs = ai_util.format_messages(
+        instructions=[Instruction(instructions=["sys"])], final_prompt="go", budget=50
+    )
+    assert msgs == [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "go"},
+    ]
+
+
+def test_plan_messages_reports_sections(monkeypatch):
+    monkeypatch.setattr(ai_util, "get_latest_prompts", lambda: ["first", "second"])
+    plan = ai_util.plan_messages(
+        instructions=[Instruction(instructions=["sys"])], final_prompt="go"
+    )
+    assert [s.name for s in plan.sections] == [
+        "instruction #1",
+        "prompt #1",
+        "prompt #2",
+        "final prompt",
+    ]
+    assert plan.fits
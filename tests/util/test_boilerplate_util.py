@@ -0,0 +1,56 @@
+import crowler.util.boilerplate_util as boilerplate_util
+
+NAV = "Home Guides API reference Blog Community"
+BANNER = "We use cookies to improve your experience on this site"
+
+
+def test_shingles_short_block_is_single_shingle():
+    assert boilerplate_util.shingles("Hello World") == {"hello world"}
+    assert boilerplate_util.shingles("a b c d") == {"a b c", "b c d"}
+
+
+def test_minhash_is_deterministic_and_estimates_similarity():
+    a = boilerplate_util.minhash(boilerplate_util.shingles(BANNER))
+    b = boilerplate_util.minhash(boilerplate_util.shingles(BANNER))
+    c = boilerplate_util.minhash(boilerplate_util.shingles("totally unrelated words"))
+    assert a == b
+    assert boilerplate_util.similarity(a, b) == 1.0
+    assert boilerplate_util.similarity(a, c) < 0.5
+
+
+def test_strip_repeated_blocks_drops_near_duplicates():
+    texts = [
+        f"{NAV}\nInstalling the package with pip is simple\n{BANNER}",
+        f"{NAV}\nConfiguring logging takes one call to setup\n{BANNER}!",
+        f"{NAV} \nWriting plugins requires a registered entry point",
+    ]
+    cleaned = boilerplate_util.strip_repeated_blocks(texts)
+    assert cleaned == [
+        "Installing the package with pip is simple",
+        "Configuring logging takes one call to setup",
+        "Writing plugins requires a registered entry point",
+    ]
+
+
+def test_strip_repeated_blocks_keeps_short_lines_and_single_pages():
+    texts = ["Parameters\nFirst page body text here", "Parameters\nSecond body"]
+    assert boilerplate_util.strip_repeated_blocks(texts) == texts
+    assert boilerplate_util.strip_repeated_blocks([f"{NAV}"]) == [NAV]
+
+
+def test_strip_repeated_blocks_respects_share():
+    texts = [f"{BANNER}\nunique {i} words in body" for i in range(2)]
+    texts += [f"other page {i} content only" for i in range(8)]
+    assert boilerplate_util.strip_repeated_blocks(texts, share=0.3) == texts
+
+
+def test_remove_boilerplate_groups_by_host(make_page):
+    pages = {
+        "https://a.example/1": make_page("https://a.example/1", f"{BANNER}\nAlpha one"),
+        "https://a.example/2": make_page("https://a.example/2", f"{BANNER}\nAlpha two"),
+        "https://b.example/1": make_page("https://b.example/1", f"{BANNER}\nBeta one"),
+    }
+    cleaned = boilerplate_util.remove_boilerplate(pages)
+    assert cleaned["https://a.example/1"].text == "Alpha one"
+    assert cleaned["https://a.example/2"].text == "Alpha two"
+    assert cleaned["https://b.example/1"].text == f"{BANNER}\nBeta one"
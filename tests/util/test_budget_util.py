@@ -0,0 +1,82 @@
+import types
+
+import pytest
+
+from crowler.util.budget_util import (
+    DEFAULT_CONTEXT_WINDOW,
+    DROPPED,
+    KEPT,
+    TRUNCATED,
+    Priority,
+    Section,
+    context_window,
+    input_budget,
+    plan_budget,
+)
+
+
+@pytest.fixture(autouse=True)
+def heuristic_tokenizer(monkeypatch):
+    monkeypatch.setattr("crowler.util.token_util._encoding", lambda: None)
+    monkeypatch.delenv("CROWLER_CONTEXT_WINDOW", raising=False)
+
+
+def section(name, tokens, priority):
+    return Section(part=name, name=name, text="x" * 4 * tokens, priority=priority)
+
+
+def test_section_counts_tokens():
+    assert section("a", 25, Priority.URL).tokens == 25
+
+
+def test_plan_without_budget_keeps_everything():
+    sections = [section("a", 10, Priority.URL)]
+    plan = plan_budget(sections, None, overhead=5)
+    assert plan.fits
+    assert plan.tokens == 15
+    assert sections[0].status == KEPT
+
+
+def test_plan_drops_lowest_priority_first():
+    url = section("url", 100, Priority.URL)
+    shared = section("shared", 100, Priority.SHARED_FILE)
+    final = section("final", 50, Priority.REQUIRED)
+    plan = plan_budget([shared, url, final], budget=160)
+    assert url.status == DROPPED
+    assert shared.status == KEPT
+    assert plan.tokens == 150
+    assert plan.fits
+
+
+def test_plan_drops_later_sections_of_same_priority_first():
+    first = section("first", 100, Priority.SHARED_FILE)
+    second = section("second", 100, Priority.SHARED_FILE)
+    plan_budget([first, second], budget=120)
+    assert (first.status, second.status) == (KEPT, DROPPED)
+
+
+def test_plan_truncates_when_enough_remains():
+    url = section("url", 2000, Priority.URL)
+    final = section("final", 50, Priority.REQUIRED)
+    plan = plan_budget([url, final], budget=1050)
+    assert url.status == TRUNCATED
+    assert url.original_tokens == 2000
+    assert 200 <= url.tokens < 2000
+    assert "tokens truncated" in url.text
+    assert plan.fits
+
+
+def test_plan_never_trims_required_sections():
+    final = section("final", 500, Priority.REQUIRED)
+    plan = plan_budget([final], budget=100)
+    assert final.status == KEPT
+    assert not plan.fits
+
+
+def test_context_window_sources(monkeypatch):
+    assert context_window(object()) == DEFAULT_CONTEXT_WINDOW
+    config = types.SimpleNamespace(context_window=200_000, max_tokens=32_000)
+    assert context_window(config) == 200_000
+    assert input_budget(config) == 168_000
+    monkeypatch.setenv("CROWLER_CONTEXT_WINDOW", "50000")
+    assert input_budget(config) == 18_000
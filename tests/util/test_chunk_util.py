@@ -0,0 +1,144 @@
+import pytest
+
+import crowler.util.chunk_util as chunk_util
+
+
+def _join(chunks):
+    return "".join(c.text for c in chunks)
+
+
+def test_iter_file_chunks_empty_file(tmp_path):
+    f = tmp_path / "empty.py"
+    f.write_text("")
+    assert list(chunk_util.iter_file_chunks(f)) == []
+
+
+def test_iter_file_chunks_small_file_single_chunk(tmp_path):
+    f = tmp_path / "a.py"
+    f.write_text("x = 1\ny = 2\n")
+    chunks = list(chunk_util.iter_file_chunks(f))
+    assert len(chunks) == 1
+    assert chunks[0].text == "x = 1\ny = 2\n"
+    assert (chunks[0].start_line, chunks[0].end_line) == (1, 2)
+    assert (chunks[0].index, chunks[0].total) == (1, 1)
+
+
+def test_iter_file_chunks_python_splits_at_top_level_definitions(tmp_path):
+    body = "".join(f"    v{i} = {i}\n" for i in range(10))
+    source = (
+        "import os\n\n"
+        f"def a():\n{body}\n"
+        f"@decorator\ndef b():\n{body}\n"
+        f"class C:\n    def m(self):\n{body.replace('    ', '        ')}"
+    )
+    f = tmp_path / "mod.py"
+    f.write_text(source)
+
+    chunks = list(chunk_util.iter_file_chunks(f, max_bytes=200))
+
+    assert _join(chunks) == source
+    assert [c.text.split("\n", 1)[0] for c in chunks] == [
+        "import os",
+        "@decorator",
+        "class C:",
+    ]
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert nxt.start_line == prev.end_line + 1
+
+
+def test_iter_file_chunks_ignores_def_lines_inside_strings(tmp_path):
+    body = "".join(f"    v{i} = {i}\n" for i in range(10))
+    source = (
+        f"def a():\n{body}"
+        'DOC = """\ndef not_a_def():\n    pass\n"""\n'
+        f"def b():\n{body}"
+    )
+    f = tmp_path / "mod.py"
+    f.write_text(source)
+    chunks = list(chunk_util.iter_file_chunks(f, max_bytes=200))
+    assert _join(chunks) == source
+    assert not any(c.text.startswith("def not_a_def") for c in chunks)
+
+
+def test_iter_file_chunks_unparsable_python_uses_lines(tmp_path):
+    source = "def broken(:\n" + "".join(f"x{i} = {i}\n" for i in range(40))
+    f = tmp_path / "broken.py"
+    f.write_text(source)
+    chunks = list(chunk_util.iter_file_chunks(f, max_bytes=64))
+    assert len(chunks) > 1
+    assert _join(chunks) == source
+
+
+def test_iter_file_chunks_falls_back_to_lines_for_long_definition(tmp_path):
+    source = "def big():\n" + "".join(f"    v{i} = {i}\n" for i in range(100))
+    f = tmp_path / "big.py"
+    f.write_text(source)
+    chunks = list(chunk_util.iter_file_chunks(f, max_bytes=256))
+    assert len(chunks) > 1
+    assert _join(chunks) == source
+    assert all(c.text.endswith("\n") for c in chunks)
+
+
+def test_iter_file_chunks_resumes_statement_cuts_after_long_definition(tmp_path):
+    big = "def big():\n" + "".join(f"    v{i} = {i}\n" for i in range(100))
+    small = "".join(f"def f{i}():\n    return {i}\n\n" for i in range(30))
+    source = big + small
+    f = tmp_path / "mixed.py"
+    f.write_text(source)
+    chunks = list(chunk_util.iter_file_chunks(f, max_bytes=256))
+    assert _join(chunks) == source
+    after = [c for c in chunks if c.start_line > big.count("\n")]
+    assert len(after) > 1
+    assert all(c.text.startswith("def f") for c in after)
+
+
+@pytest.mark.parametrize("max_bytes", [16, 64, 1000])
+def test_iter_file_chunks_text_file_line_windows(tmp_path, max_bytes):
+    source = "".join(f"line {i}\n" for i in range(50))
+    f = tmp_path / "notes.txt"
+    f.write_text(source)
+    chunks = list(chunk_util.iter_file_chunks(f, max_bytes=max_bytes))
+    assert _join(chunks) == source
+    assert all(len(c.text.encode()) <= max(max_bytes, 8) for c in chunks)
+    assert chunks[-1].end_line == 50
+
+
+def test_stringify_chunk_mentions_part_and_lines(tmp_path):
+    chunk = chunk_util.FileChunk(
+        path="a.py", index=2, total=3, start_line=10, end_line=20, text="x = 1"
+    )
+    out = chunk_util.stringify_chunk(chunk)
+    assert "File: a.py (part 2/3, lines 10-20)" in out
+    assert "```\nx = 1\n```" in out
+
+
+def _chunks(*texts):
+    return [
+        chunk_util.FileChunk(
+            path="a.py", index=i, total=len(texts), start_line=0, end_line=0, text=t
+        )
+        for i, t in enumerate(texts, 1)
+    ]
+
+
+def test_merge_chunks_keeps_boundaries_and_unanswered_parts():
+    chunks = _chunks(
+        "import os\n\n", "def a():\n    pass\n\n\n", "def b():\n    pass\n"
+    )
+    merged = chunk_util.merge_chunks(
+        chunks, {1: "import sys\n", 3: "\ndef b(): ...\n\n"}
+    )
+    assert merged == "import sys\n\ndef a():\n    pass\n\n\ndef b(): ...\n"
+
+
+def test_merge_chunks_without_replies_is_the_original():
+    chunks = _chunks("a = 1\n", "b = 2\n")
+    assert chunk_util.merge_chunks(chunks, {}) == "a = 1\nb = 2\n"
+
+
+def test_merge_chunks_refuses_missing_parts():
+    chunks = _chunks("a = 1\n", "b = 2\n", "c = 3\n")
+    with pytest.raises(ValueError, match="2 of 3"):
+        chunk_util.merge_chunks([chunks[0], chunks[2]], {1: "a = 0\n"})
+    with pytest.raises(ValueError):
+        chunk_util.merge_chunks([], {})
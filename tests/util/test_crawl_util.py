@@ -0,0 +1,113 @@
+from urllib.robotparser import RobotFileParser
+
+import pytest
+
+import crowler.util.crawl_util as crawl_util
+from crowler.util.crawl_util import CrawlScope
+from crowler.util.html_util import HtmlData
+
+
+@pytest.mark.parametrize(
+    "url,base,expected",
+    [
+        ("HTTPS://Docs.Example.com", None, "https://docs.example.com/"),
+        ("https://a.example:443/x#frag", None, "https://a.example/x"),
+        ("http://a.example:8080/x?q=1", None, "http://a.example:8080/x?q=1"),
+        ("../b", "https://a.example/docs/a/", "https://a.example/docs/b"),
+        ("#top", "https://a.example/p", "https://a.example/p"),
+        ("mailto:x@y.z", None, None),
+        ("ftp://a.example/f", None, None),
+        ("https://a.example:bad/", None, None),
+    ],
+)
+def test_normalize_url(url, base, expected):
+    assert crawl_util.normalize_url(url, base) == expected
+
+
+@pytest.mark.parametrize(
+    "url,scope,expected",
+    [
+        ("https://a.example/other", CrawlScope.DOMAIN, True),
+        ("https://b.example/docs/x", CrawlScope.DOMAIN, False),
+        ("https://a.example/docs/x", CrawlScope.PREFIX, True),
+        ("https://a.example/blog", CrawlScope.PREFIX, False),
+    ],
+)
+def test_in_scope(url, scope, expected):
+    assert crawl_util.in_scope(url, "https://a.example/docs/", scope) is expected
+
+
+SITE = {
+    "https://a.example/docs/": ["intro", "guide", "https://b.example/x", "/private"],
+    "https://a.example/docs/intro": ["guide", "deep"],
+    "https://a.example/docs/guide": ["/docs/"],
+    "https://a.example/docs/deep": [],
+    "https://a.example/private": [],
+}
+
+
+def fake_fetch(url, session):
+    return HtmlData(url=url, title="", meta={}, links=SITE[url], text=url)
+
+
+@pytest.fixture(autouse=True)
+def fake_robots(monkeypatch):
+    def fetch_robots(url, session):
+        parser = RobotFileParser()
+        parser.parse(["User-agent: *", "Disallow: /private"])
+        return parser
+
+    monkeypatch.setattr(crawl_util, "_fetch_robots", fetch_robots)
+
+
+def _crawl(**kwargs):
+    kwargs.setdefault("delay", 0)
+    return sorted(
+        page.url
+        for page in crawl_util.crawl(
+            "https://a.example/docs/", fetch=fake_fetch, **kwargs
+        )
+    )
+
+
+def test_crawl_depth_zero_fetches_only_seed():
+    assert _crawl(depth=0) == ["https://a.example/docs/"]
+
+
+def test_crawl_follows_links_dedups_and_respects_robots():
+    assert _crawl(depth=2) == [
+        "https://a.example/docs/",
+        "https://a.example/docs/deep",
+        "https://a.example/docs/guide",
+        "https://a.example/docs/intro",
+    ]
+
+
+def test_crawl_ignore_robots_reaches_private_page():
+    assert "https://a.example/private" in _crawl(depth=1, respect_robots=False)
+
+
+def test_crawl_prefix_scope_excludes_outside_pages():
+    out = _crawl(depth=1, respect_robots=False, scope=CrawlScope.PREFIX)
+    assert "https://a.example/private" not in out
+
+
+def test_crawl_max_pages_caps_fetches():
+    assert len(_crawl(depth=2, max_pages=2)) <= 2
+
+
+def test_crawl_rejects_non_http_seed():
+    with pytest.raises(ValueError):
+        list(crawl_util.crawl("mailto:x@y.z", fetch=fake_fetch))
+
+
+def test_host_throttle_spaces_requests(monkeypatch):
+    sleeps = []
+    clock = iter([0.0, 0.0, 0.0])
+    monkeypatch.setattr(crawl_util.time, "monotonic", lambda: next(clock))
+    monkeypatch.setattr(crawl_util.time, "sleep", sleeps.append)
+    throttle = crawl_util.HostThrottle()
+    throttle.wait("a.example", 1.0)
+    throttle.wait("a.example", 1.0)
+    throttle.wait("b.example", 1.0)
+    assert sleeps == [1.0]
@@ -0,0 +1,89 @@
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from crowler.util.daemon_client import encode, forward, read_message, request
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_message_roundtrip_with_prefetched_bytes():
+    left, right = socket.socketpair()
+    with left, right:
+        data = encode({"op": "run", "argv": ["show"]})
+        left.sendall(data)
+        prefix = right.recv(6)
+        assert read_message(right, prefix) == {"op": "run", "argv": ["show"]}
+
+
+def test_forward_without_daemon_runs_locally(tmp_path):
+    assert forward(["show"], path=tmp_path / "missing.sock") is None
+    assert request({"op": "ping"}, path=tmp_path / "missing.sock") is None
+
+
+@pytest.fixture
+def daemon_env():
+    # a short HOME: Unix socket paths are limited to ~100 characters
+    home = tempfile.mkdtemp(prefix="crowler", dir="/tmp")
+    env = {
+        "HOME": home,
+        "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+        "HISTORY_SESSION_ID": "daemon-test",
+        "PYTHONPATH": str(REPO_ROOT),
+    }
+    yield env
+    shutil.rmtree(home, ignore_errors=True)
+
+
+def crowler(args, env, **kwargs):
+    code = "import sys; from crowler.main import main; sys.argv[0] = 'crowler'; main()"
+    return subprocess.run(
+        [sys.executable, "-c", code, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=REPO_ROOT,
+        timeout=60,
+        **kwargs,
+    )
+
+
+def test_daemon_serves_forwarded_commands(daemon_env):
+    started = crowler(["daemon", "start"], daemon_env)
+    assert started.returncode == 0, started.stderr
+    try:
+        client_env = {**daemon_env, "CROWLER_DAEMON": "1"}
+        added = crowler(["prompt", "add", "from the client"], client_env)
+        assert added.returncode == 0
+        assert "Added prompt" in added.stdout
+
+        listed = crowler(["prompt", "list"], client_env)
+        assert "from the client" in listed.stdout
+
+        missing = crowler(["no-such-command"], client_env)
+        assert missing.returncode == 2
+        assert "No such command" in missing.stderr
+
+        status = crowler(["daemon", "status"], daemon_env)
+        assert "3 command(s) served" in status.stdout
+    finally:
+        crowler(["daemon", "stop"], daemon_env)
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if "No daemon running" in crowler(["daemon", "status"], daemon_env).stdout:
+            break
+        time.sleep(0.1)
+    else:
+        pytest.fail("daemon did not stop")
+
+    # without a daemon the client falls back to running the command itself
+    local = crowler(["prompt", "list"], {**daemon_env, "CROWLER_DAEMON": "1"})
+    assert "from the client" in local.stdout
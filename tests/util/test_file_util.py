@@ -30,16 +30,10 @@ def test_should_ignore(path_part, patterns, expected):
         (".", file_util.DEFAULT_IGNORES, False),  # Current directory
         ("..", file_util.DEFAULT_IGNORES, False),  # Parent directory
         # Patterns with wildcards at different positions
-        (
-            "foo.jpg",
-            file_util.DEFAULT_IGNORES,
-            False,
-        ),  # Changed from True to False - ? requires exactly one character
-        (
-            "foo.jpeg",
-            file_util.DEFAULT_IGNORES,
-            False,
-        ),  # Does not match *.jpe?g pattern - ? requires exactly one character
+        ("foo.jpg", file_util.DEFAULT_IGNORES, True),
+        ("foo.jpeg", file_util.DEFAULT_IGNORES, True),
+        ("bundle.min.js", file_util.DEFAULT_IGNORES, True),
+        ("data.sqlite", file_util.DEFAULT_IGNORES, True),
         ("test.py", ["test.*"], True),
         ("test.anything", ["test.*"], True),
     ],
@@ -72,6 +66,47 @@ def test_get_all_files_ignores_patterns(tmp_path):
     assert all("__pycache__" not in f and not f.endswith(".pyc") for f in files)
 
 
+def test_get_all_files_skips_binary_and_minified(tmp_path):
+    (tmp_path / "blob.bin").write_bytes(b"abc\x00def")
+    (tmp_path / "bundle.js").write_text("var a=1;" * 200)
+    (tmp_path / "ok.py").write_text("x = 1\n")
+    files = file_util.get_all_files(tmp_path)
+    assert files == [str(tmp_path / "ok.py")]
+
+
+@pytest.mark.parametrize(
+    "head,expected",
+    [
+        (b"", None),
+        (b"print('hi')\n", None),
+        ("caf\u00e9 \u2603\n".encode("utf-8"), None),
+        (b"PK\x03\x04\x00\x00", "NUL"),
+        (bytes(range(128, 256)) * 4, "UTF-8"),
+        (b"x" * 2000, "minified"),
+        (b"# @generated by protoc\nX = 1\n", "generated"),
+        (b"// Code generated by stringer. DO NOT EDIT.\n", "generated"),
+        (b"# Generated by the protocol buffer compiler.  DO NOT EDIT!\n", "generated"),
+        (b'"""\nfoo\n"""\n# This file is autogenerated\n', "generated"),
+        (b"# Do not edit the defaults without a review.\nX = 1\n", None),
+        (b"x = '@generated'\n", None),
+        # multi-byte char cut at the sample boundary
+        ("a\u00e9".encode("utf-8")[:-1], None),
+    ],
+)
+def test_sniff_bytes(head, expected):
+    reason = file_util.sniff_bytes(head)
+    if expected is None:
+        assert reason is None
+    else:
+        assert reason is not None and expected in reason
+
+
+def test_stringify_file_content_skips_binary(tmp_path):
+    f = tmp_path / "db.bin"
+    f.write_bytes(b"SQLite format 3\x00" + b"\x01" * 100)
+    assert file_util.stringify_file_content(f) == ""
+
+
 def test_stringify_file_contents_empty(monkeypatch):
     assert file_util.stringify_file_contents([]) == []
 
@@ -174,6 +209,91 @@ def test_rewrite_file_writes(tmp_path):
     assert f.read_text() == content
 
 
+def test_rewrite_file_replaces_atomically_and_keeps_mode(tmp_path):
+    f = tmp_path / "run.sh"
+    f.write_text("old")
+    f.chmod(0o755)
+    assert file_util.rewrite_file(str(f), "new") is True
+    assert f.read_text() == "new"
+    assert f.stat().st_mode & 0o777 == 0o755
+    assert [p.name for p in tmp_path.iterdir()] == ["run.sh"]
+
+
+def test_rewrite_file_follows_symlink(tmp_path):
+    real = tmp_path / "real" / "a.py"
+    real.parent.mkdir()
+    real.write_text("old")
+    link = tmp_path / "a.py"
+    link.symlink_to(real)
+    assert file_util.rewrite_file(str(link), "new") is True
+    assert link.is_symlink()
+    assert real.read_text() == "new"
+    assert sorted(p.name for p in real.parent.iterdir()) == ["a.py"]
+
+
+def test_rewrite_file_new_file_mode_follows_umask(monkeypatch, tmp_path):
+    monkeypatch.setattr(file_util, "_umask", lambda: 0o027)
+    f = tmp_path / "new.txt"
+    assert file_util.rewrite_file(str(f), "x") is True
+    assert f.stat().st_mode & 0o777 == 0o640
+
+
+def test_rewrite_file_cleans_temp_file_on_failure(monkeypatch, tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_text("old")
+
+    def fail_replace(*a, **k):
+        raise OSError("rename failed")
+
+    monkeypatch.setattr(file_util.os, "replace", fail_replace)
+    assert file_util.rewrite_file(str(f), "new") is False
+    assert f.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["a.txt"]
+
+
+@pytest.mark.parametrize(
+    "existing,content,expected",
+    [
+        (None, "abc", False),
+        ("abc", "abc", True),
+        ("abc", "abd", False),
+        ("abc", "abcd", False),
+        ("é", "é", True),
+    ],
+)
+def test_is_unchanged(tmp_path, existing, content, expected):
+    f = tmp_path / "f.txt"
+    if existing is not None:
+        f.write_text(existing, encoding="utf-8")
+    assert file_util.is_unchanged(str(f), content) is expected
+
+
+def test_rewrite_files_skips_unchanged_and_reports_counts(monkeypatch, tmp_path):
+    same = tmp_path / "same.txt"
+    same.write_text("keep")
+    same_mtime = same.stat().st_mtime_ns
+    changed = tmp_path / "changed.txt"
+    changed.write_text("old")
+    declined = tmp_path / "declined.txt"
+    declined.write_text("old")
+    monkeypatch.setattr(file_util.typer, "confirm", lambda msg: "declined" not in msg)
+
+    report = file_util.rewrite_files(
+        OrderedDict(
+            [
+                (str(same), "keep"),
+                (str(changed), "new"),
+                (str(declined), "new"),
+            ]
+        )
+    )
+
+    assert report == file_util.RewriteReport(written=1, unchanged=1, skipped=1)
+    assert same.stat().st_mtime_ns == same_mtime
+    assert changed.read_text() == "new"
+    assert declined.read_text() == "old"
+
+
 def test_rewrite_file_handles_exception(monkeypatch, tmp_path):
     class DummyPath:
         parent = type("P", (), {"mkdir": staticmethod(lambda **k: None)})
@@ -188,26 +308,55 @@ def test_rewrite_file_handles_exception(monkeypatch, tmp_path):
     file_util.rewrite_file("foo.txt", "abc")  # Should not raise
 
 
-def test_find_repo_root_git(monkeypatch, tmp_path):
-    # Simplified version of the test, removing unused code
-    monkeypatch.setattr(
-        file_util.subprocess,
-        "check_output",
-        lambda *a, **k: bytes(str(tmp_path), "utf-8"),
-    )
+@pytest.fixture
+def clear_git_root_cache():
+    file_util._find_git_root.cache_clear()
+    yield
+    file_util._find_git_root.cache_clear()
+
+
+def test_find_repo_root_git_dir(monkeypatch, tmp_path, clear_git_root_cache):
+    (tmp_path / ".git").mkdir()
+    nested = tmp_path / "a" / "b"
+    nested.mkdir(parents=True)
+    monkeypatch.chdir(nested)
+    assert file_util.find_repo_root() == tmp_path
+
+
+@pytest.mark.parametrize(
+    "gitfile_content,expected_is_root",
+    [
+        ("gitdir: /elsewhere/.git/worktrees/wt\n", True),
+        ("gitdir: ../.git/modules/sub\n", True),
+        ("not a gitfile\n", False),
+    ],
+)
+def test_find_repo_root_gitfile(
+    monkeypatch, tmp_path, clear_git_root_cache, gitfile_content, expected_is_root
+):
+    (tmp_path / ".git").mkdir()
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / ".git").write_text(gitfile_content)
+    monkeypatch.chdir(sub)
+    expected = sub if expected_is_root else tmp_path
+    assert file_util.find_repo_root() == expected
+
+
+def test_find_repo_root_fallback(monkeypatch, tmp_path, clear_git_root_cache):
+    monkeypatch.setattr(Path, "is_dir", lambda self: False)
+    monkeypatch.chdir(tmp_path)
     out = file_util.find_repo_root()
     assert out == tmp_path
 
 
-def test_find_repo_root_fallback(monkeypatch):
-    monkeypatch.setattr(
-        file_util.subprocess,
-        "check_output",
-        lambda *a, **k: (_ for _ in ()).throw(Exception("fail")),
-    )
-    cwd = Path.cwd()
-    out = file_util.find_repo_root()
-    assert out == cwd
+def test_find_repo_root_is_memoised(monkeypatch, tmp_path, clear_git_root_cache):
+    (tmp_path / ".git").mkdir()
+    monkeypatch.chdir(tmp_path)
+    assert file_util.find_repo_root() == tmp_path
+    (tmp_path / ".git").rmdir()
+    assert file_util.find_repo_root() == tmp_path
+    assert file_util._find_git_root.cache_info().hits == 1
 
 
 def test_source_to_test_path_success(tmp_path):
@@ -240,3 +389,53 @@ def test_source_to_test_path_too_short(tmp_path):
     src.write_text("x")
     with pytest.raises(Exception):
         file_util.source_to_test_path(src, repo_root)
+
+
+def test_map_sources_to_tests_flags_existing_tests(tmp_path):
+    (tmp_path / "tests" / "cli").mkdir(parents=True)
+    (tmp_path / "tests" / "cli" / "test_app.py").write_text("x")
+    sources = [
+        tmp_path / "crowler" / "cli" / "app.py",
+        tmp_path / "crowler" / "cli" / "url_app.py",
+        tmp_path / "crowler" / "main.py",
+    ]
+
+    out = file_util.map_sources_to_tests(sources, tmp_path)
+
+    assert [(m.test_path, m.has_test) for m in out] == [
+        (tmp_path / "tests" / "cli" / "test_app.py", True),
+        (tmp_path / "tests" / "cli" / "test_url_app.py", False),
+        (tmp_path / "tests" / "test_main.py", False),
+    ]
+    assert [m.source for m in out] == [str(s) for s in sources]
+
+
+def test_map_sources_to_tests_matches_source_to_test_path(tmp_path):
+    src = tmp_path / "crowler" / "cli" / "app.py"
+    (tmp_path / "crowler" / "cli").mkdir(parents=True)
+    src.write_text("x")
+    [mapping] = file_util.map_sources_to_tests([src], tmp_path)
+    assert mapping.test_path == file_util.source_to_test_path(src, tmp_path)
+
+
+def test_map_sources_to_tests_unmappable_and_test_files(tmp_path):
+    (tmp_path / "tests").mkdir()
+    existing_test = tmp_path / "tests" / "test_x.py"
+    out = file_util.map_sources_to_tests(
+        [tmp_path / "top.py", tmp_path.parent / "outside" / "a.py", existing_test],
+        tmp_path,
+    )
+    assert [(m.test_path, m.has_test) for m in out] == [
+        (None, False),
+        (None, False),
+        (existing_test, True),
+    ]
+
+
+def test_map_sources_to_tests_relative_sources(monkeypatch, tmp_path):
+    (tmp_path / "tests" / "util").mkdir(parents=True)
+    (tmp_path / "tests" / "util" / "test_a.py").write_text("x")
+    monkeypatch.chdir(tmp_path)
+    [mapping] = file_util.map_sources_to_tests(["pkg/util/a.py"], tmp_path)
+    assert mapping.source == "pkg/util/a.py"
+    assert mapping.has_test is True
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+import crowler.util.html_cache as html_cache
+from crowler.util.html_cache import CacheEntry, HtmlCache
+
+DATA = {"url": "u", "title": "T", "meta": {}, "links": [], "text": "hello"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HtmlCache(directory=tmp_path / "cache", max_bytes=10_000)
+
+
+def test_get_missing_returns_none(cache):
+    assert cache.get("https://a.example") is None
+
+
+def test_put_then_get_roundtrip(cache):
+    cache.put("https://a.example", DATA, etag='"v1"', last_modified="Mon")
+    entry = cache.get("https://a.example")
+    assert entry is not None
+    assert entry.data == DATA
+    assert entry.validators() == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon",
+    }
+
+
+def test_refresh_restamps_and_keeps_validators(cache, monkeypatch):
+    cache.put("https://a.example", DATA, etag='"v1"', last_modified="Mon")
+    entry = cache.get("https://a.example")
+    monkeypatch.setattr("crowler.util.html_cache.time.time", lambda: 10**10)
+    cache.refresh(entry, etag='"v2"')
+    refreshed = cache.get("https://a.example")
+    assert refreshed.fetched_at == 10**10
+    assert (refreshed.etag, refreshed.last_modified) == ('"v2"', "Mon")
+    assert refreshed.data == DATA
+
+
+def test_entry_from_another_extractor_version_is_a_miss(cache, monkeypatch):
+    cache.put("https://a.example", DATA)
+    monkeypatch.setattr(
+        html_cache, "EXTRACTOR_VERSION", html_cache.EXTRACTOR_VERSION + 1
+    )
+    assert cache.get("https://a.example") is None
+
+
+def test_validators_empty_without_headers():
+    entry = CacheEntry("u", None, None, 0.0, DATA)
+    assert entry.validators() == {}
+
+
+def test_corrupt_entry_is_dropped(cache, tmp_path):
+    cache.put("https://a.example", DATA)
+    [path] = list((tmp_path / "cache").glob("*.json"))
+    path.write_text("not json")
+    assert cache.get("https://a.example") is None
+    assert not path.exists()
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = HtmlCache(directory=tmp_path / "c")
+    big = dict(DATA, text="x" * 200)
+    cache.put("https://old.example", big)
+    old_path = cache._path("https://old.example")
+    os.utime(old_path, (0, 0))
+    cache = HtmlCache(directory=tmp_path / "c", max_bytes=old_path.stat().st_size + 10)
+    cache.put("https://new.example", big)
+    assert cache.get("https://old.example") is None
+    assert cache.get("https://new.example") is not None
+
+
+def test_put_scans_directory_once_and_tracks_size(tmp_path, monkeypatch):
+    cache = HtmlCache(directory=tmp_path / "c")
+    scans = []
+    scan = cache._scan
+    monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or scan())
+    for i in range(20):
+        cache.put(f"https://a.example/{i}", DATA)
+    cache.put("https://a.example/0", dict(DATA, text="longer text"))
+    on_disk = sum(p.stat().st_size for p in (tmp_path / "c").glob("*.json"))
+    assert len(scans) == 1
+    assert cache._size == on_disk
+
+
+def test_clear_removes_entries(cache):
+    cache.put("https://a.example", DATA)
+    cache.clear()
+    assert cache.get("https://a.example") is None
@@ -0,0 +1,231 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+import crowler.util.html_util as html_util
+from crowler.util.html_cache import HtmlCache
+
+PAGE = """
+<html><head><title> Hello </title>
+<meta name="description" content="desc">
+<meta property="og:title" content="OG">
+</head><body>
+<nav>Menu</nav>
+<p>Main text</p>
+<a href="/docs">Docs</a>
+<a href="mailto:x@y.z">Mail</a>
+<script>var x = 1;</script>
+</body></html>
+"""
+
+
+def _response(status=200, text=PAGE, headers=None, chunks=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.headers = {"Content-Type": "text/html; charset=utf-8", **(headers or {})}
+    body = text.encode("utf-8")
+    resp.iter_content.return_value = chunks if chunks is not None else [body]
+    if status >= 400:
+        resp.raise_for_status.side_effect = RuntimeError(str(status))
+    return resp
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HtmlCache(directory=tmp_path / "cache")
+
+
+def test_parse_html_extracts_fields():
+    data = html_util.parse_html("https://a.example", PAGE)
+    assert data.title == "Hello"
+    assert data.meta == {"description": "desc", "og:title": "OG"}
+    assert data.links == ["/docs"]
+    assert "Main text" in data.text
+    assert "Menu" not in data.text
+    assert "var x" not in data.text
+
+
+def test_extract_html_data_caches_and_revalidates(cache):
+    session = MagicMock()
+    session.get.return_value = _response(headers={"ETag": '"v1"'})
+    first = html_util.extract_html_data("https://a.example", session, cache=cache)
+
+    session.get.return_value = _response(status=304, text="")
+    second = html_util.extract_html_data("https://a.example", session, cache=cache)
+
+    assert second == first
+    assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+def test_extract_html_data_304_restamps_cache_entry(cache, monkeypatch):
+    session = MagicMock()
+    session.get.return_value = _response(headers={"ETag": '"v1"'})
+    html_util.extract_html_data("https://a.example", session, cache=cache)
+    first = cache.get("https://a.example")
+
+    monkeypatch.setattr("crowler.util.html_cache.time.time", lambda: 10**10)
+    session.get.return_value = _response(status=304, text="")
+    html_util.extract_html_data("https://a.example", session, cache=cache)
+
+    entry = cache.get("https://a.example")
+    assert entry.fetched_at == 10**10
+    assert (entry.etag, entry.data) == (first.etag, first.data)
+
+
+def test_extract_html_data_refetches_on_200(cache):
+    session = MagicMock()
+    session.get.return_value = _response(headers={"Last-Modified": "Mon"})
+    html_util.extract_html_data("https://a.example", session, cache=cache)
+
+    session.get.return_value = _response(text="<title>New</title>")
+    data = html_util.extract_html_data("https://a.example", session, cache=cache)
+    assert data.title == "New"
+    assert cache.get("https://a.example").data["title"] == "New"
+
+
+def test_extract_html_data_raises_on_http_error(cache):
+    session = MagicMock()
+    session.get.return_value = _response(status=500)
+    with pytest.raises(RuntimeError):
+        html_util.extract_html_data("https://a.example", session, cache=cache)
+    assert cache.get("https://a.example") is None
+
+
+def test_parse_html_handles_nested_non_content_elements():
+    html = (
+        "<html><body><header><nav><a href='/x'>X</a>"
+        "<script>bad()</script></nav></header><p>Keep</p></body></html>"
+    )
+    data = html_util.parse_html("u", html, parser="html.parser")
+    assert data.text == "Keep"
+    assert data.links == ["/x"]
+
+
+def test_parse_html_uses_first_title_only():
+    html = "<title>One</title><svg><title>Two</title></svg>"
+    assert html_util.parse_html("u", html, parser="html.parser").title == "One"
+
+
+def test_html_parser_backend_falls_back_to_stdlib(monkeypatch):
+    html_util.html_parser_backend.cache_clear()
+    monkeypatch.setattr(html_util.importlib.util, "find_spec", lambda name: None)
+    try:
+        assert html_util.html_parser_backend() == "html.parser"
+    finally:
+        html_util.html_parser_backend.cache_clear()
+
+
+def test_extract_html_data_streams_and_closes(cache):
+    session = MagicMock()
+    resp = _response()
+    session.get.return_value = resp
+    html_util.extract_html_data("https://a.example", session, cache=cache)
+    assert session.get.call_args.kwargs["stream"] is True
+    resp.close.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "headers,chunks,message",
+    [
+        ({"Content-Type": "application/pdf"}, [b"%PDF"], "Not an HTML page"),
+        ({"Content-Length": "999999"}, [b"x"], "limit is 100"),
+        ({}, [b"x" * 60, b"x" * 60], "exceeds the 100-byte limit"),
+    ],
+)
+def test_read_html_body_aborts_early(headers, chunks, message):
+    resp = _response(headers=headers, chunks=iter(chunks))
+    with pytest.raises(ValueError, match=message):
+        html_util.read_html_body(resp, max_bytes=100)
+
+
+def test_read_html_body_decodes_split_multibyte_chars():
+    body = "<p>café ☃</p>".encode("utf-8")
+    resp = _response(chunks=[body[:7], body[7:]])
+    assert html_util.read_html_body(resp, max_bytes=1000) == "<p>café ☃</p>"
+
+
+@pytest.mark.parametrize(
+    "content_type,body,expected",
+    [
+        ("text/html; charset=iso-8859-1", "<p>café</p>".encode("latin-1"), "café"),
+        ("text/html", b'<meta charset="latin-1"><p>caf\xe9</p>', "café"),
+        ("text/html", "<p>café</p>".encode("utf-8"), "café"),
+        ("text/html; charset=bogus", "<p>café</p>".encode("utf-8"), "café"),
+        ("", "<p>café</p>".encode("utf-8"), "café"),
+    ],
+)
+def test_read_html_body_picks_charset(content_type, body, expected):
+    resp = _response(headers={"Content-Type": content_type}, chunks=[body])
+    assert expected in html_util.read_html_body(resp, max_bytes=1000)
+
+
+def test_max_html_bytes_env_override(monkeypatch):
+    monkeypatch.setenv("CROWLER_MAX_HTML_BYTES", "123")
+    assert html_util.max_html_bytes() == 123
+
+
+ARTICLE_PAGE = """
+<html><body>
+<div class="sidebar"><ul>
+<li><a href="/a">Getting started with the library</a></li>
+<li><a href="/b">Advanced configuration options</a></li>
+</ul><p>Sponsored: try our hosted plan today for free</p></div>
+<div class="content">
+<h1>Configuring the client library</h1>
+<p>The client reads its settings from the environment at startup.</p>
+<p>Every option can also be passed explicitly to the constructor.</p>
+<p>See the <a href="/ref">reference</a> for the full list of options.</p>
+</div>
+</body></html>
+"""
+
+
+def test_parse_html_keeps_main_content():
+    data = html_util.parse_html("https://a.example", ARTICLE_PAGE)
+    assert data.text.startswith("Configuring the client library")
+    assert "reads its settings" in data.text
+    assert "full list of options" in data.text
+    assert "Sponsored" not in data.text
+    assert "Getting started" not in data.text
+    assert data.links == ["/a", "/b", "/ref"]
+
+
+def test_parse_html_main_content_is_a_container_not_its_longest_block():
+    long_text = "A long paragraph about the topic that carries most of the text. " * 8
+    page = f"""
+    <html><body>
+    <nav><a href="/x">Home</a></nav>
+    <article>
+    <h1>Understanding connection pools</h1>
+    <p>{long_text}</p>
+    <p>Pools keep sockets open between calls.</p>
+    <p>They are sized per host and per scheme.</p>
+    </article>
+    </body></html>
+    """
+    data = html_util.parse_html("https://a.example", page)
+    assert data.text.startswith("Understanding connection pools")
+    assert "keep sockets open" in data.text
+    assert "per host and per scheme" in data.text
+    assert "Home" not in data.text
+
+
+def test_parse_html_main_content_skips_text_sidebar():
+    side = "".join(
+        f"<p>Sidebar note {i} about an unrelated release and its changes.</p>"
+        for i in range(4)
+    )
+    body = "".join(
+        f"<p>Article paragraph {i} explaining how to configure the pool.</p>"
+        for i in range(6)
+    )
+    page = (
+        "<html><body><div class='layout'>"
+        f"<div class='sidebar'>{side}</div>"
+        f"<div class='content'><h1>Configuring pools</h1>{body}</div>"
+        "</div></body></html>"
+    )
+    data = html_util.parse_html("https://a.example", page)
+    assert data.text.startswith("Configuring pools")
+    assert "Article paragraph 5" in data.text
+    assert "Sidebar note" not in data.text
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+import crowler.util.http_util as http_util
+
+
+def test_interleave_by_host_round_robins():
+    urls = [
+        "https://a.example/1",
+        "https://a.example/2",
+        "https://a.example/3",
+        "https://b.example/1",
+        "https://c.example/1",
+    ]
+    assert http_util.interleave_by_host(urls) == [
+        "https://a.example/1",
+        "https://b.example/1",
+        "https://c.example/1",
+        "https://a.example/2",
+        "https://a.example/3",
+    ]
+
+
+def test_session_pool_reuses_session_per_host():
+    with http_util.SessionPool() as pool:
+        a1 = pool.get("https://A.example/x")
+        a2 = pool.get("https://a.example/y")
+        b = pool.get("https://b.example/")
+        assert a1 is a2
+        assert a1 is not b
+
+
+def test_fetch_concurrently_yields_results_and_errors():
+    def fetch(url, session):
+        if url.endswith("bad"):
+            raise ValueError("nope")
+        return url.upper()
+
+    results = {
+        url: (data, err)
+        for url, data, err in http_util.fetch_concurrently(
+            ["https://a.example/ok", "https://a.example/bad"], fetch
+        )
+    }
+    assert results["https://a.example/ok"] == ("HTTPS://A.EXAMPLE/OK", None)
+    data, err = results["https://a.example/bad"]
+    assert data is None and isinstance(err, ValueError)
+
+
+def test_fetch_concurrently_empty():
+    assert list(http_util.fetch_concurrently([], lambda u, s: u)) == []
+
+
+@pytest.mark.parametrize("max_per_host", [1, 2])
+def test_fetch_concurrently_respects_per_host_limit(max_per_host):
+    lock = threading.Lock()
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    def fetch(url, session):
+        host = http_util.url_host(url)
+        with lock:
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+        time.sleep(0.01)
+        with lock:
+            in_flight[host] -= 1
+        return url
+
+    urls = [f"https://{h}.example/{i}" for h in "ab" for i in range(6)]
+    out = list(
+        http_util.fetch_concurrently(
+            urls, fetch, max_workers=8, max_per_host=max_per_host
+        )
+    )
+    assert sorted(u for u, _, _ in out) == sorted(urls)
+    assert max(peak.values()) <= max_per_host
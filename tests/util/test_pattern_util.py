@@ -0,0 +1,45 @@
+from crowler.instruction.instruction_model import Instruction
+from crowler.util.pattern_util import (
+    get_matcher,
+    instruction_matcher,
+    instruction_patterns,
+)
+
+
+def test_get_matcher_is_cached_and_folds_patterns():
+    matcher = get_matcher((r"\.py$", r"^docs/"), (r"^tests?/",))
+    assert get_matcher((r"\.py$", r"^docs/"), (r"^tests?/",)) is matcher
+    assert [p.pattern for p in matcher.allow] == [r"(?:\.py$)|(?:^docs/)"]
+    assert matcher.matches("pkg/mod.py")
+    assert matcher.matches("docs/index.md")
+    assert not matcher.matches("data.csv")
+    assert not matcher.matches("tests/test_mod.py")
+
+
+def test_empty_allow_allows_everything():
+    matcher = get_matcher()
+    assert matcher.allow == () and matcher.deny == ()
+    assert matcher.matches("anything.bin")
+
+
+def test_patterns_that_cannot_be_alternated_are_kept_separate():
+    matcher = get_matcher(
+        ("(?i)readme", r"(?P<ext>\.py)$", r"(\w)\1\.md$"), ("(?i)^secret",)
+    )
+    assert len(matcher.allow) == 3
+    assert matcher.matches("docs/README")
+    assert matcher.matches("pkg/mod.py")
+    assert matcher.matches("aa.md")
+    assert not matcher.matches("ab.md")
+    assert not matcher.matches("SECRET.py")
+
+
+def test_instruction_patterns_union_in_order():
+    first = Instruction(["a"], allow_file_patterns=[r"\.py$"])
+    second = Instruction(
+        ["b"], allow_file_patterns=[r"\.py$", r"\.md$"], deny_file_patterns=["conf"]
+    )
+    assert instruction_patterns([first, second]) == ((r"\.py$", r"\.md$"), ("conf",))
+    matcher = instruction_matcher([first, second])
+    assert matcher is get_matcher((r"\.py$", r"\.md$"), ("conf",))
+    assert not matcher.matches("conftest.py")
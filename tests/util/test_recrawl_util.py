@@ -0,0 +1,102 @@
+import pytest
+
+import crowler.util.recrawl_util as recrawl_util
+from crowler.util.recrawl_util import (
+    DEFAULT_INTERVAL,
+    MAX_INTERVAL,
+    MIN_INTERVAL,
+    RecrawlScheduler,
+)
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    return RecrawlScheduler(tmp_path / "recrawl.json")
+
+
+def test_record_adapts_interval(scheduler):
+    assert scheduler.record("u", "v1", now=0) is True
+    assert scheduler.get("u").interval == DEFAULT_INTERVAL
+
+    assert scheduler.record("u", "v1", now=1) is False
+    assert scheduler.get("u").interval == DEFAULT_INTERVAL * 2
+
+    assert scheduler.record("u", "v2", now=2) is True
+    state = scheduler.get("u")
+    assert state.interval == DEFAULT_INTERVAL
+    assert state.changes == 1
+    assert state.last_fetch == 2
+
+
+def test_record_clamps_interval(scheduler):
+    scheduler.record("u", "same", now=0)
+    for i in range(20):
+        scheduler.record("u", "same", now=i)
+    assert scheduler.get("u").interval == MAX_INTERVAL
+    for i in range(40):
+        scheduler.record("u", f"v{i}", now=i)
+    assert scheduler.get("u").interval == MIN_INTERVAL
+
+
+def test_due_orders_new_then_most_overdue(scheduler):
+    scheduler.record("old", "x", now=0)
+    scheduler.record("recent", "x", now=1000)
+    scheduler.record("fresh", "x", now=DEFAULT_INTERVAL * 2)
+    now = DEFAULT_INTERVAL + 2000
+    assert scheduler.due(["fresh", "recent", "new", "old"], now=now) == [
+        "new",
+        "old",
+        "recent",
+    ]
+
+
+def test_state_persists(tmp_path, scheduler):
+    scheduler.record("u", "x", now=5)
+    scheduler.save()
+    reloaded = RecrawlScheduler(tmp_path / "recrawl.json")
+    assert reloaded.get("u") == scheduler.get("u")
+
+
+def test_corrupt_state_resets(tmp_path):
+    path = tmp_path / "recrawl.json"
+    path.write_text("{not json")
+    assert RecrawlScheduler(path).due(["u"]) == ["u"]
+
+
+def test_refresh_fetches_only_due_within_request_budget(tmp_path, scheduler, make_page):
+    scheduler.record("https://a.example/seen", "x")
+    fetched = []
+
+    def fetch(url, session):
+        fetched.append(url)
+        if url.endswith("bad"):
+            raise RuntimeError("boom")
+        return make_page(url, "x")
+
+    urls = ["https://a.example/seen", "https://a.example/1", "https://a.example/bad"]
+    results = list(recrawl_util.refresh(urls, scheduler, max_requests=1, fetch=fetch))
+    assert len(fetched) == 1
+    assert [r.changed for r in results] == [True]
+
+    results = list(recrawl_util.refresh(urls, scheduler, fetch=fetch))
+    failed = [r for r in results if r.error is not None]
+    assert [r.url for r in failed] == ["https://a.example/bad"]
+    assert "https://a.example/seen" not in fetched
+    assert (
+        RecrawlScheduler(tmp_path / "recrawl.json").get("https://a.example/1")
+        is not None
+    )
+
+
+def test_refresh_stops_at_time_budget(scheduler, make_page):
+    results = list(
+        recrawl_util.refresh(
+            [f"https://a.example/{i}" for i in range(10)],
+            scheduler,
+            time_budget=0,
+            fetch=lambda url, session: make_page(url, url),
+            max_workers=1,
+            max_per_host=1,
+        )
+    )
+    assert len(results) == 1
@@ -0,0 +1,108 @@
+import pytest
+
+import crowler.util.retrieval_util as retrieval_util
+from crowler.util.html_cache import HtmlCache
+from crowler.util.html_util import HtmlData
+from crowler.util.search_index import SearchIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = SearchIndex(tmp_path / "index.sqlite3")
+    yield idx
+    idx.close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HtmlCache(directory=tmp_path / "cache")
+
+
+def test_stringify_relevant_chunks_files_and_urls(tmp_path, index, cache, monkeypatch):
+    relevant = tmp_path / "cache.py"
+    relevant.write_text("def evict_cache_entries():\n    pass\n")
+    other = tmp_path / "cli.py"
+    other.write_text("def main():\n    pass\n")
+    monkeypatch.setattr(
+        retrieval_util,
+        "load_url_pages",
+        lambda urls, cache: {
+            url: HtmlData(url, "Docs", {}, [], "Entries evict least recently used")
+            for url in urls
+        },
+    )
+
+    out = retrieval_util.stringify_relevant_chunks(
+        [str(relevant), str(other)],
+        ["https://a.example"],
+        "evict",
+        k=5,
+        index=index,
+        cache=cache,
+    )
+    assert out[0] == "🔎 Relevant context:"
+    assert len(out) == 3
+    assert (
+        f"File: {relevant} (lines 1-2)\n```\ndef evict_cache_entries" in out[1] + out[2]
+    )
+    assert any(part.startswith("URL: https://a.example (Docs)") for part in out)
+
+
+def test_stringify_relevant_chunks_no_hits(tmp_path, index):
+    path = tmp_path / "a.py"
+    path.write_text("x = 1\n")
+    assert (
+        retrieval_util.stringify_relevant_chunks([path], [], "zzz", 3, index=index)
+        == []
+    )
+
+
+def test_index_sources_rereads_only_changed_files(tmp_path, index, monkeypatch):
+    path = tmp_path / "a.py"
+    path.write_text("def first(): pass\n")
+    reads = []
+    read = retrieval_util.stringify_file_content
+    monkeypatch.setattr(
+        retrieval_util,
+        "stringify_file_content",
+        lambda p: reads.append(p) or read(p),
+    )
+
+    assert retrieval_util.index_sources([path], [], index) == [str(path)]
+    assert retrieval_util.index_sources([path], [], index) == [str(path)]
+    assert len(reads) == 1
+
+    path.write_text("def second_version(): pass\n")
+    retrieval_util.index_sources([path], [], index)
+    assert len(reads) == 2
+    assert index.query("second_version", 1)[0].source == str(path)
+
+
+def test_index_sources_skips_fresh_cached_urls(index, cache, monkeypatch, make_page):
+    url = "https://a.example/docs"
+    cache.put(url, vars(make_page(url, text="cached eviction docs")))
+    loads = []
+
+    def fake_load(urls, cache):
+        loads.append(urls)
+        return {url: make_page(url, text="cached eviction docs")}
+
+    monkeypatch.setattr(retrieval_util, "load_url_pages", fake_load)
+
+    for _ in range(3):
+        assert retrieval_util.index_sources([], [url], index, cache) == [url]
+    assert loads == [[url]]
+    assert index.query("eviction", 1)[0].source == url
+
+    cache.put(url, vars(make_page(url, text="refetched")))
+    retrieval_util.index_sources([], [url], index, cache)
+    assert len(loads) == 2
+
+
+@pytest.mark.parametrize("env, expected", [(None, 0), ("4", 4), ("junk", 0)])
+def test_retrieval_k(monkeypatch, env, expected):
+    if env is None:
+        monkeypatch.delenv("CROWLER_RETRIEVAL_K", raising=False)
+    else:
+        monkeypatch.setenv("CROWLER_RETRIEVAL_K", env)
+    assert retrieval_util.retrieval_k() == expected
@@ -0,0 +1,81 @@
+import sqlite3
+
+import pytest
+
+from crowler.util.search_index import SearchIndex, match_expression, split_text
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = SearchIndex(tmp_path / "index.sqlite3")
+    yield idx
+    idx.close()
+
+
+def test_split_text_cuts_at_lines():
+    text = "\n".join(f"line {i}" for i in range(1, 7))
+    assert split_text(text, max_chars=14) == [
+        (1, 2, "line 1\nline 2"),
+        (3, 4, "line 3\nline 4"),
+        (5, 6, "line 5\nline 6"),
+    ]
+    assert split_text("") == []
+
+
+def test_match_expression_dedupes_and_quotes():
+    assert match_expression("Parse the HTML, parse it") == '"parse" OR "the" OR "html"'
+    assert match_expression("a b") == ""
+    assert match_expression("one two three", max_terms=2) == '"one" OR "two"'
+
+
+def test_update_is_incremental_by_content(index):
+    assert index.update("a.py", "def parse_html(): pass") is True
+    assert index.update("a.py", "def parse_html(): pass") is False
+    assert index.update("a.py", "def render_page(): pass") is True
+    assert index.query("parse", k=5) == []
+    assert [hit.source for hit in index.query("render", k=5)] == ["a.py"]
+
+
+def test_query_ranks_and_limits(index):
+    index.update("docs", "caching caching caching headers", label="URL: docs")
+    index.update("notes", "a note that mentions caching once among many words")
+    index.update("other", "nothing relevant here")
+
+    hits = index.query("how does caching work", k=5)
+    assert [hit.source for hit in hits] == ["docs", "notes"]
+    assert hits[0].label == "URL: docs (lines 1-1)"
+    assert hits[0].score > hits[1].score
+    assert len(index.query("caching", k=1)) == 1
+
+
+def test_query_restricted_to_sources(index):
+    index.update("a", "shared token")
+    index.update("b", "shared token")
+    assert [hit.source for hit in index.query("token", 5, sources=["b"])] == ["b"]
+    assert index.query("token", 5, sources=[]) == []
+
+
+def test_remove_drops_chunks(index):
+    index.update("a", "shared token")
+    index.remove("a")
+    assert index.query("token", 5) == []
+    assert index.update("a", "shared token") is True
+
+
+def test_stamp_is_kept_with_the_source(index):
+    assert index.stamp("a.py") is None
+    index.update("a.py", "x = 1", stamp="1:1")
+    assert index.stamp("a.py") == "1:1"
+    assert index.update("a.py", "x = 1", stamp="1:2") is False
+    assert index.stamp("a.py") == "1:2"
+
+
+def test_stamp_column_added_to_older_index(tmp_path):
+    path = tmp_path / "old.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE sources (source TEXT PRIMARY KEY, digest TEXT)")
+    conn.close()
+    idx = SearchIndex(path)
+    idx.update("a.py", "x = 1", stamp="s")
+    assert idx.stamp("a.py") == "s"
+    idx.close()
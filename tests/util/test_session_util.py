@@ -87,7 +87,7 @@ def test_get_session_id_error_handling(monkeypatch):
     from unittest import mock
 
     mock_secho = mock.MagicMock()
-    monkeypatch.setattr(session_util.typer, "secho", mock_secho)
+    monkeypatch.setattr("typer.secho", mock_secho)
 
     # Test that the exception is re-raised
     with pytest.raises(ValueError, match="Test error"):
@@ -142,7 +142,7 @@ def test__try_pty_ttyname_failure(monkeypatch):
     from unittest import mock
 
     mock_secho = mock.MagicMock()
-    monkeypatch.setattr(session_util.typer, "secho", mock_secho)
+    monkeypatch.setattr("typer.secho", mock_secho)
 
     result = session_util._try_pty()
     assert result is None
@@ -0,0 +1,153 @@
+import gzip
+import io
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import crowler.util.sitemap_util as sitemap_util
+from crowler.util.sitemap_util import SitemapEntry
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _urlset(*entries):
+    body = "".join(
+        f"<url><loc>{loc}</loc>{f'<lastmod>{mod}</lastmod>' if mod else ''}</url>"
+        for loc, mod in entries
+    )
+    return f'<?xml version="1.0"?><urlset {NS}>{body}</urlset>'
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_parse_date_formats():
+    assert sitemap_util.parse_date("2024-03-01") == _utc(2024, 3, 1)
+    assert sitemap_util.parse_date("2024-03-01T10:00:00Z") == _utc(2024, 3, 1, 10)
+    assert sitemap_util.parse_date("Fri, 01 Mar 2024 10:00:00 GMT") == _utc(
+        2024, 3, 1, 10
+    )
+    assert sitemap_util.parse_date("yesterday") is None
+    assert sitemap_util.parse_date(None) is None
+
+
+def test_iter_sitemap_plain_and_gzip(tmp_path):
+    xml = _urlset(("https://a.example/1", "2024-01-01"), ("https://a.example/2", None))
+    plain = tmp_path / "sitemap.xml"
+    plain.write_text(xml)
+    packed = tmp_path / "sitemap.xml.gz"
+    packed.write_bytes(gzip.compress(xml.encode()))
+
+    expected = [
+        SitemapEntry("https://a.example/1", _utc(2024, 1, 1)),
+        SitemapEntry("https://a.example/2", None),
+    ]
+    assert list(sitemap_util.iter_sitemap(str(plain))) == expected
+    assert list(sitemap_util.iter_sitemap(str(packed))) == expected
+
+
+def test_iter_sitemap_follows_index_and_skips_stale(tmp_path):
+    fresh = tmp_path / "fresh.xml"
+    fresh.write_text(_urlset(("https://a.example/new", "2024-06-01")))
+    stale = tmp_path / "stale.xml"
+    stale.write_text(_urlset(("https://a.example/old", "2020-01-01")))
+    index = tmp_path / "index.xml"
+    index.write_text(
+        f"<sitemapindex {NS}>"
+        f"<sitemap><loc>{fresh}</loc><lastmod>2024-06-01</lastmod></sitemap>"
+        f"<sitemap><loc>{stale}</loc><lastmod>2020-01-01</lastmod></sitemap>"
+        f"<sitemap><loc>{fresh}</loc></sitemap>"
+        "</sitemapindex>"
+    )
+
+    everything = [e.loc for e in sitemap_util.iter_sitemap(str(index))]
+    assert everything == ["https://a.example/new", "https://a.example/old"]
+    recent = sitemap_util.iter_sitemap(str(index), since=_utc(2024, 1, 1))
+    assert [e.loc for e in recent] == ["https://a.example/new"]
+
+
+def test_iter_sitemap_streams_from_network():
+    resp = MagicMock()
+    resp.raw = io.BytesIO(gzip.compress(_urlset(("https://a.example/", None)).encode()))
+    session = MagicMock()
+    session.get.return_value = resp
+
+    entries = list(
+        sitemap_util.iter_sitemap("https://a.example/s.xml.gz", session=session)
+    )
+    assert entries == [SitemapEntry("https://a.example/")]
+    assert session.get.call_args.kwargs["stream"] is True
+    resp.close.assert_called_once()
+
+
+def test_iter_feed_rss_and_atom(tmp_path):
+    rss = tmp_path / "rss.xml"
+    rss.write_text(
+        "<rss><channel><item><link>https://a.example/p1</link>"
+        "<pubDate>Fri, 01 Mar 2024 10:00:00 GMT</pubDate></item>"
+        "<item><title>no link</title></item></channel></rss>"
+    )
+    atom = tmp_path / "atom.xml"
+    atom.write_text(
+        '<feed xmlns="http://www.w3.org/2005/Atom"><entry>'
+        '<link rel="edit" href="https://a.example/edit"/>'
+        '<link href="https://a.example/p2"/>'
+        "<updated>2024-03-02T00:00:00Z</updated></entry></feed>"
+    )
+    assert list(sitemap_util.iter_feed(str(rss))) == [
+        SitemapEntry("https://a.example/p1", _utc(2024, 3, 1, 10))
+    ]
+    assert list(sitemap_util.iter_feed(str(atom))) == [
+        SitemapEntry("https://a.example/p2", _utc(2024, 3, 2))
+    ]
+
+
+def _spy_parents(monkeypatch):
+    parents = []
+    iter_closed = sitemap_util._iter_closed
+
+    def spy(stream):
+        for elem, parent in iter_closed(stream):
+            if parent is not None:
+                parents.append(parent)
+            yield elem, parent
+
+    monkeypatch.setattr(sitemap_util, "_iter_closed", spy)
+    return parents
+
+
+def test_iter_sitemap_detaches_read_entries(tmp_path, monkeypatch):
+    parents = _spy_parents(monkeypatch)
+    sitemap = tmp_path / "sitemap.xml"
+    sitemap.write_text(_urlset(*((f"https://a.example/{i}", None) for i in range(50))))
+    assert len(list(sitemap_util.iter_sitemap(str(sitemap)))) == 50
+    assert parents and all(len(parent) == 0 for parent in parents)
+
+
+def test_iter_feed_detaches_read_items(tmp_path, monkeypatch):
+    parents = _spy_parents(monkeypatch)
+    items = "".join(
+        f"<item><link>https://a.example/{i}</link></item>" for i in range(5)
+    )
+    rss = tmp_path / "rss.xml"
+    rss.write_text(f"<rss><channel><title>T</title>{items}</channel></rss>")
+    assert len(list(sitemap_util.iter_feed(str(rss)))) == 5
+    [channel] = {id(p): p for p in parents if p.tag == "channel"}.values()
+    assert [child.tag for child in channel] == ["title"]
+
+
+def test_filter_entries_by_pattern_and_since():
+    entries = [
+        SitemapEntry("https://a.example/docs/1", _utc(2024, 1, 1)),
+        SitemapEntry("https://a.example/docs/2", _utc(2023, 1, 1)),
+        SitemapEntry("https://a.example/blog/1", _utc(2024, 1, 1)),
+        SitemapEntry("https://a.example/docs/3", None),
+    ]
+    assert list(sitemap_util.filter_entries(entries, pattern="/docs/")) == [
+        "https://a.example/docs/1",
+        "https://a.example/docs/2",
+        "https://a.example/docs/3",
+    ]
+    assert list(
+        sitemap_util.filter_entries(entries, "/docs/", since=_utc(2023, 6, 1))
+    ) == ["https://a.example/docs/1"]
@@ -0,0 +1,115 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from crowler.util import startup_profile
+from crowler.util.startup_profile import PROFILE_ENV, StartupProfile
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_from_argv_disabled_by_default(monkeypatch):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    argv = ["crowler", "show"]
+    profile = StartupProfile.from_argv(argv)
+    assert not profile.enabled
+    assert argv == ["crowler", "show"]
+
+
+def test_from_argv_strips_flag_with_path(monkeypatch, tmp_path):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    argv = ["crowler", f"--profile-startup={tmp_path / 'r.json'}", "show"]
+    profile = StartupProfile.from_argv(argv)
+    try:
+        assert profile.enabled
+        assert profile.report_path == tmp_path / "r.json"
+        assert argv == ["crowler", "show"]
+        assert profile.argv == ["show"]
+    finally:
+        profile.finish()
+
+
+def test_from_argv_flag_only_first(monkeypatch):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    argv = ["crowler", "prompt", "add", "--profile-startup"]
+    assert not StartupProfile.from_argv(argv).enabled
+    assert argv[-1] == "--profile-startup"
+
+
+def test_from_argv_env_default_path(monkeypatch, tmp_path):
+    monkeypatch.setenv(PROFILE_ENV, "1")
+    monkeypatch.setattr(
+        startup_profile, "default_report_path", lambda: tmp_path / "default.json"
+    )
+    profile = StartupProfile.from_argv(["crowler"])
+    try:
+        assert profile.report_path == tmp_path / "default.json"
+    finally:
+        profile.finish()
+    assert (tmp_path / "default.json").exists()
+
+
+def test_from_argv_env_zero_disables(monkeypatch):
+    monkeypatch.setenv(PROFILE_ENV, "0")
+    assert not StartupProfile.from_argv(["crowler"]).enabled
+
+
+def test_disabled_profile_records_nothing():
+    profile = StartupProfile()
+    with profile.phase("x"):
+        pass
+    assert profile.phases == []
+    assert profile.finish() is None
+
+
+def test_times_phases_and_imports(tmp_path, monkeypatch, capsys):
+    pkg = tmp_path / "profiled_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("from profiled_pkg import child\n")
+    (pkg / "child.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profile = StartupProfile(enabled=True, report_path=tmp_path / "r.json")
+    with profile.phase("import"):
+        import profiled_pkg  # noqa: F401
+    report = profile.finish()
+
+    assert profile._timer not in sys.meta_path
+    assert report == json.loads((tmp_path / "r.json").read_text())
+    assert [p["name"] for p in report["phases"]] == ["import"]
+    timings = {t["module"]: t for t in report["imports"]}
+    parent, child = timings["profiled_pkg"], timings["profiled_pkg.child"]
+    assert (parent["depth"], child["depth"]) == (0, 1)
+    assert parent["cumulative_ms"] >= child["cumulative_ms"]
+    assert "profiled_pkg" in report["packages"]
+    # modules keep their real loaders once executed
+    assert "_TimedLoader" not in type(sys.modules["profiled_pkg"].__loader__).__name__
+    assert "Profiled" in capsys.readouterr().err
+
+    for name in ("profiled_pkg", "profiled_pkg.child"):
+        sys.modules.pop(name, None)
+
+
+def test_cli_writes_report(tmp_path):
+    report_path = tmp_path / "report.json"
+    result = subprocess.run(
+        [sys.executable, "-m", "crowler.main", f"--profile-startup={report_path}"]
+        + ["prompt", "list"],
+        capture_output=True,
+        text=True,
+        env={"HOME": str(tmp_path), "PATH": "/usr/bin:/bin", "CROWLER_DAEMON": "1"},
+        cwd=REPO_ROOT,
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(report_path.read_text())
+    assert report["argv"] == ["prompt", "list"]
+    assert [p["name"] for p in report["phases"]] == [
+        "load_dotenv",
+        "session_id",
+        "stores",
+        "cli_import",
+        "app_construction",
+        "command",
+    ]
+    assert "typer" in report["packages"]
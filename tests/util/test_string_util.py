@@ -179,3 +179,116 @@ def test_get_instruction_strings_flatten(monkeypatch):
     inst2 = Instruction(instructions=["c"])
     result = string_util.get_instruction_strings([inst1, inst2])
     assert result == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize(
+    "response,expected",
+    [
+        ('~~~"a.py"\nA\n~~~', [("a.py", "\nA\n")]),
+        # indented fences, body keeps its own indentation
+        ('  ~~~"a.py"\n  A\n  ~~~\n', [("a.py", "\n  A\n")]),
+        # stray closing fence outside a block is ignored
+        ('~~~\ntext\n~~~"a.py"\nA\n~~~', [("a.py", "\nA\n")]),
+        # fence text inside a line does not close the block
+        ('~~~"a.md"\nuse ~~~ fences\n~~~', [("a.md", "\nuse ~~~ fences\n")]),
+        # unterminated block is dropped, a new opening fence restarts
+        ('~~~"a.py"\nA\n~~~"b.py"\nB\n~~~\n~~~"c.py"\ncut', [("b.py", "\nB\n")]),
+        ('~~~""\nnope\n~~~', [("", "\nnope\n")]),
+        ('~~~"no-close-quote\nA\n~~~', []),
+        ("", []),
+    ],
+)
+def test_iter_code_blocks(response, expected):
+    assert list(string_util.iter_code_blocks(response)) == expected
+
+
+def test_parse_code_response_truncated_response(patch_print):
+    response = '~~~"a.py"\nA\n~~~\n' + '~~~"b.py"\nline\n' * 1000
+    assert string_util.parse_code_response(response) == OrderedDict([("a.py", "\nA\n")])
+
+
+def _sr(search, replace):
+    return string_util.SearchReplace(search, replace)
+
+
+def test_parse_edit_response(monkeypatch, patch_print):
+    response = (
+        '~~~"a.py"\n'
+        "<<<<<<< SEARCH\nx = 1\n=======\nx = 2\n>>>>>>> REPLACE\n"
+        "<<<<<<< SEARCH\n=======\nnew\n>>>>>>> REPLACE\n"
+        "<<<<<<< SEARCH\nunterminated\n"
+        "~~~\n"
+        '~~~"notes.txt"\n<<<<<<< SEARCH\na\n=======\nb\n>>>>>>> REPLACE\n~~~'
+    )
+    edits = string_util.parse_edit_response(response)
+    assert edits == OrderedDict(
+        [("a.py", [_sr("x = 1\n", "x = 2\n"), _sr("", "new\n")])]
+    )
+
+
+def test_apply_edits_exact_and_append():
+    original = "a = 1\nb = 2\n"
+    edits = [_sr("b = 2\n", "b = 3\n"), _sr("", "c = 4\n")]
+    assert string_util.apply_edits(original, edits) == "a = 1\nb = 3\nc = 4\n"
+    assert string_util.apply_edits("", [_sr("", "new\n")]) == "new\n"
+
+
+def test_apply_edits_ignores_whitespace_and_reindents():
+    original = "class A:\n    def f(self):\n        return 1\n"
+    edit = _sr("def f(self):\n    return 1\n", "def f(self) -> int:\n    return 2\n")
+    assert string_util.apply_edits(original, [edit]) == (
+        "class A:\n    def f(self) -> int:\n        return 2\n"
+    )
+
+
+def test_apply_edits_exact_match_only_on_whole_lines():
+    original = "max = 1\nx = 1\n"
+    edit = _sr("x = 1\n", "x = 2\n")
+    assert string_util.apply_edits(original, [edit]) == "max = 1\nx = 2\n"
+
+
+def test_apply_edits_exact_match_does_not_stop_mid_line():
+    original = "x = 10\nx = 1\n"
+    edit = _sr("x = 1", "x = 2")
+    assert string_util.apply_edits(original, [edit]) == "x = 10\nx = 2\n"
+
+
+def test_apply_edits_dedent_keeps_blank_lines():
+    original = "def b():\n    return 1\n"
+    edit = _sr(
+        "    def b():\n        return 1\n",
+        "    def b():\n        return 10\n\n    def c():\n        pass\n",
+    )
+    assert string_util.apply_edits(original, [edit]) == (
+        "def b():\n    return 10\n\ndef c():\n    pass\n"
+    )
+
+
+def test_apply_edits_fuzzy_match_keeps_missing_final_newline():
+    original = "def f(x):\n    total = x + 1\n    return total"
+    edit = _sr(
+        "def f(x):\n    total = x+1\n    return total\n",
+        "def f(x):\n    return x + 1\n",
+    )
+    assert string_util.apply_edits(original, [edit]) == "def f(x):\n    return x + 1"
+
+
+def test_apply_edits_raises_when_not_found():
+    with pytest.raises(string_util.EditError, match="not found"):
+        string_util.apply_edits("a = 1\n", [_sr("something else entirely\n", "")])
+
+
+def test_parse_code_response_honors_instruction_patterns(patch_print):
+    instruction = Instruction(
+        ["x"], allow_file_patterns=[r"\.txt$"], deny_file_patterns=[r"^secret"]
+    )
+    response = '~~~"a.txt"\nA\n~~~\n~~~"secret.txt"\nS\n~~~\n~~~"b.py"\nB\n~~~'
+    files = string_util.parse_code_response(response, instructions=[instruction])
+    assert files == OrderedDict([("a.txt", "\nA\n")])
+    assert any("matching denied patterns" in str(args[0]) for args, _ in patch_print)
+
+    # an explicit task type replaces the instruction allow list, deny still applies
+    files = string_util.parse_code_response(
+        response, task_type=string_util.TaskType.SINGLE_FILE, instructions=[instruction]
+    )
+    assert files == OrderedDict([("b.py", "\nB\n")])
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+
+import pytest
+
+from crowler.util import token_util
+from crowler.util.token_util import (
+    TruncateStrategy,
+    count_tokens,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+
+
+@pytest.mark.parametrize("text,expected", [("", 0), ("abc", 1), ("abcd" * 10, 10)])
+def test_estimate_tokens(text, expected):
+    assert estimate_tokens(text) == expected
+
+
+def test_truncate_to_tokens_keeps_short_text():
+    assert truncate_to_tokens("short", 10) == "short"
+
+
+def test_truncate_to_tokens_zero_budget():
+    assert truncate_to_tokens("anything", 0) == ""
+
+
+def test_truncate_to_tokens_head():
+    text = "a" * 100 + "z" * 100
+    out = truncate_to_tokens(text, 10, TruncateStrategy.HEAD)
+    assert out.startswith("a" * 40)
+    assert "z" not in out
+    assert "tokens truncated" in out
+
+
+def test_truncate_to_tokens_head_tail():
+    text = "a" * 100 + "z" * 100
+    out = truncate_to_tokens(text, 12, TruncateStrategy.HEAD_TAIL)
+    assert out.startswith("a" * 32)
+    assert out.endswith("z" * 16)
+    assert "tokens truncated" in out
+
+
+def test_count_tokens_falls_back_to_estimate(monkeypatch):
+    monkeypatch.setattr(token_util, "_encoding", lambda: None)
+    monkeypatch.setattr(token_util, "_token_cache", OrderedDict())
+    assert count_tokens("") == 0
+    assert count_tokens("abcd" * 10) == 10
+
+
+def test_count_tokens_caches_by_content(monkeypatch):
+    calls = []
+
+    class FakeEncoding:
+        def encode(self, text, disallowed_special=()):
+            calls.append(text)
+            return text.split()
+
+    monkeypatch.setattr(token_util, "_encoding", lambda: FakeEncoding())
+    monkeypatch.setattr(token_util, "_token_cache", OrderedDict())
+    assert count_tokens("one two three") == 3
+    assert count_tokens("one two " + "three") == 3
+    assert calls == ["one two three"]
+
+
+def test_count_tokens_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(token_util, "_encoding", lambda: None)
+    monkeypatch.setattr(token_util, "_token_cache", OrderedDict())
+    monkeypatch.setattr(token_util, "TOKEN_CACHE_SIZE", 2)
+    for text in ["a", "b", "c"]:
+        count_tokens(text)
+    assert len(token_util._token_cache) == 2
+
+
+def test_encoding_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("CROWLER_TOKENIZER", "heuristic")
+    token_util._encoding.cache_clear()
+    try:
+        assert token_util._encoding() is None
+    finally:
+        token_util._encoding.cache_clear()
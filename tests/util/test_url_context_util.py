@@ -0,0 +1,118 @@
+import time
+
+import pytest
+
+import crowler.util.url_context_util as url_context_util
+from crowler.util.html_cache import HtmlCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HtmlCache(directory=tmp_path / "cache")
+
+
+def test_load_url_pages_uses_fresh_cache_and_fetches_rest(
+    cache, monkeypatch, make_page
+):
+    cache.put("https://fresh.example", vars(make_page("https://fresh.example")))
+    fetched = []
+
+    def fake_extract(url, session, cache=None):
+        fetched.append(url)
+        return make_page(url, text="fetched")
+
+    monkeypatch.setattr(url_context_util, "extract_html_data", fake_extract)
+    pages = url_context_util.load_url_pages(
+        ["https://fresh.example", "https://new.example"], cache=cache
+    )
+    assert fetched == ["https://new.example"]
+    assert pages["https://fresh.example"].text == "body"
+    assert pages["https://new.example"].text == "fetched"
+
+
+def test_load_url_pages_revalidates_stale_entries(cache, monkeypatch, make_page):
+    cache.put("https://old.example", vars(make_page("https://old.example")))
+    later = time.time() + 10**6
+    monkeypatch.setattr(url_context_util.time, "time", lambda: later)
+    monkeypatch.setattr(
+        url_context_util,
+        "extract_html_data",
+        lambda url, session, cache=None: make_page(url, text="new"),
+    )
+    pages = url_context_util.load_url_pages(["https://old.example"], cache=cache)
+    assert pages["https://old.example"].text == "new"
+
+
+def test_load_url_pages_skips_failures(cache, monkeypatch):
+    def boom(url, session, cache=None):
+        raise RuntimeError("down")
+
+    monkeypatch.setattr(url_context_util, "extract_html_data", boom)
+    assert url_context_util.load_url_pages(["https://x.example"], cache=cache) == {}
+
+
+def test_stringify_url_contents_truncates_per_url(monkeypatch, make_page):
+    monkeypatch.setattr(
+        url_context_util,
+        "load_url_pages",
+        lambda urls, cache=None: {
+            "https://a.example": make_page("https://a.example", text="x" * 1000),
+            "https://b.example": make_page("https://b.example", text="", title=""),
+        },
+    )
+    out = url_context_util.stringify_url_contents(
+        ["https://a.example", "https://b.example"], tokens_per_url=10
+    )
+    assert out[0] == "🌐 URL context:"
+    assert len(out) == 2
+    assert out[1].startswith("URL: https://a.example (T)\n```\n")
+    assert "tokens truncated" in out[1]
+    assert len(out[1]) < 200
+
+
+def test_stringify_url_contents_drops_site_boilerplate(monkeypatch, make_page):
+    banner = "Accept cookies to continue browsing this site"
+    monkeypatch.setattr(
+        url_context_util,
+        "load_url_pages",
+        lambda urls, cache=None: {
+            url: make_page(url, text=f"{banner}\nPage {i}")
+            for i, url in enumerate(urls)
+        },
+    )
+    out = url_context_util.stringify_url_contents(
+        ["https://a.example/1", "https://a.example/2"]
+    )
+    assert out[1] == "URL: https://a.example/1 (T)\n```\nPage 0\n```"
+    assert banner not in out[2]
+
+
+def test_stringify_url_contents_caps_url_count(monkeypatch, make_page):
+    requested = []
+
+    def fake_load(urls, cache=None):
+        requested.extend(urls)
+        return {url: make_page(url) for url in urls}
+
+    monkeypatch.setattr(url_context_util, "load_url_pages", fake_load)
+    monkeypatch.setenv("CROWLER_URL_CONTEXT_MAX_URLS", "2")
+    urls = [f"https://a.example/{i}" for i in range(5)]
+    out = url_context_util.stringify_url_contents(urls)
+    assert requested == urls[:2]
+    assert len(out) == 3
+
+
+def test_stringify_url_contents_empty():
+    assert url_context_util.stringify_url_contents([]) == []
+
+
+@pytest.mark.parametrize(
+    "env,expected",
+    [(None, url_context_util.URL_CONTEXT_TOKENS), ("500", 500), ("x", 2000)],
+)
+def test_url_context_tokens(monkeypatch, env, expected):
+    if env is None:
+        monkeypatch.delenv("CROWLER_URL_CONTEXT_TOKENS", raising=False)
+    else:
+        monkeypatch.setenv("CROWLER_URL_CONTEXT_TOKENS", env)
+    assert url_context_util.url_context_tokens() == expected